@@ -0,0 +1,13 @@
+'''
+Benchmarks of scplint with synthetic SCPs. `generate` creates policies and
+policy repositories of a controlled shape, `run` times every stage of the
+checks and compares the results of two commits:
+
+.. highlight:: bash
+.. code-block:: bash
+
+    $ python -m benchmarks.run -o results/$(git rev-parse --short HEAD).json
+    $ python -m benchmarks.run --compare results/old.json results/new.json
+
+-------
+'''
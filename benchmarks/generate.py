@@ -0,0 +1,183 @@
+'''
+A seeded generator of synthetic SCPs. The same seed and shape always create
+the same policies, so results of different commits are comparable:
+
+.. highlight:: py
+.. code-block:: py
+
+    scp = generate_scp(random.Random(1), statements=10, actions=40)
+    paths = generate_repo('path/to/repo', seed=1, **SHAPES['small'])
+
+-------
+'''
+
+import json
+import os
+import random
+from functools import lru_cache
+from logging import getLogger
+
+from scplint.aws_actions import get_catalog
+
+logger = getLogger()
+
+DEFAULT_SHAPE = {
+    'statements': 5,
+    'actions': 20,
+    'wildcard_ratio': 0.2,
+    'unknown_ratio': 0.05,
+    'condition_density': 0.3,
+    'notaction_ratio': 0.1
+}
+
+# named shapes of the benchmark, `files` is the number of policies per repo
+SHAPES = {
+    'small': {**DEFAULT_SHAPE, 'statements': 2, 'actions': 8, 'files': 200},
+    'medium': {**DEFAULT_SHAPE, 'files': 100},
+    'large': {**DEFAULT_SHAPE, 'statements': 20, 'actions': 60,
+              'files': 20},
+    'wildcards': {**DEFAULT_SHAPE, 'wildcard_ratio': 0.8, 'files': 100},
+    'unknown': {**DEFAULT_SHAPE, 'unknown_ratio': 0.5, 'files': 100},
+    'notaction': {**DEFAULT_SHAPE, 'notaction_ratio': 1.0, 'files': 100}
+}
+
+CONDITIONS = (
+    {'ArnNotLike': {'aws:PrincipalArn': [
+        'arn:aws:iam::*:role/admin', 'arn:aws:iam::*:role/breakglass']}},
+    {'StringNotEquals': {'aws:RequestedRegion': [
+        'eu-central-1', 'eu-west-1']}},
+    {'StringEquals': {'aws:PrincipalTag/team': 'platform'}},
+    {'Bool': {'aws:SecureTransport': 'false'}},
+    {'Null': {'aws:RequestTag/owner': 'true'}}
+)
+
+
+@lru_cache(maxsize=None)
+def known_actions() -> tuple:
+    ''' returns all actions of the catalog in a stable order '''
+    return tuple(get_catalog().actions)
+
+
+def _wildcard(rng: random.Random, action: str) -> str:
+    ''' returns a wildcard which matches the action, e.g. `ec2:*`,
+    `ec2:Describe*` or `ec2:Get?pc*`
+    '''
+    service, name = action.split(':', 1)
+    kind = rng.random()
+
+    if kind < 0.2:
+        return f'{service}:*'
+
+    prefix = name[:rng.randint(1, max(1, len(name) - 1))]
+    if kind < 0.9 or len(prefix) < 3:
+        return f'{service}:{prefix}*'
+
+    position = rng.randrange(1, len(prefix))
+    return f'{service}:{prefix[:position]}?{prefix[position + 1:]}*'
+
+
+def _unknown(rng: random.Random, action: str) -> str:
+    ''' returns an unknown action with a typo of a known one '''
+    service, name = action.split(':', 1)
+    position = rng.randrange(len(name))
+    typo = name[:position] + name[position + 1:] + rng.choice('aeioux')
+    return f'{service}:{typo}'
+
+
+def generate_statement(rng: random.Random, actions: tuple, index: int,
+                       shape: dict) -> dict:
+    ''' returns a single statement of the given shape
+
+    Args:
+        rng (random.Random): the seeded random generator
+        actions (tuple): the known actions to choose from
+        index (int): the index of the statement, used for the Sid
+        shape (dict): the shape of the policy, see `DEFAULT_SHAPE`
+    '''
+    items = []
+
+    for action in rng.sample(actions, shape['actions']):
+        kind = rng.random()
+
+        if kind < shape['wildcard_ratio']:
+            items.append(_wildcard(rng, action))
+        elif kind < shape['wildcard_ratio'] + shape['unknown_ratio']:
+            items.append(_unknown(rng, action))
+        else:
+            items.append(action)
+
+    if rng.random() < shape['notaction_ratio']:
+        key = 'NotAction'
+    else:
+        key = 'Action'
+
+    statement = {
+        'Sid': f'Statement{index}',
+        'Effect': 'Deny',
+        key: items,
+        'Resource': '*'
+    }
+
+    if rng.random() < shape['condition_density']:
+        statement['Condition'] = rng.choice(CONDITIONS)
+
+    return statement
+
+
+def generate_scp(rng: random.Random, **shape) -> dict:
+    ''' returns a synthetic scp
+
+    Args:
+        rng (random.Random): the seeded random generator
+        shape: overrides of `DEFAULT_SHAPE`, e.g. `statements=10`
+
+    Returns:
+        scp (dict): the generated policy
+    '''
+    shape = {**DEFAULT_SHAPE, **shape}
+    actions = known_actions()
+
+    return {
+        'Version': '2012-10-17',
+        'Statement': [generate_statement(rng, actions, index, shape)
+                      for index in range(shape['statements'])]
+    }
+
+
+def generate_sources(files: int = 100, seed: int = 0, **shape) -> list:
+    ''' returns the json sources of a synthetic policy repository
+
+    Args:
+        files (int): the number of policies
+        seed (int): the seed of the random generator
+        shape: overrides of `DEFAULT_SHAPE`
+
+    Returns:
+        sources (list): the indented json source of every policy
+    '''
+    rng = random.Random(seed)
+
+    return [json.dumps(generate_scp(rng, **shape), indent=4)
+            for _ in range(files)]
+
+
+def generate_repo(directory: str, files: int = 100, seed: int = 0,
+                  **shape) -> list:
+    ''' write a synthetic policy repository, see `generate_sources`
+
+    Returns:
+        paths (list): the paths of the written policies
+    '''
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+
+    for index, source in enumerate(generate_sources(files, seed, **shape)):
+        path = os.path.join(directory, f'scp_{index:05d}.json')
+
+        with open(path, 'w') as file:
+            file.write(source)
+
+        paths.append(path)
+
+    logger.info('generated %s policies in %s', len(paths), directory)
+    return paths
@@ -0,0 +1,263 @@
+'''
+Time every stage of the checks for the synthetic policy repositories of
+`generate.SHAPES` and write the results as json. The time of a stage is the
+best of `--repeat` runs over all policies of a shape, the peak memory is
+measured in a separate run with tracemalloc.
+
+.. highlight:: bash
+.. code-block:: bash
+
+    $ python -m benchmarks.run -s small -s large -o new.json
+    $ python -m benchmarks.run --compare old.json new.json
+    $ python -m benchmarks.run --catalog memory -o memory.json
+
+-------
+'''
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import scplint
+from benchmarks.generate import SHAPES, generate_sources
+from scplint.aws_actions import (CATALOG_FILE, ActionCatalog, AwsActions,
+                                 MappedActionCatalog, set_catalog)
+from scplint.loader import load_policy
+from scplint.log import init_logging
+from scplint.report import Report
+from scplint.checkers import BUILTIN_CHECKERS
+from scplint.run_checks import init_worker
+from scplint.scp import SCP
+
+STAGES = ('parse', 'scp') + tuple(
+    checker.name for checker in BUILTIN_CHECKERS) + ('serialize', )
+
+# a stage which is slower by more than this ratio is a regression
+DEFAULT_THRESHOLD = 0.1
+
+# the memory-mapped artifact or the catalog parsed from the text file
+CATALOGS = ('mapped', 'memory')
+
+
+def lint_stages(raw: str, timings: dict, file: str = 'my_scp'):
+    ''' lint a single policy like `run_checks.lint_source` and add the
+    seconds of every stage to the timings
+    '''
+    clock = time.perf_counter
+    start = clock()
+    policy = load_policy(raw)
+    parsed = clock()
+    scp = SCP(scp=policy.scp, filename=file)
+    report = Report(scp, policy)
+    done = clock()
+    timings['parse'] += parsed - start
+    timings['scp'] += done - parsed
+
+    for checker in BUILTIN_CHECKERS:
+        start = clock()
+        checker.cls(report)
+        done = clock()
+        timings[checker.name] += done - start
+
+    start = clock()
+    json.dumps(report.get_report_detailed(), sort_keys=True)
+    timings['serialize'] += clock() - start
+
+
+def run_shape(sources: list, repeat: int = 5) -> dict:
+    ''' returns the best time of every stage, the throughput and the peak
+    memory of linting all sources
+    '''
+    best = dict.fromkeys(STAGES, float('inf'))
+
+    for _ in range(repeat):
+        timings = dict.fromkeys(STAGES, 0.0)
+
+        for index, raw in enumerate(sources):
+            lint_stages(raw, timings, f'scp_{index}')
+
+        for stage, seconds in timings.items():
+            best[stage] = min(best[stage], seconds)
+
+    tracemalloc.start()
+    for index, raw in enumerate(sources):
+        lint_stages(raw, dict.fromkeys(STAGES, 0.0), f'scp_{index}')
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(best.values())
+
+    return {
+        'files': len(sources),
+        'bytes': sum(len(raw) for raw in sources),
+        'stages': best,
+        'total': total,
+        'files_per_second': len(sources) / total if total else None,
+        'peak_memory': peak
+    }
+
+
+def load_catalog(kind: str = 'mapped', repeat: int = 5) -> tuple:
+    ''' load the action catalog of the given kind (see `CATALOGS`)
+
+    Returns:
+        (catalog, seconds) (tuple): the catalog and the best load time
+    '''
+    best = float('inf')
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+
+        if kind == 'mapped':
+            catalog = MappedActionCatalog(CATALOG_FILE)
+        else:
+            catalog = ActionCatalog(AwsActions().get_aws_actions())
+
+        best = min(best, time.perf_counter() - start)
+
+    return catalog, best
+
+
+def git_commit() -> str:
+    ''' returns the current commit or None outside of a git repository '''
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(shapes: list = None, repeat: int = 5,
+                   seed: int = 0, catalog: str = 'mapped') -> dict:
+    ''' run the benchmark of the given shapes, all by default
+
+    Returns:
+        results (dict): the environment and the results of every shape
+    '''
+    loaded, load_time = load_catalog(catalog, repeat)
+    set_catalog(loaded)
+    init_worker()
+    results = {
+        'commit': git_commit(),
+        'version': scplint.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'date': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'seed': seed,
+        'repeat': repeat,
+        'catalog': catalog,
+        'catalog_load': load_time,
+        'shapes': {}
+    }
+
+    for name in shapes or SHAPES:
+        shape = SHAPES[name]
+        sources = generate_sources(seed=seed, **shape)
+        results['shapes'][name] = {'shape': shape,
+                                   **run_shape(sources, repeat)}
+
+    return results
+
+
+def compare(old: dict, new: dict,
+            threshold: float = DEFAULT_THRESHOLD) -> list:
+    ''' compare the stages of two benchmark results
+
+    Returns:
+        rows (list): `(shape, stage, old, new, ratio, regression)` for
+            every stage of the shapes in both results
+    '''
+    rows = []
+
+    for name, result in new['shapes'].items():
+        if name not in old['shapes']:
+            continue
+
+        before = old['shapes'][name]
+        stages = dict(result['stages'], total=result['total'])
+        stages_before = dict(before['stages'], total=before['total'])
+
+        for stage, seconds in stages.items():
+            if not stages_before.get(stage):
+                continue
+
+            ratio = seconds / stages_before[stage]
+            rows.append((name, stage, stages_before[stage], seconds, ratio,
+                         ratio > 1 + threshold))
+
+    return rows
+
+
+def print_results(results: dict):
+    print(f'{results["catalog"]} catalog: loaded in '
+          f'{results["catalog_load"] * 1000:.2f} ms')
+
+    for name, result in results['shapes'].items():
+        print(f'{name}: {result["files"]} files, '
+              f'{result["files_per_second"]:.0f} files/s, '
+              f'peak memory {result["peak_memory"] / 1024:.0f} KiB')
+
+        for stage, seconds in result['stages'].items():
+            print(f'  {stage:<24}{seconds * 1000:10.2f} ms')
+
+
+def print_comparison(rows: list):
+    for name, stage, before, after, ratio, regression in rows:
+        flag = '  REGRESSION' if regression else ''
+        print(f'{name:<12}{stage:<24}{before * 1000:10.2f} ms'
+              f'{after * 1000:10.2f} ms{ratio:8.2f}x{flag}')
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(
+        description='Benchmark the checks of scplint')
+    parser.add_argument('-s', '--shape', action='append',
+                        choices=sorted(SHAPES),
+                        help='Run only the given shape(s), all by default')
+    parser.add_argument('-n', '--repeat', type=int, default=5,
+                        help='Take the best time of N runs')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed of the policy generator')
+    parser.add_argument('--catalog', choices=CATALOGS, default='mapped',
+                        help='Lint with the memory-mapped artifact or the '
+                        'catalog parsed from the text file')
+    parser.add_argument('-o', '--output',
+                        help='Write the results to this json file')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help='Compare two result files')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Slowdown ratio which counts as a regression')
+    args = parser.parse_args(argv)
+
+    # don't measure the logging of the findings
+    init_logging(log_level='CRITICAL', formatter='console',
+                 stream='ext://sys.stderr')
+
+    if args.compare:
+        results = []
+        for path in args.compare:
+            with open(path, 'r') as file:
+                results.append(json.load(file))
+
+        rows = compare(*results, threshold=args.threshold)
+        print_comparison(rows)
+        return 1 if any(row[-1] for row in rows) else 0
+
+    results = run_benchmarks(args.shape, args.repeat, args.seed,
+                             args.catalog)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=4, sort_keys=True)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
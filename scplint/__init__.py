@@ -4,4 +4,4 @@
 
 __author__ = 'Richard Zimmermann'
 __version__ = '0.0.3'
-__all__ = ['aws_actions', 'log', 'report', 'scp', 'statement']
+__all__ = ['api', 'aws_actions', 'log', 'report', 'scp', 'statement']
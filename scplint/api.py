@@ -0,0 +1,84 @@
+'''
+Lint policies from python without the command line interface. Importing
+this module doesn't parse arguments or configure logging, the action
+catalog and the schema are loaded on first use and reused by all later
+calls:
+
+.. highlight:: py
+.. code-block:: py
+
+    from scplint.api import lint_policies
+
+    for report in lint_policies(['path/to/scp.json', {'Version': ...}]):
+        print(report['file'], report['summary'])
+
+-------
+'''
+
+import os
+from logging import getLogger
+
+from scplint.checkers import Selection
+from scplint.run_checks import init_worker, lint_file, lint_policy
+
+logger = getLogger()
+
+DEFAULT_OPTIONS = {
+    'minimize': False,
+    'detailed': False,
+    'cache': None,
+    'select': None,
+    'ignore': None,
+    'max_findings': None
+}
+
+
+def _lint_item(item, index: int, options: dict, selection) -> dict:
+    if isinstance(item, tuple):
+        name, policy = item
+    elif isinstance(item, dict):
+        name, policy = f'policy_{index}', item
+    else:
+        name, policy = os.fspath(item), None
+
+    if policy is None:
+        return lint_file(name, options['minimize'], options['detailed'],
+                         options['cache'], selection=selection,
+                         max_findings=options['max_findings'])
+
+    return lint_policy(policy, name, options['minimize'], options['detailed'],
+                       selection=selection,
+                       max_findings=options['max_findings'])
+
+
+def lint_policies(items, options: dict = None):
+    ''' lint policies one by one, the reports are yielded in the order of
+    the items
+
+    Args:
+        items (iterable): paths of scp files, parsed scps (dict) or
+            `(name, scp)` tuples to name the reports of parsed scps.
+            parsed scps are named `policy_<index>` otherwise.
+        options (dict): `minimize` and `detailed` (bool) like the command
+            line options, an optional `cache` (ResultCache) for files,
+            the code prefixes to `select` or `ignore` and `max_findings`
+            per code
+
+    Yields:
+        report (dict): the (detailed) report of every policy
+
+    Raises:
+        OSError: if a file can't be read
+        ValueError: if a file isn't valid json
+    '''
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    unknown = set(options) - set(DEFAULT_OPTIONS)
+
+    if unknown:
+        raise ValueError(f'unknown options: {", ".join(sorted(unknown))}')
+
+    selection = Selection(options['select'], options['ignore']) or None
+    init_worker()
+
+    for index, item in enumerate(items):
+        yield _lint_item(item, index, options, selection)
@@ -1,12 +1,562 @@
+import hashlib
 import json
+import mmap
 import os
+import struct
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
 from logging import getLogger
-from pathlib import Path
 
-import botocore
+from scplint.wildcards import compile_pattern, resolve
 
 logger = getLogger()
 
+_CATALOG = None
+_CATALOG_LOCK = threading.Lock()
+
+# the caches of other modules which are keyed by a catalog, they're cleared
+# with the shared catalog, so a replaced catalog isn't kept alive
+_CATALOG_CACHES = []
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+ACTIONS_FILE = os.path.join(DATA_DIR, 'aws_actions.txt')
+CATALOG_FILE = os.path.join(DATA_DIR, 'aws_actions.bin')
+MANIFEST_FILE = os.path.join(DATA_DIR, 'aws_actions.manifest.json')
+
+CATALOG_MAGIC = b'SCPLACTS'
+CATALOG_FORMAT_VERSION = 3
+
+# magic, format version, actions, services, key width, source size, source
+# mtime, source digest, catalog version
+_HEADER = struct.Struct('<8sIIIIQQ20s20s')
+_SERVICE = struct.Struct('<II')
+_OFFSET = struct.Struct('<I')
+
+EXPLICIT = 'explicit'
+WILDCARD = 'wildcard'
+UNKNOWN = 'unknown'
+
+
+def has_wildcard(action: str) -> bool:
+    ''' check if the given action contains an IAM wildcard (`*` or `?`) '''
+    return '*' in action or '?' in action
+
+
+class _Catalog:
+    ''' Shared lookups of the in-memory and the memory-mapped catalog.
+
+    Subclasses provide `keys` (sorted lower case actions), `actions` (the
+    same actions in the aws spelling), `services` and `index`.
+    '''
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, action: str) -> bool:
+        return self.index(action) is not None
+
+    def get(self, action: str):
+        ''' returns the catalog spelling of an explicit action or None '''
+        index = self.index(action)
+
+        if index is None:
+            return None
+
+        return self.actions[index]
+
+    def prefix_range(self, prefix: str) -> tuple:
+        ''' find all actions starting with the given prefix
+
+        Args:
+            prefix (str): the case insensitive action prefix, e.g. `ec2:Desc`
+
+        Returns:
+            (start, end) (tuple): the slice of `keys`/`actions` which start
+                with the given prefix
+        '''
+        prefix = prefix.lower()
+        start = bisect_left(self.keys, prefix)
+        # "\uffff" sorts behind every character used in action names
+        end = bisect_left(self.keys, f'{prefix}\uffff', start)
+
+        return start, end
+
+    def service_range(self, service: str) -> tuple:
+        ''' returns the slice of `keys`/`actions` of the given service '''
+        return self.services.get(service.lower(), (0, 0))
+
+    def service_actions(self, service: str) -> tuple:
+        ''' returns all actions of the given service '''
+        start, end = self.service_range(service)
+        return tuple(self.actions[start:end])
+
+    def classify(self, action: str) -> str:
+        ''' classify an action as explicit, wildcard or unknown
+
+        Args:
+            action (str): an Action/NotAction item of a statement
+
+        Returns:
+            classification (str): `explicit`, `wildcard` or `unknown`
+        '''
+        if has_wildcard(action):
+            return WILDCARD
+
+        if action in self:
+            return EXPLICIT
+
+        return UNKNOWN
+
+    def wildcard_actions(self, action: str) -> tuple:
+        ''' returns every known action covered by a wildcard action '''
+        return compile_pattern(action).actions(self)
+
+
+class ActionCatalog(_Catalog):
+    ''' An indexed, read-only view of the known AWS actions.
+
+    Actions are stored once, sorted by their lower case name. IAM action
+    names are case insensitive, so every lookup is done on the lower case
+    key. Because `service:` is a prefix of every action of a service, the
+    actions of a service form a contiguous slice of the sorted keys and
+    every action prefix can be resolved with a binary search.
+
+    The catalog is immutable, a single instance is shared by every report
+    of a process (see `get_catalog`).
+
+    Args:
+        actions (iterable): the known aws actions, e.g. `ec2:CreateVpc`
+    '''
+    __slots__ = ('keys', 'actions', 'version', '_ids', 'services',
+                 '__weakref__')
+
+    def __init__(self, actions):
+        unique = {}
+
+        for action in actions:
+            unique.setdefault(action.lower(), action)
+
+        keys = tuple(sorted(unique))
+        actions = tuple(unique[key] for key in keys)
+        object.__setattr__(self, 'keys', keys)
+        object.__setattr__(self, 'actions', actions)
+        object.__setattr__(self, 'version', catalog_version(actions))
+        object.__setattr__(self, '_ids',
+                           {key: index
+                            for index, key in enumerate(keys)})
+        object.__setattr__(self, 'services', self._index_services())
+
+    def _index_services(self) -> dict:
+        ''' map every service prefix to its slice of the sorted keys
+
+        Returns:
+            services (dict): `{service: (start, end)}`
+        '''
+        services = {}
+
+        for index, key in enumerate(self.keys):
+            service = key.split(':', 1)[0]
+            start, _ = services.get(service, (index, index))
+            services[service] = (start, index + 1)
+
+        return services
+
+    def index(self, action: str):
+        ''' returns the position of an explicit action or None '''
+        return self._ids.get(action.lower())
+
+
+class _KeyTable:
+    ''' The sorted lower case keys of a catalog artifact, stored as a table
+    of utf-8 keys padded with NUL bytes to a fixed width.
+
+    A binary search compares the raw bytes of the table, utf-8 keeps the
+    order of the strings and NUL sorts before every other character, so
+    nothing is decoded while searching.
+    '''
+    __slots__ = ('_buffer', '_table', '_width', 'length')
+
+    def __init__(self, buffer, table: int, width: int, length: int):
+        self._buffer = buffer
+        self._table = table
+        self._width = width
+        self.length = length
+
+    def key(self, index: int) -> str:
+        ''' returns the decoded key at the given position '''
+        start = self._table + self._width * index
+        return self._buffer[start:start + self._width].rstrip(b'\0').decode()
+
+    def keys(self) -> tuple:
+        ''' returns all decoded keys '''
+        width = self._width
+        content = self._buffer[self._table:self._table + width * self.length]
+
+        return tuple(content[start:start + width].rstrip(b'\0').decode()
+                     for start in range(0, len(content), width))
+
+    def bisect(self, key: bytes, low: int = 0, high: int = None) -> int:
+        ''' returns the position of the first key which isn't lower than the
+        given utf-8 encoded key (like `bisect_left`)
+        '''
+        buffer, table, width = self._buffer, self._table, self._width
+
+        if high is None:
+            high = self.length
+
+        while low < high:
+            middle = (low + high) // 2
+            start = table + width * middle
+
+            if buffer[start:start + width] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def equals(self, index: int, key: bytes) -> bool:
+        ''' check if the key at the given position is the utf-8 encoded key
+        '''
+        if len(key) > self._width:
+            return False
+
+        start = self._table + self._width * index
+        return self._buffer[start:start + self._width] == key.ljust(
+            self._width, b'\0')
+
+
+class MappedActionCatalog(_Catalog):
+    ''' The action catalog backed by a memory-mapped artifact (see
+    `write_catalog_artifact`).
+
+    Nothing is parsed on load, only the header is verified. Lookups run a
+    binary search over the fixed-width key table of the mapped file, so
+    startup time doesn't depend on the size of the catalog. The keys and
+    the actions in the aws spelling are decoded at once on first use.
+
+    Args:
+        path (str): the path of the catalog artifact
+
+    Raises:
+        CatalogError: if the file isn't a catalog artifact of this version
+    '''
+    __slots__ = ('path', 'version', 'source_digest', 'source_stat',
+                 '_buffer', '_service_table', '_services', '_key_table',
+                 '_keys', '_action_table', '_actions', '_ids', '__weakref__')
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            # an empty file can't be mapped
+            if os.fstat(file.fileno()).st_size < _HEADER.size:
+                raise CatalogError(f'{path} is not a catalog artifact')
+
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, count, services, width, size, mtime, source,
+         digest) = _HEADER.unpack_from(buffer, 0)
+
+        if magic != CATALOG_MAGIC:
+            raise CatalogError(f'{path} is not a catalog artifact')
+
+        if version != CATALOG_FORMAT_VERSION:
+            raise CatalogError(f'{path} has format version {version}, '
+                               f'expected {CATALOG_FORMAT_VERSION}')
+
+        table = _HEADER.size + _SERVICE.size * services
+        offsets = table + width * count
+        blob = offsets + 4 * (count + 1)
+
+        if len(buffer) < blob:
+            raise CatalogError(f'{path} is truncated')
+
+        # the last offset is the length of the actions
+        if len(buffer) < blob + _OFFSET.unpack_from(buffer, blob - 4)[0]:
+            raise CatalogError(f'{path} is truncated')
+
+        object.__setattr__(self, 'path', path)
+        object.__setattr__(self, 'version', digest.hex())
+        object.__setattr__(self, 'source_digest', source.hex())
+        object.__setattr__(self, 'source_stat', (size, mtime))
+        object.__setattr__(self, '_buffer', buffer)
+        object.__setattr__(self, '_service_table', (_HEADER.size, services))
+        object.__setattr__(self, '_services', None)
+        object.__setattr__(self, '_action_table', (offsets, blob, count))
+        object.__setattr__(self, '_actions', None)
+        object.__setattr__(self, '_key_table',
+                           _KeyTable(buffer, table, width, count))
+        object.__setattr__(self, '_keys', None)
+        # the positions of the actions found so far, at most one per action
+        object.__setattr__(self, '_ids', {})
+
+    def __len__(self) -> int:
+        return self._key_table.length
+
+    @property
+    def keys(self) -> tuple:
+        ''' returns the sorted lower case actions '''
+        if self._keys is not None:
+            return self._keys
+
+        keys = self._key_table.keys()
+
+        object.__setattr__(self, '_keys', keys)
+        return keys
+
+    @property
+    def actions(self) -> tuple:
+        ''' returns the actions in the aws spelling, sorted like `keys` '''
+        if self._actions is not None:
+            return self._actions
+
+        offset, blob, count = self._action_table
+        offsets = struct.unpack_from(f'<{count + 1}I', self._buffer, offset)
+        content = self._buffer[blob:blob + offsets[-1]]
+        actions = tuple(content[start:end].decode()
+                        for start, end in zip(offsets, offsets[1:]))
+
+        object.__setattr__(self, '_actions', actions)
+        return actions
+
+    @property
+    def services(self) -> dict:
+        ''' map every service prefix to its slice of the sorted keys
+
+        Returns:
+            services (dict): `{service: (start, end)}`
+        '''
+        if self._services is not None:
+            return self._services
+
+        offset, count = self._service_table
+        services = {}
+        for index in range(count):
+            start, end = _SERVICE.unpack_from(self._buffer,
+                                              offset + _SERVICE.size * index)
+            service = self._key_table.key(start).split(':', 1)[0]
+            services[service] = (start, end)
+
+        object.__setattr__(self, '_services', services)
+        return services
+
+    def index(self, action: str):
+        ''' returns the position of an explicit action or None '''
+        key = action.lower()
+        index = self._ids.get(key)
+
+        if index is not None:
+            return index
+
+        encoded = key.encode()
+        start, end = self._search_range(key)
+        index = self._key_table.bisect(encoded, start, end)
+
+        if index < end and self._key_table.equals(index, encoded):
+            self._ids[key] = index
+            return index
+
+        return None
+
+    def prefix_range(self, prefix: str) -> tuple:
+        ''' find all actions starting with the given prefix, see
+        `ActionCatalog.prefix_range`
+        '''
+        prefix = prefix.lower()
+        low, high = self._search_range(prefix)
+        encoded = prefix.encode()
+        start = self._key_table.bisect(encoded, low, high)
+        # 0xff is never part of utf-8, it sorts behind every key
+        end = self._key_table.bisect(encoded + b'\xff', start, high)
+
+        return start, end
+
+    def _search_range(self, key: str) -> tuple:
+        ''' returns the slice of the keys which can contain the given lower
+        case key or prefix, the slice of its service if it names one
+        '''
+        service, colon, _ = key.partition(':')
+
+        if colon:
+            return self.services.get(service, (0, 0))
+
+        return 0, len(self)
+
+
+class CatalogError(Exception):
+    ''' raised for missing, broken or outdated catalog artifacts '''
+
+
+def catalog_version(actions) -> str:
+    ''' returns a digest of the sorted actions which identifies a catalog
+
+    Args:
+        actions (iterable): the sorted known aws actions
+
+    Returns:
+        version (str): the sha1 hex digest of the actions
+    '''
+    digest = hashlib.sha1()
+
+    for action in actions:
+        digest.update(f'{action}\n'.encode())
+
+    return digest.hexdigest()
+
+
+def source_digest(path: str) -> str:
+    ''' returns the sha1 hex digest of the content of a file, it identifies
+    the text file an artifact was compiled from
+    '''
+    with open(path, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def source_stat(path: str) -> tuple:
+    ''' returns the size and the modification time (ns) of a file, the
+    digest of an unchanged file isn't computed again
+    '''
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def write_catalog_artifact(catalog: ActionCatalog, path: str,
+                           source: str = None, stat: tuple = (0, 0)):
+    ''' write a catalog as a precompiled, memory-mappable artifact
+
+    The layout is a header (magic, format version, number of actions and
+    services, the width of a key, the size, modification time and digest
+    of the source text file and the catalog version), the service table
+    with the `(start, end)` slice of every service, the table of the lower
+    case keys padded with NUL bytes to the same width, the offset table and
+    the utf-8 encoded actions sorted by their lower case name. All numbers
+    are little-endian.
+
+    Args:
+        catalog (ActionCatalog): the catalog to write
+        path (str): the target path of the artifact
+        source (str): the digest of the text file the catalog was read from
+            (see `source_digest`), it's used to detect a stale artifact
+        stat (tuple): the size and modification time of the text file (see
+            `source_stat`), the digest is only checked if they changed
+    '''
+    logger.debug('write catalog artifact %s', path)
+    encoded = [action.encode() for action in catalog.actions]
+    keys = [key.encode() for key in catalog.keys]
+    width = max(map(len, keys), default=0)
+    offsets = [0]
+
+    for action in encoded:
+        offsets.append(offsets[-1] + len(action))
+
+    with _atomic_write(path) as file:
+        file.write(_HEADER.pack(CATALOG_MAGIC, CATALOG_FORMAT_VERSION,
+                                len(encoded), len(catalog.services), width,
+                                *stat, bytes.fromhex(source or '0' * 40),
+                                bytes.fromhex(catalog.version)))
+
+        for start, end in catalog.services.values():
+            file.write(_SERVICE.pack(start, end))
+
+        file.write(b''.join(key.ljust(width, b'\0') for key in keys))
+        file.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        file.write(b''.join(encoded))
+
+
+@contextmanager
+def _atomic_write(path: str):
+    ''' write a binary file next to the target and move it in place '''
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            yield file
+
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def catalog_cache(cache):
+    ''' register a cache which is keyed by a catalog (e.g. of `lru_cache`),
+    it's cleared if the shared catalog is replaced or reset
+
+    Returns:
+        cache (callable): the registered cache
+    '''
+    _CATALOG_CACHES.append(cache)
+    return cache
+
+
+# the wildcard module can't import this module, its cache is registered here
+catalog_cache(resolve)
+
+
+def _clear_catalog_caches():
+    for cache in _CATALOG_CACHES:
+        cache.cache_clear()
+
+
+def get_catalog() -> ActionCatalog:
+    ''' returns the process-wide action catalog, it's loaded on first use
+
+    Returns:
+        catalog (ActionCatalog): the shared indexed known aws actions
+    '''
+    global _CATALOG
+
+    if _CATALOG is None:
+        with _CATALOG_LOCK:
+            if _CATALOG is None:
+                logger.debug('load aws action catalog')
+                _CATALOG = AwsActions().load_catalog()
+
+    return _CATALOG
+
+
+def set_catalog(catalog) -> ActionCatalog:
+    ''' replace the process-wide action catalog, e.g. within tests
+
+    Args:
+        catalog (ActionCatalog/MappedActionCatalog/iterable): a catalog or
+            a list of actions
+
+    Returns:
+        catalog (ActionCatalog): the new shared catalog
+    '''
+    global _CATALOG
+
+    if not isinstance(catalog, _Catalog):
+        catalog = ActionCatalog(catalog)
+
+    with _CATALOG_LOCK:
+        _CATALOG = catalog
+        _clear_catalog_caches()
+
+    return catalog
+
+
+def reset_catalog():
+    ''' drop the process-wide action catalog, it's reloaded on next use '''
+    global _CATALOG
+
+    with _CATALOG_LOCK:
+        _CATALOG = None
+        _clear_catalog_caches()
+
 
 class AwsActions:
     def __init__(self):
@@ -18,42 +568,192 @@ class AwsActions:
         Returns:
             aws_actions (list): a list with known aws actions
         '''
-        script_dir = os.path.dirname(__file__)
-        rel_path = 'data/aws_actions.txt'
-        abs_file_path = os.path.join(script_dir, rel_path)
-        file = open(abs_file_path, 'r')
-        self.aws_actions = file.read().splitlines()
+        with open(ACTIONS_FILE, 'r') as file:
+            self.aws_actions = file.read().splitlines()
+
         return self.aws_actions
 
-    def update_aws_actions(self):
-        botocore_path = os.path.abspath(botocore.__file__)
-        botocore_data_path = (
-            f'{botocore_path.split("botocore")[0]}/botocore/data/')
-
-        for path in Path(botocore_data_path).rglob('service*.json'):
-            try:
-                # print(f'{path}')
-                item = open(path, 'r', encoding="utf8")
-                item_content = json.loads(item.read())
-                item.close()
-
-                metadata = item_content.get('metadata', {})
-                service_prefix = (metadata.get('signingName')
-                                  or metadata.get('endpointPrefix'))
-                operations = item_content.get('operations', {})
-
-                for operation in operations.keys():
-                    action = f'{service_prefix}:{operation}'
-                    if action not in self.aws_actions:
-                        self.aws_actions.append(action)
-
-            except Exception as error:
-                logger.exception(error)
-                logger.error(path)
-
-        script_dir = os.path.dirname(__file__)
-        rel_path = 'data/aws_actions.txt'
-        abs_file_path = os.path.join(script_dir, rel_path)
-        with open(abs_file_path, 'w') as f:
-            for item in self.aws_actions:
-                f.write(f'{item}\n')
+    def load_catalog(self):
+        ''' returns a new indexed catalog. the precompiled artifact is
+        mapped if it's up to date, otherwise the text file is parsed.
+
+        Returns:
+            catalog (MappedActionCatalog/ActionCatalog): the indexed known
+                aws actions
+        '''
+        try:
+            catalog = MappedActionCatalog(CATALOG_FILE)
+            size, mtime = source_stat(ACTIONS_FILE)
+
+            # the text file is only hashed if it was touched since the
+            # artifact was written, e.g. by a fresh checkout
+            if catalog.source_stat == (size, mtime):
+                return catalog
+
+            if (catalog.source_stat[0] == size
+                    and catalog.source_digest == source_digest(ACTIONS_FILE)):
+                return catalog
+
+            logger.warning('catalog artifact %s is stale, run '
+                           'update_aws_actions to rebuild it', CATALOG_FILE)
+
+        except (OSError, CatalogError) as error:
+            logger.warning('unable to load the catalog artifact: %s', error)
+
+        return ActionCatalog(self.get_aws_actions())
+
+    def write_catalog(self):
+        ''' precompile the local aws actions into the catalog artifact '''
+        write_catalog_artifact(ActionCatalog(self.get_aws_actions()),
+                               CATALOG_FILE, source_digest(ACTIONS_FILE),
+                               source_stat(ACTIONS_FILE))
+
+    def update_aws_actions(self, workers: int = None, force: bool = False):
+        ''' regenerate the local aws actions from the service models of
+        the installed botocore version. unchanged service models are taken
+        from the manifest of the last run.
+
+        Args:
+            workers (int): the number of processes to parse service models
+            force (bool): True to parse every service model again
+        '''
+        # botocore is only needed to update the actions, not to lint
+        import botocore
+
+        data_path = os.path.join(os.path.dirname(botocore.__file__), 'data')
+        manifest = {} if force else _read_manifest(MANIFEST_FILE)
+        actions, manifest = collect_actions(data_path, manifest,
+                                            botocore.__version__, workers)
+
+        self.aws_actions = sorted(actions, key=str.lower)
+        content = ''.join(f'{action}\n' for action in self.aws_actions)
+
+        with _atomic_write(ACTIONS_FILE) as file:
+            file.write(content.encode())
+
+        self.write_catalog()
+
+        with _atomic_write(MANIFEST_FILE) as file:
+            file.write(json.dumps(manifest).encode())
+
+
+def find_service_models(data_path: str) -> list:
+    ''' returns the paths of all botocore service models (plain or gzip
+    compressed), e.g. `ec2/2016-11-15/service-2.json.gz`
+    '''
+    paths = []
+
+    for service in os.scandir(data_path):
+        if not service.is_dir():
+            continue
+
+        for api_version in os.scandir(service.path):
+            if not api_version.is_dir():
+                continue
+
+            for item in os.scandir(api_version.path):
+                if item.name in ('service-2.json', 'service-2.json.gz'):
+                    paths.append(item.path)
+
+    return sorted(paths)
+
+
+def _parse_service_model(path: str) -> tuple:
+    ''' returns the actions of a single botocore service model
+
+    Returns:
+        (path, actions, error) (tuple): the actions or an error message
+    '''
+    import gzip
+
+    try:
+        opener = gzip.open if path.endswith('.gz') else open
+
+        with opener(path, 'rt', encoding='utf8') as file:
+            item_content = json.load(file)
+
+        metadata = item_content.get('metadata', {})
+        service_prefix = (metadata.get('signingName')
+                          or metadata.get('endpointPrefix'))
+        operations = item_content.get('operations', {})
+        actions = [f'{service_prefix}:{operation}' for operation in operations]
+
+        return path, actions, None
+
+    except Exception as error:  # pylint: disable=W0703
+        return path, None, f'{type(error).__name__}: {error}'
+
+
+def _read_manifest(path: str) -> dict:
+    ''' returns the manifest of the last update or an empty one '''
+    try:
+        with open(path, 'r') as file:
+            return json.load(file)
+
+    except (OSError, ValueError):
+        return {}
+
+
+def collect_actions(data_path: str, manifest: dict, botocore_version: str,
+                    workers: int = None) -> tuple:
+    ''' collect the actions of all service models below `data_path`
+
+    Service models are only parsed if they're unknown to the manifest, if
+    their size or modification time changed or if the botocore version
+    differs. Changed models are parsed in a process pool.
+
+    Args:
+        data_path (str): the botocore data directory
+        manifest (dict): the manifest of the last update
+        botocore_version (str): the version of the botocore package
+        workers (int): the number of processes, `None` for one per cpu
+
+    Returns:
+        (actions, manifest) (tuple): the set of all actions and the new
+            manifest
+    '''
+    if manifest.get('botocore') != botocore_version:
+        manifest = {}
+
+    known_models = manifest.get('models', {})
+    models = {}
+    changed = []
+
+    for path in find_service_models(data_path):
+        name = os.path.relpath(path, data_path).replace(os.sep, '/')
+        stat = os.stat(path)
+        model = known_models.get(name)
+
+        if (model and model['size'] == stat.st_size
+                and model['mtime_ns'] == stat.st_mtime_ns):
+            models[name] = model
+        else:
+            models[name] = {'size': stat.st_size,
+                            'mtime_ns': stat.st_mtime_ns}
+            changed.append(path)
+
+    logger.info('parse %s of %s service models', len(changed), len(models))
+
+    if len(changed) > 1 and workers != 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_parse_service_model, changed,
+                                        chunksize=16))
+    else:
+        results = [_parse_service_model(path) for path in changed]
+
+    for path, actions, error in results:
+        name = os.path.relpath(path, data_path).replace(os.sep, '/')
+
+        if error:
+            logger.error('unable to parse %s: %s', path, error)
+            del models[name]
+        else:
+            models[name]['actions'] = actions
+
+    actions = set()
+    for model in models.values():
+        actions.update(model['actions'])
+
+    return actions, {'botocore': botocore_version, 'models': models}
@@ -0,0 +1,140 @@
+'''
+A persistent cache for the results of unchanged policies. Results are
+addressed by a hash of the policy source, the scplint version, the catalog
+version and the options of the run:
+
+.. highlight:: py
+.. code-block:: py
+
+    cache = ResultCache()
+    key = cache.key(raw, {'minimize': True, 'detailed': False})
+    result = cache.get(key)
+
+-------
+'''
+
+import hashlib
+import json
+import os
+import tempfile
+from logging import getLogger
+
+import scplint
+from scplint.aws_actions import get_catalog
+
+logger = getLogger()
+
+MAX_SIZE = 64 * 1024 * 1024
+
+
+def default_cache_dir() -> str:
+    ''' returns `$XDG_CACHE_HOME/scplint` or `~/.cache/scplint` '''
+    cache_home = (os.environ.get('XDG_CACHE_HOME')
+                  or os.path.join(os.path.expanduser('~'), '.cache'))
+
+    return os.path.join(cache_home, 'scplint')
+
+
+class ResultCache:
+    ''' A content-addressed cache of report results on disk.
+
+    Every result is a json file, it's written to a temporary file and moved
+    in place, so concurrent processes never read partial results. Reading a
+    result updates its modification time, `evict` removes the least
+    recently used results once the cache is larger than `max_size`.
+
+    Args:
+        directory (str): the cache directory, see `default_cache_dir`
+        max_size (int): the maximum size of the cache in bytes
+    '''
+    def __init__(self, directory: str = None, max_size: int = MAX_SIZE):
+        self.directory = directory or default_cache_dir()
+        self.max_size = max_size
+
+    def key(self, raw: str, options: dict) -> str:
+        ''' returns the cache key of a policy source and the options of the
+        run
+
+        Args:
+            raw (str): the json source of the policy
+            options (dict): all options which change the result
+        '''
+        digest = hashlib.sha256()
+        digest.update(scplint.__version__.encode())
+        digest.update(get_catalog().version.encode())
+        digest.update(json.dumps(options, sort_keys=True).encode())
+        digest.update(raw.encode())
+
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f'{key}.json')
+
+    def get(self, key: str):
+        ''' returns the cached result or None '''
+        path = self._path(key)
+
+        try:
+            with open(path, 'r') as file:
+                result = json.load(file)
+
+            os.utime(path)
+            return result
+
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, result: dict):
+        ''' store a result, errors are logged and ignored '''
+        path = self._path(key)
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            handle, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path),
+                                                suffix='.tmp')
+
+            try:
+                with os.fdopen(handle, 'w') as file:
+                    json.dump(result, file)
+
+                os.replace(tmp_path, path)
+
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+
+        except OSError as error:
+            logger.warning('unable to cache the result: %s', error)
+
+    def evict(self):
+        ''' remove the least recently used results until the cache is below
+        80% of its maximum size
+        '''
+        entries = []
+        size = 0
+
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, path))
+                size += stat.st_size
+
+        if size <= self.max_size:
+            return
+
+        logger.debug('evict results from %s', self.directory)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size * 0.8:
+                break
+
+            try:
+                os.remove(path)
+                size -= entry_size
+            except OSError:
+                continue
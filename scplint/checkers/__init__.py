@@ -1,3 +1,165 @@
+'''
+The registry of all checkers. A checker is a class which is called with the
+report of a single scp, the rule codes of a checker are the keys of the
+`MSGS` of its module or class. Other packages add checkers with an entry
+point of the group `scplint.checkers`:
+
+.. highlight:: ini
+.. code-block:: ini
+
+    [options.entry_points]
+    scplint.checkers =
+        check_tags = my_package.check_tags:CheckTags
+
+Checkers and findings are selected by code prefix, a checker is skipped if
+none of its codes is selected:
+
+.. highlight:: py
+.. code-block:: py
+
+    selection = Selection(select=['E0', 'E1', 'W1'])
+    [checker.name for checker in selection.checkers()]
+
+-------
+'''
+
+import sys
+from collections import namedtuple
+from functools import lru_cache
+from logging import getLogger
+
+from scplint.checkers import (check_actions, check_limits,
+                              check_recommendations, check_schema)
+
 __all__ = [
     'check_actions', 'check_limits', 'check_schema', 'check_recommendations'
 ]
+
+logger = getLogger()
+
+ENTRY_POINT_GROUP = 'scplint.checkers'
+
+Checker = namedtuple('Checker', ['name', 'cls', 'codes'])
+
+
+def checker_codes(cls) -> tuple:
+    ''' returns the sorted rule codes of a checker, taken from the `MSGS` of
+    the class or of its module
+    '''
+    msgs = getattr(cls, 'MSGS', None)
+
+    if msgs is None:
+        msgs = getattr(sys.modules.get(cls.__module__), 'MSGS', {})
+
+    return tuple(sorted(msgs))
+
+
+BUILTIN_CHECKERS = tuple(
+    Checker(name, cls, checker_codes(cls)) for name, cls in (
+        ('check_schema', check_schema.CheckSchema),
+        ('check_limits', check_limits.CheckLimits),
+        ('check_actions', check_actions.CheckActions),
+        ('check_recommendations', check_recommendations.CheckRecommendations)
+    ))
+
+
+def _entry_points() -> list:
+    from importlib.metadata import entry_points
+
+    points = entry_points()
+
+    # the selectable entry points are new in python 3.10
+    if hasattr(points, 'select'):
+        return list(points.select(group=ENTRY_POINT_GROUP))
+
+    return list(points.get(ENTRY_POINT_GROUP, []))
+
+
+@lru_cache(maxsize=None)
+def get_checkers() -> tuple:
+    ''' returns the builtin checkers and the checkers of all installed
+    entry points, in the order they run. entry points are loaded once per
+    process, a broken entry point is logged and skipped.
+    '''
+    checkers = list(BUILTIN_CHECKERS)
+    names = {checker.name for checker in checkers}
+
+    for point in _entry_points():
+        if point.name in names:
+            logger.warning('skip checker %s, the name is taken', point.name)
+            continue
+
+        try:
+            cls = point.load()
+        except Exception as error:  # pylint: disable=W0703
+            logger.error('unable to load checker %s: %s', point.name, error)
+            continue
+
+        checkers.append(Checker(point.name, cls, checker_codes(cls)))
+        names.add(point.name)
+
+    return tuple(checkers)
+
+
+def split_codes(value) -> tuple:
+    ''' returns the code prefixes of a comma separated string or a list '''
+    if value is None:
+        return ()
+
+    if isinstance(value, str):
+        value = value.replace('\n', ',').split(',')
+
+    return tuple(sorted({code.strip().upper() for code in value
+                         if code.strip()}))
+
+
+class Selection:
+    ''' the rule codes to check, selected by code prefix, e.g. `E0` or `W2`.
+    a code is checked if it matches a selected prefix (all codes if nothing
+    is selected) and no ignored prefix.
+
+    Args:
+        select (list|str): code prefixes to check, all by default
+        ignore (list|str): code prefixes to skip
+    '''
+    __slots__ = ('select', 'ignore', '_codes', '_checkers')
+
+    def __init__(self, select=None, ignore=None):
+        self.select = split_codes(select)
+        self.ignore = split_codes(ignore)
+        self._codes = {}
+        self._checkers = None
+
+    def __bool__(self) -> bool:
+        ''' True if the selection skips any code '''
+        return bool(self.select or self.ignore)
+
+    def __call__(self, code: str) -> bool:
+        ''' returns True if the code is selected '''
+        selected = self._codes.get(code)
+
+        if selected is None:
+            selected = ((not self.select or code.startswith(self.select))
+                        and not code.startswith(self.ignore))
+            self._codes[code] = selected
+
+        return selected
+
+    def checkers(self) -> tuple:
+        ''' returns the checkers with at least one selected code, checkers
+        without codes always run
+        '''
+        if self._checkers is None:
+            self._checkers = tuple(
+                checker for checker in get_checkers()
+                if not checker.codes
+                or any(self(code) for code in checker.codes))
+
+        return self._checkers
+
+    def options(self) -> dict:
+        ''' returns the selection as options, e.g. of a cache key '''
+        if not self:
+            return {}
+
+        return {'select': list(self.select), 'ignore': list(self.ignore)}
@@ -1,13 +1,15 @@
-from scplint.aws_actions import AwsActions
-
 from logging import getLogger
 
+from scplint.aws_actions import EXPLICIT, WILDCARD, get_catalog
+from scplint.permissions import Permissions
+from scplint.suggestions import get_suggester
+
 logger = getLogger()
 
 MSGS = {
     'W201': {
         'rule': 'Unknown Action',
-        'msg': 'Action {action} is unknown. Do you mean {action_aws}?'
+        'msg': 'Action {action} is unknown.{suggestion}'
     },
     'I201': {
         'rule': 'Duplicate Action',
@@ -23,39 +25,49 @@ class CheckActions():
         logger.debug('initialize: check actions')
         self.report = report
         self.scp = report.scp
-        self.actions_aws = AwsActions().get_aws_actions()
+        self.catalog = get_catalog()
         self._check_actions()
         self._check_duplicates()
+        self.report.permissions = Permissions(self.scp.scp, self.catalog)
 
     def _check_actions(self):
-        for action in self.report.actions:
-            self._check_action_explicit(action)
+        for statement in self.scp.statements:
+            for position, action in enumerate(statement.actions):
+                classification = self.catalog.classify(action)
+                self.report.count('catalog_lookups')
 
-            for action_aws in self.actions_aws:
-                self._check_action_wildcard(action, action_aws)
-                self._check_warning_actions(action, action_aws)
+                if classification == EXPLICIT:
+                    self._check_action_explicit(action)
+                elif classification == WILDCARD:
+                    self._check_action_wildcard(action)
+                else:
+                    path = statement.path('Action', position)
+                    self._check_warning_actions(action, path)
 
     def _check_action_explicit(self, action):
-        if action in self.actions_aws:
-            logger.debug('%s is a fully supported AWS action', action)
-            self.report.actions_explicit.append(action)
+        logger.debug('%s is a fully supported AWS action', action)
+        self.report.actions_explicit.append(action)
 
-    def _check_action_wildcard(self, action, action_aws):
-        if len(action.split('*')) > 1 and action.split('*')[0] in action_aws:
-            logger.debug('%s contains a wildcard for %s', action, action_aws)
-            # self.report.infos.append(MSGS['I001'])
-            self.report.actions_wildcard.append(action_aws)
+    def _check_action_wildcard(self, action):
+        actions_aws = self.catalog.wildcard_actions(action)
+        self.report.count('wildcard_resolutions')
+        logger.debug('%s contains a wildcard for %s actions', action,
+                     len(actions_aws))
+        self.report.actions_wildcard += actions_aws
 
-    def _check_warning_actions(self, action, action_aws):
-        details = {'action': action, 'action_aws': action_aws}
-        # if len(action.split('*')) > 1:
-        #     action = action.split('*')[0]
+    def _check_warning_actions(self, action, path=None):
+        ''' add a single warning with the closest known actions for an
+        unknown action, if there are similar ones
+        '''
+        suggestions = get_suggester(self.catalog).suggest(action)
+        self.report.count('suggestions')
+        suggestion = ''
+        if suggestions:
+            suggestion = f' Do you mean {" or ".join(suggestions)}?'
 
-        if action not in self.report.actions_explicit:
-            if (action != action_aws) and (action in action_aws
-                                           or action_aws in action):
-                self.report.actions_warning.append(action)
-                self.report.add_warning(MSGS, 'W201', details)
+        details = {'action': action, 'suggestion': suggestion}
+        self.report.actions_warning.append(action)
+        self.report.add_warning(MSGS, 'W201', details, path)
 
     def _check_duplicates(self):
         actions = self.report.actions
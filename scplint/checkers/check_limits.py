@@ -20,6 +20,11 @@ MSGS = {
         'rule': 'Size Warning',
         'msg': ('Your SCP has already reached {percent}% of the maximum size. '
                 'Please try it again with argument -m (--minimize).')
+    },
+    'I101': {
+        'rule': 'Statement Size',
+        'msg': ('Statement {statement} is the largest statement with '
+                '{size} of {total} bytes of the minimized SCP.')
     }
 }
 
@@ -32,6 +37,9 @@ class CheckLimits():
         self._check_scp_limit()
 
     def _check_scp_limit(self):
+        if self.scp.size > self.scp.size_max or self.scp.percent > 90:
+            self._check_largest_statement()
+
         if self.scp.size > self.scp.size_max and self.scp.minimized:
             self.report.add_error(MSGS, 'E101', vars(self.scp))
 
@@ -43,3 +51,18 @@ class CheckLimits():
 
         elif self.scp.percent > 90 and not self.scp.minimized:
             self.report.add_warning(MSGS, 'W102', vars(self.scp))
+
+    def _check_largest_statement(self):
+        ''' name the statement which shrinks the scp most if it's removed
+        or split
+        '''
+        sizes = self.scp.sizes
+
+        for index in sizes.largest():
+            statement = self.scp.statements[index]
+            details = {
+                'statement': statement.sid or index,
+                'size': sizes.statements[index],
+                'total': sizes.total
+            }
+            self.report.add_info(MSGS, 'I101', details, statement.path())
@@ -1,5 +1,9 @@
+import json
 from logging import getLogger
 
+from scplint.optimizers.optimize_actions import compress_actions
+from scplint.optimizers.subsumption import find_covered
+
 logger = getLogger()
 
 MSGS = {
@@ -13,15 +17,18 @@ MSGS = {
     },
     'O303': {
         'rule': 'Add Wildcard',
-        'msg': ('Action {action_1} and {action_2} can be abstracted by '
-                'a wildcard {action_1}*.')
+        'msg': ('{count} actions can be replaced by the wildcard '
+                '{pattern}, it covers no other known action.')
     },
     'O304': {
         'rule': 'Unnecessary Action',
-        'msg': '{action_1} is already a wildcard for {action_2}.'
+        'msg': '{wildcard} already covers {count} item(s): {actions}.'
     }
 }
 
+# the covered items named in a single recommendation
+MAX_NAMES = 5
+
 
 class CheckRecommendations():
     def __init__(self, report):
@@ -35,7 +42,9 @@ class CheckRecommendations():
         '''
         for statement in self.scp.statements:
             self._check_sort(statement)
-            self._check_optimizations(statement)
+            self._check_wildcards(statement)
+
+        self._check_optimizations()
 
     def _check_sort(self, statement):
         ''' check if the given statement is already sorted
@@ -43,31 +52,90 @@ class CheckRecommendations():
 
         if statement.actions and isinstance(statement.actions, list):
             if sorted(statement.actions) != statement.actions:
-                self.report.add_recommendation(MSGS, 'O301', {})
+                self.report.add_recommendation(MSGS, 'O301', {},
+                                               statement.path('Action'))
 
         if statement.notactions and isinstance(statement.notactions, list):
             if sorted(statement.notactions) != statement.notactions:
-                self.report.add_recommendation(MSGS, 'O302', {})
+                self.report.add_recommendation(MSGS, 'O302', {},
+                                               statement.path('NotAction'))
+
+    def _check_wildcards(self, statement):
+        ''' check if listed actions can be replaced by a wildcard which
+        covers exactly the same known actions
+        '''
+        for key in ('Action', 'NotAction'):
+            actions = statement.statement.get(key)
 
-    def _check_optimizations(self, statement):
-        ''' compare actions within a single statement and check if they can be
-        abstracted by wildcards to reduce the policy size
+            if not isinstance(actions, list) or len(actions) < 2:
+                continue
+
+            self.report.count('compressions')
+            result = compress_actions(actions)
+
+            for pattern, replaced in result.patterns.items():
+                details = {'count': len(replaced), 'pattern': pattern}
+                self.report.add_recommendation(MSGS, 'O303', details,
+                                               statement.path(key))
+
+    def _check_optimizations(self):
+        ''' check if actions are covered by a wildcard of the same statement
+        or of another statement with the same effect, resources and
+        conditions. NotActions are only compared within a statement, the
+        NotActions of two statements don't add up.
         '''
-        actions = statement.actions or statement.notactions
+        groups = {}
+
+        for statement in self.scp.statements:
+            if statement.actions:
+                groups.setdefault(_scope(statement), []).extend(
+                    (action, (statement, 'Action', position))
+                    for position, action in enumerate(statement.actions))
+
+            if statement.notactions:
+                groups[statement.index, 'NotAction'] = [
+                    (action, (statement, 'NotAction', position))
+                    for position, action in enumerate(statement.notactions)]
+
+        for items in groups.values():
+            if len(items) < 2:
+                continue
+
+            for wildcard, refs in find_covered(items).items():
+                self._add_covered(wildcard, refs)
+
+    def _add_covered(self, wildcard: tuple, refs: list):
+        ''' add a single recommendation for all items covered by a wildcard
+        '''
+        statement, key, position = wildcard
+        names = []
+
+        for other, other_key, other_position in refs[:MAX_NAMES]:
+            name = _item(other, other_key, other_position)
+            if other is not statement:
+                name += f' (statement {other.sid or other.index})'
+            names.append(name)
+
+        if len(refs) > MAX_NAMES:
+            names.append(f'and {len(refs) - MAX_NAMES} more')
+
+        details = {'wildcard': _item(statement, key, position),
+                   'count': len(refs), 'actions': ', '.join(names)}
+        self.report.add_recommendation(MSGS, 'O304', details,
+                                       statement.path(key, position))
+
 
-        if isinstance(actions, list) and len(actions) > 1:
-            for action_1 in actions:
-                for action_2 in actions:
-                    details = {'action_1': action_1, 'action_2': action_2}
+def _item(statement, key: str, position: int) -> str:
+    if key == 'Action':
+        return statement.actions[position]
 
-                    if action_1 == action_2:
-                        continue
+    return statement.notactions[position]
 
-                    # TODO: pay attention that a wildcard could allow more than
-                    # just the two actions. check needs to be more complex.
-                    #
-                    # if action_1 in action_2:
-                    #     self.report.add_recommendation(MSGS, 'O303', details)
 
-                    if '*' in action_1 and action_1.split('*')[0] in action_2:
-                        self.report.add_recommendation(MSGS, 'O304', details)
+def _scope(statement) -> tuple:
+    ''' returns what statements must share to add up their actions '''
+    return ('Action', statement.effect,
+            json.dumps(statement.statement.get('Resource'), sort_keys=True),
+            json.dumps(statement.statement.get('NotResource'),
+                       sort_keys=True),
+            json.dumps(statement.conditions, sort_keys=True))
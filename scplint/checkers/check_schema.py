@@ -1,12 +1,13 @@
+from functools import lru_cache
 from logging import getLogger
 from pathlib import Path
 import json
-
-from jsonschema import Draft7Validator, validators
-from jsonschema.exceptions import ValidationError
+import re
 
 logger = getLogger()
 
+SCHEMA_FILE = Path(__file__).absolute().parent.parent / 'models' / 'scp.json'
+
 MSGS = {
     'E000': {
         'rule': 'Validation Error',
@@ -19,6 +20,11 @@ MSGS = {
 }
 
 
+SCP_KEYS = frozenset(('Version', 'Statement'))
+STATEMENT_KEYS = frozenset(
+    ('Sid', 'Effect', 'Action', 'NotAction', 'Resource', 'Condition'))
+
+
 def format_errors(errors: list) -> list:
     ''' Re-format the errors from JSONSchema.
 
@@ -43,6 +49,9 @@ def format_errors(errors: list) -> list:
 
 
 def extend_with_default(validator_class):
+    # jsonschema is only imported if a policy fails the fast check
+    from jsonschema import validators
+
     validate_properties = validator_class.VALIDATORS['properties']
 
     def set_defaults(validator, properties, instance, schema):
@@ -64,17 +73,111 @@ def extend_with_default(validator_class):
     )
 
 
-def dict_raise_on_duplicates(ordered_pairs: list) -> dict:
-    ''' raise ValueError for duplicate keys '''
-    tmp_dict = {}
+@lru_cache(maxsize=None)
+def load_schema() -> dict:
+    ''' returns the json schema of a scp, it's read once per process '''
+    logger.debug('load scp schema')
 
-    for key, value in ordered_pairs:
-        if key in tmp_dict:
-            raise ValueError(key)
-        else:
-            tmp_dict[key] = value
+    with open(SCHEMA_FILE, 'r') as file:
+        return json.load(file)
+
+
+@lru_cache(maxsize=None)
+def get_validator():
+    ''' returns the compiled validator of the scp schema, it's created once
+    per process
+    '''
+    from jsonschema import Draft7Validator
+
+    logger.debug('compile scp schema validator')
+    Draft7ValidatorDefaults = extend_with_default(Draft7Validator)
+
+    return Draft7ValidatorDefaults(load_schema())
+
+
+@lru_cache(maxsize=None)
+def _condition_operators() -> tuple:
+    ''' returns the known condition operators and the compiled patterns of
+    the condition operators of the scp schema
+    '''
+    conditions = load_schema()['definitions']['conditions']
+    patterns = tuple(re.compile(pattern)
+                     for pattern in conditions.get('patternProperties', {}))
+
+    return frozenset(conditions.get('properties', {})), patterns
+
+
+def _is_string_or_list(value) -> bool:
+    return isinstance(value, (str, list))
+
+
+def _is_valid_statement(statement) -> bool:
+    ''' a structural check of a single statement, see `is_valid_scp` '''
+    if not isinstance(statement, dict) or not STATEMENT_KEYS.issuperset(
+            statement):
+        return False
+
+    if statement.get('Effect') not in ('Allow', 'Deny'):
+        return False
+
+    if ('Action' in statement) == ('NotAction' in statement):
+        return False
+
+    if not _is_string_or_list(statement.get('Resource')):
+        return False
 
-    return tmp_dict
+    for key in ('Action', 'NotAction'):
+        if key in statement and not _is_string_or_list(statement[key]):
+            return False
+
+    if 'Sid' in statement and not isinstance(statement['Sid'], str):
+        return False
+
+    if 'Condition' not in statement:
+        return True
+
+    return _is_valid_condition(statement['Condition'])
+
+
+def _is_valid_condition(condition) -> bool:
+    if not isinstance(condition, dict):
+        return False
+
+    operators, patterns = _condition_operators()
+
+    for operator, value in condition.items():
+        if not isinstance(value, dict):
+            return False
+
+        if operator not in operators and not any(
+                pattern.search(operator) for pattern in patterns):
+            return False
+
+    return True
+
+
+def is_valid_scp(scp) -> bool:
+    ''' a fast structural check which mirrors the scp schema. it's only
+    used to skip the jsonschema validation of valid policies, a policy
+    which fails this check is validated by jsonschema to get the errors.
+
+    Args:
+        scp (dict): the scp
+
+    Returns:
+        valid (bool): True if the scp is valid
+    '''
+    if not isinstance(scp, dict) or set(scp) != SCP_KEYS:
+        return False
+
+    if scp['Version'] != '2012-10-17':
+        return False
+
+    statements = scp['Statement']
+    if not isinstance(statements, list) or not statements:
+        return False
+
+    return all(_is_valid_statement(statement) for statement in statements)
 
 
 class CheckSchema():
@@ -89,35 +192,28 @@ class CheckSchema():
         ''' check if there are duplicate keys in the scp '''
         logger.debug('check duplicate keys')
 
-        try:
-            json.loads(self.report.raw,
-                       object_pairs_hook=dict_raise_on_duplicates)
-        except ValueError as error:
-            print(error)
-            details = {'key': str(error)}
-            self.report.add_error(MSGS, 'E001', details)
+        for duplicate in self.report.duplicates:
+            details = {'key': duplicate['key']}
+            self.report.add_error(MSGS, 'E001', details, duplicate)
 
     def _verify_schema(self):
         ''' verifies the json schema of the scp '''
         logger.debug('verify scp schema')
+        msg = 'SCP schema validation was successful.'
 
-        script_location = Path(__file__).absolute().parent
-        file_location = f'{script_location}/../models/scp.json'
-        schema = json.loads(open(file_location, 'r').read())
+        # the schema has no defaults, skipping jsonschema for valid policies
+        # doesn't change the scp
+        if is_valid_scp(self.scp.scp):
+            logger.info(msg)
+            return msg
 
-        try:
-            Draft7ValidatorDefaults = extend_with_default(Draft7Validator)
-            validator = Draft7ValidatorDefaults(schema)
-            validator.validate(self.scp.scp)
-            msg = 'SCP schema validation was successful.'
+        errors = sorted(get_validator().iter_errors(self.scp.scp),
+                        key=lambda error: error.path)
 
+        if not errors:
             logger.info(msg)
             return msg
 
-        except ValidationError:
-            errors = sorted(validator.iter_errors(self.scp.scp),
-                            key=lambda error: error.path)
-
-            for error in format_errors(errors):
-                details = {'errors': error}
-                self.report.add_error(MSGS, 'E000', details)
+        for error in format_errors(errors):
+            details = {'errors': error}
+            self.report.add_error(MSGS, 'E000', details)
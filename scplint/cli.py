@@ -1,126 +1,564 @@
 import argparse
-import configparser
 import json
-import pathlib
+import os
 import re
 import sys
+from functools import partial
 from glob import glob
-
-import yaml
+from logging import getLogger
 
 import scplint
 from scplint.log import init_logging
-from scplint.report import Report
-from scplint.run_checks import run_checks
-from scplint.scp import SCP
-
-PARSER = argparse.ArgumentParser(
-    description=('SCPlint to validate and optimize your AWS SCPs'))
-
-PARSER.add_argument('-i', '--input', required=True,
-                    help='Path to the SCP(s), e.g. "path/to/scp.json"')
-PARSER.add_argument('-d', '--detailed', action='store_true',
-                    help='Enable detailed report of your SCP(s)')
-PARSER.add_argument('-m', '--minimize', action='store_true',
-                    help='Minimize the SCP (remove linebreaks and blanks)')
-PARSER.add_argument('-r', '--recursive', action='store_true',
-                    help='Search recursive for json files the given folder.')
-PARSER.add_argument('-o', '--output', choices=['json', 'yaml'], default='json',
-                    help='Configure output format of the report')
-PARSER.add_argument('-v', '--verbose', action='store_true',
-                    help='Enable verbose logging.')
-PARSER.add_argument('--version', action='version',
-                    version=f'scplint v{scplint.__version__}',
-                    help='Print the current version of scplint')
-
-ARGS = vars(PARSER.parse_args())
-
-if ARGS.get('verbose'):
-    log_level = 'DEBUG'
-else:
-    log_level = 'ERROR'
-
-logger = init_logging(log_level=log_level, formatter='console')
-
-
-def verify_search_term():
-    search_term = ARGS['input']
+from scplint.report import add_to_summary, create_summary, new_summary
+
+logger = getLogger()
+
+# the first of these files with a [scplint] section is the configuration
+CONFIG_FILES = ('.scplint', 'setup.cfg', 'tox.ini')
+CONFIG_SECTION = 'scplint'
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ''' returns the argument parser of the command line interface '''
+    parser = argparse.ArgumentParser(
+        description=('SCPlint to validate and optimize your AWS SCPs'))
+
+    parser.add_argument('-i', '--input',
+                        help='Path to the SCP(s), e.g. "path/to/scp.json"')
+    parser.add_argument('-d', '--detailed', action='store_true',
+                        help='Enable detailed report of your SCP(s)')
+    parser.add_argument('-m', '--minimize', action='store_true',
+                        help='Minimize the SCP (remove linebreaks and blanks)')
+    parser.add_argument('-r', '--recursive', action='store_true',
+                        help=('Search recursive for json files the given '
+                              'folder.'))
+    parser.add_argument('-o', '--output', choices=['json', 'yaml', 'ndjson'],
+                        default='json',
+                        help=('Configure output format of the report, '
+                              'ndjson prints one line per file as soon as it '
+                              'is checked and a summary line at the end'))
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help=('Check the files with N processes in parallel '
+                              '(0 uses one process per cpu).'))
+    parser.add_argument('--cache-dir', default=None,
+                        help=('Directory of the result cache (default: '
+                              '~/.cache/scplint)'))
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Check every file, even if it is unchanged.')
+    # the server module isn't imported for the help, an empty address is
+    # the default address of the server
+    parser.add_argument('--serve', metavar='[HOST:]PORT', nargs='?',
+                        const='',
+                        help=('Run a local lint server which keeps the '
+                              'catalog and the schema loaded (default: '
+                              'localhost and the DEFAULT_PORT of '
+                              'scplint.server)'))
+    parser.add_argument('--allow-remote', action='store_true',
+                        help=('Let --serve listen on other than loopback '
+                              'addresses, every client can read the files '
+                              'of this host'))
+    parser.add_argument('--server', metavar='URL',
+                        help=('Send the files to a running lint server, e.g. '
+                              '"http://127.0.0.1:8765"'))
+    parser.add_argument('--select', metavar='CODES',
+                        help=('Only check these comma separated code '
+                              'prefixes, e.g. "E0,E1,W1"'))
+    parser.add_argument('--ignore', metavar='CODES',
+                        help=('Skip these comma separated code prefixes, '
+                              'e.g. "O3"'))
+    parser.add_argument('--config', metavar='PATH',
+                        help=('Read "select" and "ignore" from the [scplint] '
+                              'section of this file (default: .scplint, '
+                              'setup.cfg or tox.ini)'))
+    parser.add_argument('--max-findings', metavar='N', type=int,
+                        help=('Report at most N different findings per code, '
+                              'identical findings are always grouped'))
+    parser.add_argument('--optimize', action='store_true',
+                        help=('Print the SCP(s) with actions replaced by '
+                              'wildcards and the bytes saved instead of a '
+                              'report'))
+    parser.add_argument('--over-grant', metavar='N', type=int, default=0,
+                        help=('Allow the wildcards of --optimize to cover N '
+                              'unlisted actions per statement (default: 0)'))
+    parser.add_argument('--split', action='store_true',
+                        help=('Print the SCP(s) split into policies which '
+                              'fit the maximum size instead of a report'))
+    parser.add_argument('--max-policies', metavar='N', type=int, default=5,
+                        help=('The maximum number of policies of --split '
+                              '(default: 5, the AWS limit per target)'))
+    parser.add_argument('--org', metavar='PATH',
+                        help=('Report the allowed actions of every node of '
+                              'the organization described in this json or '
+                              'yaml file'))
+    parser.add_argument('--baseline', metavar='PATH',
+                        help=('Report actions --org allows additionally '
+                              'compared to this organization file'))
+    parser.add_argument('--diff', nargs=2, metavar=('OLD', 'NEW'),
+                        help=('Report the actions which are denied or '
+                              'allowed differently by two SCPs or two '
+                              'directories of SCPs'))
+    parser.add_argument('--profile', action='store_true',
+                        help=('Add the time of every check and call counts '
+                              'to the detailed report (implies -d, skips the '
+                              'cache)'))
+    parser.add_argument('--profile-output', metavar='PATH',
+                        help=('Write a cProfile of the whole run to PATH, '
+                              'e.g. for "python -m pstats PATH"'))
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Enable verbose logging.')
+    parser.add_argument('--version', action='version',
+                        version=f'scplint v{scplint.__version__}',
+                        help='Print the current version of scplint')
+
+    return parser
+
+
+def configure_logging(args: dict):
+    ''' log errors only or everything if verbose. the log of the ndjson
+    output goes to stderr to keep the stream on stdout parseable.
+    '''
+    if args.get('verbose'):
+        log_level = 'DEBUG'
+    else:
+        log_level = 'ERROR'
+
+    if args.get('output') == 'ndjson':
+        log_stream = 'ext://sys.stderr'
+    else:
+        log_stream = 'ext://sys.stdout'
+
+    init_logging(log_level=log_level, formatter='console', stream=log_stream)
+
+
+def verify_search_term(args: dict):
+    search_term = args['input']
     logger.debug('input search term is %s', search_term)
 
-    if search_term == '.' and ARGS.get('recursive'):
+    if search_term == '.' and args.get('recursive'):
         search_term = '**/*.json'
-    elif search_term == '.' and not ARGS.get('recursive'):
+    elif search_term == '.' and not args.get('recursive'):
         search_term = '*.json'
-    elif re.match(r'.*/$', search_term) and ARGS.get('recursive'):
+    elif re.match(r'.*/$', search_term) and args.get('recursive'):
         search_term += '**/*.json'
-    elif re.match(r'.*/$', search_term) and not ARGS.get('recursive'):
+    elif re.match(r'.*/$', search_term) and not args.get('recursive'):
         search_term += '*.json'
 
     logger.debug('continue with search term %s', search_term)
     return search_term
 
 
-def get_file_paths():
-    search_term = verify_search_term()
-    files = glob(search_term, recursive=ARGS.get('recursive'))
+def get_file_paths(args: dict):
+    search_term = verify_search_term(args)
+    files = glob(search_term, recursive=args.get('recursive'))
     logger.debug('found %s file(s): %s', len(files), files)
     return files
 
 
-def print_report(report: dict):
-    if ARGS['output'] == 'json':
+def print_report(report: dict, output: str = 'json'):
+    if output == 'json':
         print(json.dumps(report, indent=4, sort_keys=True))
-    elif ARGS['output'] == 'yaml':
+    elif output == 'yaml':
+        import yaml
+
         print(yaml.dump(report, width=79, indent=2))
 
 
-def create_summary(all_results: list) -> dict:
-    report = {
-        'details': all_results,
-        'files': [],
-        'summary': {
-            'recommendations': 0,
-            'infos': 0,
-            'warnings': 0,
-            'errors': 0
+def read_config(path: str = None) -> dict:
+    ''' returns the [scplint] section of the given config file or of the
+    first default config file which has one. default config files which
+    can't be parsed are skipped.
+
+    Raises:
+        OSError: if the given config file can't be read
+        ValueError: if the given config file can't be parsed
+    '''
+    import configparser
+
+    for file in [path] if path else CONFIG_FILES:
+        config = configparser.ConfigParser()
+
+        try:
+            found = config.read(file)
+        except (configparser.Error, UnicodeDecodeError) as error:
+            if path:
+                raise ValueError(f'unable to parse config file {path}: '
+                                 f'{error}') from error
+
+            logger.warning('skip config file %s: %s', file, error)
+            continue
+
+        if not found and path:
+            raise OSError(f'unable to read config file {path}')
+
+        if config.has_section(CONFIG_SECTION):
+            logger.debug('read config %s', file)
+            return dict(config[CONFIG_SECTION])
+
+    return {}
+
+
+def get_selection(args: dict):
+    ''' returns the selected codes or None to check all codes '''
+    from scplint.checkers import Selection
+
+    selection = Selection(args.get('select'), args.get('ignore'))
+    return selection or None
+
+
+def get_cache(args: dict):
+    if args.get('no_cache'):
+        return None
+
+    from scplint.cache import ResultCache
+
+    return ResultCache(args.get('cache_dir'))
+
+
+def lint_files(files: list, args: dict):
+    ''' check all files, in parallel if more than one job is configured.
+    the results are yielded in the same order as the files.
+    '''
+    from scplint.run_checks import init_worker, lint_file
+
+    jobs = args.get('jobs')
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    check = partial(lint_file, minimize=args.get('minimize'),
+                    detailed=args.get('detailed'), cache=get_cache(args),
+                    profile=args.get('profile'),
+                    selection=get_selection(args),
+                    max_findings=args.get('max_findings'))
+
+    if jobs < 2 or len(files) < 2:
+        yield from map(check, files)
+        return
+
+    # load the catalog and the schema before the workers are forked, so
+    # they share the memory of the parent process where it's possible
+    init_worker()
+    logger.debug('check %s files with %s jobs', len(files), jobs)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs,
+                             initializer=init_worker) as executor:
+        chunksize = max(1, len(files) // (jobs * 4))
+        yield from executor.map(check, files, chunksize=chunksize)
+
+
+def stream_report(results) -> dict:
+    ''' print every result as a single json line as soon as it's available
+    and a summary line at the end. only the summary is kept in memory.
+
+    Returns:
+        summary (dict): the summary of all results
+    '''
+    summary = new_summary()
+    file_count = 0
+
+    for result in results:
+        add_to_summary(summary, result)
+        file_count += 1
+        print(json.dumps(result, sort_keys=True), flush=True)
+
+    print(json.dumps({'file_count': file_count, 'summary': summary},
+                     sort_keys=True), flush=True)
+
+    return summary
+
+
+def server_message(error) -> str:
+    ''' returns the message of the error response of the lint server '''
+    body = error.read().decode(errors='replace')
+
+    try:
+        return json.loads(body)['message']
+    except (ValueError, KeyError, TypeError):
+        return body or error.reason
+
+
+def lint_remote(files: list, args: dict) -> list:
+    ''' let a running lint server check the files, exit if the server isn't
+    reachable or refuses the request
+    '''
+    from urllib.error import HTTPError, URLError
+
+    from scplint.server import request_lint
+
+    request = {
+        'paths': [os.path.abspath(file) for file in files],
+        'options': {
+            'minimize': args.get('minimize'),
+            'detailed': args.get('detailed'),
+            'select': args.get('select'),
+            'ignore': args.get('ignore'),
+            'max_findings': args.get('max_findings')
         }
     }
 
-    for result in all_results:
-        report['files'].append(result['file'])
-        report['summary']['recommendations'] += (
-            result['summary']['recommendations'])
-        report['summary']['infos'] += result['summary']['infos']
-        report['summary']['warnings'] += result['summary']['warnings']
-        report['summary']['errors'] += result['summary']['errors']
+    try:
+        results = request_lint(args['server'], request)['details']
+    except HTTPError as error:
+        logger.error('lint server %s: %s %s', args['server'], error.code,
+                     server_message(error))
+        sys.exit(1)
+    except URLError as error:
+        logger.error('lint server %s: %s', args['server'], error.reason)
+        sys.exit(1)
+
+    for file, result in zip(files, results):
+        result['file'] = file
+
+    return results
+
+
+def main(argv: list = None):
+    ''' run scplint with the given command line arguments, `sys.argv` by
+    default
+    '''
+    parser = build_parser()
+    args = vars(parser.parse_args(argv))
+
+    if not (args.get('input') or args.get('serve') is not None
+            or args.get('org') or args.get('diff')):
+        parser.error('the following arguments are required: -i/--input')
+
+    configure_logging(args)
+
+    # the profile is part of the detailed report
+    if args.get('profile'):
+        args['detailed'] = True
+
+    try:
+        config = read_config(args.get('config'))
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    for option in ('select', 'ignore'):
+        if args.get(option) is None:
+            args[option] = config.get(option)
+
+    if args.get('serve') is not None:
+        from scplint.server import serve
+
+        try:
+            serve(args['serve'], get_cache(args), args.get('allow_remote'))
+        except ValueError as error:
+            parser.error(str(error))
+        return
+
+    if args.get('org'):
+        org_report(args)
+        return
+
+    if args.get('diff'):
+        report = diff_report(args)
+        if report['summary']['errors']:
+            sys.exit(1)
+        return
+
+    if args.get('optimize'):
+        optimize_files(get_file_paths(args), args)
+        return
+
+    if args.get('split'):
+        results = split_files(get_file_paths(args), args)
+        if any('error' in result for result in results):
+            sys.exit(1)
+        return
+
+    if args.get('profile_output'):
+        summary = profile_run(args)
+    else:
+        summary = run(args)
+
+    if summary['errors']:
+        sys.exit(1)
+
+
+def org_report(args: dict) -> dict:
+    ''' print the allowed actions and findings of every node of an
+    organization
+
+    Returns:
+        report (dict): the report of every node and a summary
+    '''
+    from scplint.organization import load_organization
+
+    try:
+        organization = load_organization(args['org'])
+        baseline = None
+        if args.get('baseline'):
+            baseline = load_organization(args['baseline'])
+    except (OSError, ValueError) as error:
+        logger.error(error)
+        sys.exit(1)
+
+    report = organization.report(baseline)
+    print_report(report, 'json' if args['output'] == 'ndjson'
+                 else args['output'])
 
     return report
 
 
-def main():
-    files = get_file_paths()
-    all_results = []
+def diff_report(args: dict) -> dict:
+    ''' print the semantic differences of two scps or of the scps of two
+    directories, unchanged files are skipped. a file which can't be read
+    is reported with its error, the other files are still compared.
+
+    Returns:
+        report (dict): the diff of every changed file and a summary
+    '''
+    from scplint.diff import diff_paths, diff_policies, is_changed
+    from scplint.loader import load_policy
+
+    def read(path: str) -> dict:
+        if path is None:
+            return {}
+
+        with open(path, 'r') as source:
+            return load_policy(source.read()).scp
+
+    details = []
+    summary = {'files': 0, 'changed': 0, 'denied': 0, 'allowed': 0,
+               'errors': 0}
+
+    for old, new in diff_paths(*args['diff']):
+        summary['files'] += 1
+
+        try:
+            diff = diff_policies(read(old), read(new),
+                                 minimize=args.get('minimize'))
+        except (OSError, ValueError) as error:
+            logger.error(error)
+            summary['errors'] += 1
+            details.append({'old': old, 'new': new, 'error': str(error)})
+            continue
+
+        if not is_changed(diff):
+            continue
+
+        summary['changed'] += 1
+        summary['denied'] += len(diff['denied']['added'])
+        summary['allowed'] += len(diff['allowed']['added'])
+        details.append({'old': old, 'new': new, **diff})
+
+    report = {'details': details, 'summary': summary}
+    print_report(report, 'json' if args['output'] == 'ndjson'
+                 else args['output'])
+
+    return report
+
+
+def transform_files(files: list, args: dict, transform) -> list:
+    ''' apply a transformation to the scp of every file and print the
+    results instead of a report
+
+    Args:
+        files (list): the paths of the scps
+        args (dict): the command line arguments
+        transform (callable): returns the result (dict) of a parsed scp
+
+    Returns:
+        results (list): the result of every file
+    '''
+    from scplint.loader import load_policy
+
+    results = []
 
     for file in files:
-        logger.info('check file %s', file)
+        with open(file, 'r') as source:
+            scp = load_policy(source.read()).scp
 
-        raw_file = open(file).read()
-        policy = json.loads(raw_file)
-        minimize = ARGS.get('minimize')
-        scp = SCP(scp=policy, filename=file, minimize=minimize)
+        result = {'file': file, **transform(scp)}
+        results.append(result)
 
-        report = Report(scp, raw_file)
-        run_checks(report)
+        if args['output'] == 'ndjson':
+            print(json.dumps(result, sort_keys=True), flush=True)
 
-        if not ARGS.get('detailed'):
-            results = report.get_report()
-        else:
-            results = report.get_report_detailed()
+    if args['output'] != 'ndjson':
+        print_report({'details': results, 'files': files},
+                     args['output'])
 
-        all_results.append(results)
+    return results
 
-    summary = create_summary(all_results)
-    print_report(summary)
 
-    if summary['summary']['errors']:
-        sys.exit(1)
+def optimize_files(files: list, args: dict) -> list:
+    ''' replace the actions of every scp by wildcards and print the
+    optimized scps, the bytes saved and the additionally allowed actions
+    '''
+    from scplint.optimizers.optimize_actions import optimize_policy
+    from scplint.size import json_size
+
+    def optimize(scp: dict) -> dict:
+        policy, saved, over_grant = optimize_policy(
+            scp, budget=args.get('over_grant') or 0)
+        return {'size': json_size(policy), 'saved': saved,
+                'over_grant': over_grant, 'policy': policy}
+
+    return transform_files(files, args, optimize)
+
+
+def split_files(files: list, args: dict) -> list:
+    ''' split every scp which is too large into several policies and print
+    them with their minimized size, see `split_policy`
+    '''
+    from scplint.optimizers.split_policy import split_policy
+    from scplint.size import json_size
+
+    def split(scp: dict) -> dict:
+        try:
+            policies = split_policy(scp, max_policies=args['max_policies'])
+        except ValueError as error:
+            logger.error(error)
+            return {'error': str(error)}
+
+        return {'sizes': [json_size(policy) for policy in policies],
+                'policies': policies}
+
+    return transform_files(files, args, split)
+
+
+def profile_run(args: dict) -> dict:
+    ''' run the checks with cProfile and write the stats to the profile
+    output. the checks run in this process to include them in the profile.
+    '''
+    import cProfile
+
+    if args.get('jobs') != 1:
+        logger.warning('--profile-output checks all files in one process')
+        args['jobs'] = 1
+
+    profiler = cProfile.Profile()
+
+    try:
+        return profiler.runcall(run, args)
+    finally:
+        profiler.dump_stats(args['profile_output'])
+
+
+def run(args: dict) -> dict:
+    ''' check all files and print the report
+
+    Returns:
+        summary (dict): the summary of all files
+    '''
+    files = get_file_paths(args)
+
+    if args.get('server'):
+        results = lint_remote(files, args)
+    else:
+        results = lint_files(files, args)
+
+    if args['output'] == 'ndjson':
+        summary = stream_report(results)
+    else:
+        report = create_summary(list(results))
+        print_report(report, args['output'])
+        summary = report['summary']
+
+    cache = get_cache(args)
+    if cache is not None:
+        cache.evict()
+
+    return summary
@@ -0,0 +1,203 @@
+'''
+Compare two versions of an scp by the known actions they cover instead of
+their text, reordered statements and equivalent wildcards aren't changes:
+
+.. highlight:: py
+.. code-block:: py
+
+    result = diff_policies(old_scp, new_scp)
+    result['denied']['added']                   # actions denied from now on
+    result['statements']                        # changes of every statement
+
+Statements are matched by their Sid and its occurrence, statements without
+Sid by their position. A statement is changed if it covers other actions or
+if its effect, resources or conditions changed. The coverage of a statement
+is cached by its minified json, so unchanged statements of a whole
+repository are resolved once.
+
+-------
+'''
+
+import json
+import os
+from functools import lru_cache
+from glob import glob
+from logging import getLogger
+
+from scplint.aws_actions import catalog_cache, get_catalog
+from scplint.permissions import Permissions, bits_actions, statement_bits
+from scplint.size import json_size, minify
+
+logger = getLogger()
+
+CACHE_SIZE = 16384
+
+
+@catalog_cache
+@lru_cache(maxsize=CACHE_SIZE)
+def _coverage(source: str, catalog) -> int:
+    return statement_bits(json.loads(source), catalog)
+
+
+def coverage(statement: dict, catalog) -> int:
+    ''' returns the cached bitset of the actions a statement applies to '''
+    if not isinstance(statement, dict):
+        return 0
+
+    return _coverage(minify(statement), catalog)
+
+
+def _size(scp: dict, minimize: bool = False) -> int:
+    ''' returns the bytes of an scp like `SCP.size`, 0 if it's missing '''
+    if not scp:
+        return 0
+
+    if minimize:
+        return json_size(scp)
+
+    return len(json.dumps(scp, indent=4).encode('utf-8'))
+
+
+def _statements(scp: dict) -> list:
+    statements = scp.get('Statement', []) if isinstance(scp, dict) else []
+
+    if isinstance(statements, dict):
+        return [statements]
+
+    return statements if isinstance(statements, list) else []
+
+
+def match_statements(old: list, new: list) -> list:
+    ''' returns the `(name, old, new)` pairs of matching statements, the
+    statement of a side is None if it's missing. statements are matched by
+    Sid, the n-th statement with the same Sid by the n-th one of the other
+    side. the others are matched by their position among the statements
+    without Sid.
+    '''
+    def keys(statements: list) -> dict:
+        result = {}
+        position = 0
+        occurrences = {}
+
+        for index, statement in enumerate(statements):
+            sid = statement.get('Sid') if isinstance(statement, dict) \
+                else None
+
+            if sid is None:
+                result[('index', position)] = (index, statement)
+                position += 1
+                continue
+
+            # a Sid of an invalid policy may be a list or an object
+            if not isinstance(sid, str):
+                sid = minify(sid)
+
+            occurrence = occurrences.get(sid, 0)
+            occurrences[sid] = occurrence + 1
+            name = f'{sid} ({occurrence + 1})' if occurrence else sid
+            result[('sid', sid, occurrence)] = (name, statement)
+
+        return result
+
+    old_keys, new_keys = keys(old), keys(new)
+    pairs = []
+
+    for key in list(old_keys) + [key for key in new_keys
+                                 if key not in old_keys]:
+        name, old_statement = old_keys.get(key, (None, None))
+        new_name, new_statement = new_keys.get(key, (None, None))
+        pairs.append((new_name if name is None else name, old_statement,
+                      new_statement))
+
+    return pairs
+
+
+def _scope(statement: dict) -> dict:
+    ''' returns everything of a statement but its actions and Sid '''
+    return {key: value for key, value in statement.items()
+            if key not in ('Sid', 'Action', 'NotAction')}
+
+
+def _changes(old: int, new: int, catalog) -> dict:
+    return {'added': bits_actions(new & ~old, catalog),
+            'removed': bits_actions(old & ~new, catalog)}
+
+
+def diff_policies(old: dict, new: dict, catalog=None,
+                  minimize: bool = False) -> dict:
+    ''' compare the actions two versions of an scp allow and deny
+
+    Args:
+        old (dict): the parsed scp before the change, `{}` if it's new
+        new (dict): the parsed scp after the change, `{}` if it's removed
+        catalog (ActionCatalog): the known actions, the shared catalog by
+            default
+        minimize (bool): True to compare the sizes of the minimized scps
+
+    Returns:
+        diff (dict): the `size` of both versions and the delta, the actions
+            which are `denied` or `allowed` additionally (`added`) or not
+            anymore (`removed`) and the changes of every changed statement
+    '''
+    catalog = catalog or get_catalog()
+    old_size = _size(old, minimize)
+    new_size = _size(new, minimize)
+    old_permissions = Permissions(old, catalog)
+    new_permissions = Permissions(new, catalog)
+
+    statements = []
+    for name, old_statement, new_statement in match_statements(
+            _statements(old), _statements(new)):
+        old_bits = coverage(old_statement, catalog)
+        new_bits = coverage(new_statement, catalog)
+
+        if old_statement is None:
+            status = 'added'
+        elif new_statement is None:
+            status = 'removed'
+        elif (old_bits == new_bits
+              and _scope(old_statement) == _scope(new_statement)):
+            continue
+        else:
+            status = 'changed'
+
+        effect = (new_statement or old_statement).get('Effect')
+        statements.append({'statement': name, 'effect': effect,
+                           'status': status,
+                           **_changes(old_bits, new_bits, catalog)})
+
+    return {
+        'size': {'old': old_size, 'new': new_size,
+                 'delta': new_size - old_size},
+        'denied': _changes(old_permissions.denied, new_permissions.denied,
+                           catalog),
+        'allowed': _changes(old_permissions.allowed, new_permissions.allowed,
+                            catalog),
+        'statements': statements
+    }
+
+
+def is_changed(diff: dict) -> bool:
+    ''' True if a diff changes the size or any covered action '''
+    return bool(diff['size']['delta'] or diff['statements']
+                or any(diff[key][change] for key in ('denied', 'allowed')
+                       for change in ('added', 'removed')))
+
+
+def diff_paths(old: str, new: str) -> list:
+    ''' returns the `(old, new)` file pairs of two files or of the json files
+    of two directories by their relative path, the file of a side is None if
+    it's missing
+    '''
+    if not (os.path.isdir(old) and os.path.isdir(new)):
+        return [(old, new)]
+
+    def relative(directory: str) -> dict:
+        return {os.path.relpath(path, directory): path for path in
+                glob(os.path.join(directory, '**', '*.json'),
+                     recursive=True)}
+
+    old_files, new_files = relative(old), relative(new)
+
+    return [(old_files.get(path), new_files.get(path))
+            for path in sorted(set(old_files) | set(new_files))]
@@ -0,0 +1,98 @@
+'''
+The findings of a report. A finding keeps a reference to the `MSGS` of its
+checker, its code, location and the arguments of the message, the message
+is only formatted if the finding is rendered. Identical findings at the same
+location of a report are a single finding with a count. Without a line and
+column, e.g. for a parsed policy, the location is the path of the finding
+within the scp:
+
+.. highlight:: py
+.. code-block:: py
+
+    finding = Finding(MSGS, 'W201', {'action': 'ec2:Foo', ...}, location)
+    finding['msg']                              # the formatted message
+    finding.to_dict()                           # {'code': 'W201', ...}
+
+-------
+'''
+
+from logging import getLogger
+
+logger = getLogger()
+
+
+def _freeze(value):
+    ''' returns a hashable version of a message argument '''
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item))
+                            for key, item in value.items()))
+
+    if isinstance(value, set):
+        return tuple(sorted(_freeze(item) for item in value))
+
+    return value
+
+
+class Finding:
+    ''' a single finding of a checker, rendered on demand
+
+    Args:
+        msgs (dict): the `MSGS` of the checker, it isn't copied
+        code (str): the code of the finding, a key of the msgs
+        details (dict): the arguments of the message
+        location (dict): the `line` and `column` of the finding or None
+        path (tuple): the path of the finding within the scp, e.g.
+            `('Statement', 3, 'Action')`, or None
+    '''
+    __slots__ = ('msgs', 'code', 'details', 'location', 'path', 'count')
+
+    def __init__(self, msgs: dict, code: str, details: dict,
+                 location: dict = None, path: tuple = None):
+        self.msgs = msgs
+        self.code = code
+        self.details = details
+        self.location = location
+        self.path = path
+        self.count = 1
+
+    def key(self) -> tuple:
+        ''' returns what identical findings have in common, the line and
+        column or else the path
+        '''
+        location = self.path
+        if self.location:
+            location = (self.location['line'], self.location['column'])
+
+        return self.code, location, _freeze(self.details)
+
+    @property
+    def msg(self) -> str:
+        return self.msgs[self.code]['msg'].format(**self.details)
+
+    def to_dict(self) -> dict:
+        ''' returns the finding as part of a detailed report '''
+        finding = {'rule': self.msgs[self.code]['rule'], 'msg': self.msg,
+                   'code': self.code}
+
+        if self.location:
+            finding['line'] = self.location['line']
+            finding['column'] = self.location['column']
+        elif self.path:
+            finding['path'] = list(self.path)
+
+        if self.count > 1:
+            finding['count'] = self.count
+
+        return finding
+
+    def __getitem__(self, key: str):
+        return self.to_dict()[key]
+
+    def get(self, key: str, default=None):
+        return self.to_dict().get(key, default)
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
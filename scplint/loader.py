@@ -0,0 +1,268 @@
+'''
+Load SCPs from their json source. The policy is parsed once, duplicate keys
+are noticed while parsing. Their location and the line/column span of every
+value are found by a scan of the source, it only runs if they're needed:
+
+.. highlight:: py
+.. code-block:: py
+
+    policy = load_policy(raw)
+    policy.scp                                   # the parsed policy
+    policy.duplicates                            # all duplicate keys
+    policy.source.span(('Statement', 0, 'Action', 1))
+
+-------
+'''
+
+import bisect
+import json
+import re
+from logging import getLogger
+
+logger = getLogger()
+
+_TOKENS = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]:,]|[^\s{}\[\]:,"]+')
+_KEYS = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"(\s*:)?')
+
+_BACKEND = None
+
+
+class _DuplicateHook:
+    ''' an `object_pairs_hook` which notes if an object has duplicate keys '''
+    __slots__ = ('found', )
+
+    def __init__(self):
+        self.found = False
+
+    def __call__(self, pairs: list) -> dict:
+        obj = dict(pairs)
+
+        if len(obj) != len(pairs):
+            self.found = True
+
+        return obj
+
+
+def _json_loads(raw: str) -> tuple:
+    hook = _DuplicateHook()
+    return json.loads(raw, object_pairs_hook=hook), hook.found
+
+
+def _orjson_loads(raw: str) -> tuple:
+    import orjson
+
+    # orjson keeps the last value of a duplicate key without notice
+    return orjson.loads(raw), None
+
+
+# every backend returns the parsed document and True/False if it has
+# duplicate keys or None if the backend can't tell
+JSON_BACKENDS = {
+    'json': _json_loads,
+    'orjson': _orjson_loads
+}
+
+
+def set_json_backend(name: str = 'json'):
+    ''' select the json backend which parses the policies. the standard
+    library notices duplicate keys while parsing, other backends need a
+    second look at the source to find them.
+
+    Args:
+        name (str): `json` or `orjson`
+
+    Raises:
+        ImportError: if the selected backend isn't installed
+    '''
+    global _BACKEND
+
+    if name == 'orjson':
+        import orjson  # noqa: F401 pylint: disable=W0611
+
+    _BACKEND = JSON_BACKENDS[name]
+
+
+def loads(raw: str) -> tuple:
+    ''' parse a json document with the selected json backend
+
+    Returns:
+        (document, duplicates) (tuple): the parsed document and True/False
+            if it has duplicate keys or None if that's unknown
+    '''
+    return (_BACKEND or _json_loads)(raw)
+
+
+class SourceMap:
+    ''' The positions of all values and the duplicate keys of a json source.
+
+    Positions are `(line, column, end_line, end_column)`, lines and columns
+    start at 1. Values are addressed by their path, e.g. `('Statement', 0)`
+    or `('Statement', 0, 'Action', 2)`.
+
+    Args:
+        raw (str): the json source
+    '''
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.spans = {}
+        self.duplicates = []
+        self._lines = [0] + [match.end()
+                             for match in re.finditer('\n', raw)]
+        self._tokens = _TOKENS.finditer(raw)
+
+        try:
+            self._scan_value(())
+        except (StopIteration, ValueError):
+            logger.debug('unable to scan the json source')
+
+        self._tokens = None
+
+    def _position(self, offset: int) -> tuple:
+        line = bisect.bisect_right(self._lines, offset)
+        return line, offset - self._lines[line - 1] + 1
+
+    def _scan_value(self, path: tuple, token=None):
+        token = token or next(self._tokens)
+        text = token.group()
+
+        if text == '{':
+            end = self._scan_object(path)
+        elif text == '[':
+            end = self._scan_array(path)
+        else:
+            end = token.end()
+
+        self.spans[path] = (self._position(token.start())
+                            + self._position(end))
+
+    def _scan_object(self, path: tuple) -> int:
+        keys = set()
+        token = next(self._tokens)
+
+        while token.group() != '}':
+            if token.group() == ',':
+                token = next(self._tokens)
+                continue
+
+            key = json.loads(token.group())
+            if key in keys:
+                line, column = self._position(token.start())
+                self.duplicates.append({
+                    'key': key,
+                    'path': path,
+                    'line': line,
+                    'column': column
+                })
+
+            keys.add(key)
+            next(self._tokens)  # ":"
+            self._scan_value(path + (key, ))
+            token = next(self._tokens)
+
+        return token.end()
+
+    def _scan_array(self, path: tuple) -> int:
+        index = 0
+        token = next(self._tokens)
+
+        while token.group() != ']':
+            if token.group() != ',':
+                self._scan_value(path + (index, ), token)
+                index += 1
+
+            token = next(self._tokens)
+
+        return token.end()
+
+    def span(self, path: tuple):
+        ''' returns the span of the value at the given path or None '''
+        return self.spans.get(tuple(path))
+
+    def location(self, path: tuple):
+        ''' returns the `line` and `column` of the value at the given path
+        or None
+        '''
+        span = self.span(path)
+
+        if span is None:
+            return None
+
+        return {'line': span[0], 'column': span[1]}
+
+
+def _count_keys(value) -> int:
+    ''' returns the number of keys of all objects of a parsed document '''
+    if isinstance(value, dict):
+        return len(value) + sum(_count_keys(item) for item in value.values())
+
+    if isinstance(value, list):
+        return sum(_count_keys(item) for item in value)
+
+    return 0
+
+
+def _count_key_tokens(raw: str) -> int:
+    ''' returns the number of keys in a json source '''
+    colons = _KEYS.findall(raw)
+    return len(colons) - colons.count('')
+
+
+class Policy:
+    ''' A policy which was loaded from its json source. The source map is
+    created on first use.
+
+    Args:
+        raw (str): the json source
+        scp (dict): the parsed policy
+        has_duplicates (bool): if the parser found duplicate keys, None if
+            it's unknown
+    '''
+    __slots__ = ('raw', 'scp', '_has_duplicates', '_source')
+
+    def __init__(self, raw: str, scp: dict, has_duplicates: bool = None):
+        self.raw = raw
+        self.scp = scp
+        self._has_duplicates = has_duplicates
+        self._source = None
+
+    @property
+    def source(self) -> SourceMap:
+        if self._source is None:
+            self._source = SourceMap(self.raw)
+
+        return self._source
+
+    @property
+    def duplicates(self) -> list:
+        ''' returns all duplicate keys. the source is only scanned if the
+        policy has duplicate keys.
+        '''
+        if self._has_duplicates is None:
+            self._has_duplicates = (_count_keys(self.scp)
+                                    != _count_key_tokens(self.raw))
+
+        if not self._has_duplicates:
+            return []
+
+        return self.source.duplicates
+
+
+def load_policy(raw: str) -> Policy:
+    ''' parse the json source of a policy
+
+    Args:
+        raw (str): the json source
+
+    Returns:
+        policy (Policy): the parsed policy with its source map
+
+    Raises:
+        ValueError: if the source isn't valid json
+    '''
+    return Policy(raw, *loads(raw))
+
+
+def load_policy_file(path: str) -> Policy:
+    ''' read and parse the json source of a policy file '''
+    with open(path, 'r') as file:
+        return load_policy(file.read())
@@ -10,7 +10,7 @@ Default logging setup and configuration for modules. Setup is for example:
 '''
 
 import json
-import logging.config
+import logging
 import time
 from datetime import datetime
 from decimal import Decimal
@@ -29,7 +29,8 @@ class CustomEncoder(json.JSONEncoder):
 
 
 def init_logging(log_level: str = 'DEBUG',
-                 formatter: str = 'json') -> getLogger:
+                 formatter: str = 'json',
+                 stream: str = 'ext://sys.stdout') -> getLogger:
     ''' Returns a pre-configured logger for console output and optional log
     file output.
 
@@ -37,6 +38,7 @@ def init_logging(log_level: str = 'DEBUG',
         log_level (str): the target debuging level for logs
         formatter (str): the target format for the logs. pre-defined formats
             are `json`, `console` and `file`
+        stream (str): the target stream of the logs, e.g. `ext://sys.stderr`
 
     Returns:
         logger (object): the logger object
@@ -81,7 +83,7 @@ def init_logging(log_level: str = 'DEBUG',
         'handlers': {
             'stdout': {
                 'class': 'logging.StreamHandler',
-                'stream': 'ext://sys.stdout',
+                'stream': stream,
                 'formatter': formatter
             }
         },
@@ -108,8 +110,11 @@ def init_logging(log_level: str = 'DEBUG',
         }
     }
 
+    # the config module is only needed to configure the logging once
+    from logging import config
+
     logging.Formatter.converter = time.gmtime
-    logging.config.dictConfig(logconfig)
+    config.dictConfig(logconfig)
     logger = getLogger(__name__)
 
     logger.debug('configure logging with loglevel=%s', log_level)
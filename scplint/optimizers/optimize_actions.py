@@ -1,3 +1,433 @@
+'''
+Compress the actions of a statement into wildcards which cover exactly the
+listed actions. The catalog is sorted, so every pattern `service:Prefix*`
+covers a contiguous slice of it and the slices of two prefixes are either
+nested or disjoint. The shortest prefix of an action whose slice has no
+unlisted action is therefore the best pattern for it:
+
+.. highlight:: py
+.. code-block:: py
+
+    result = compress_actions(['ec2:DeleteVpc', 'ec2:DeleteVpcEndpoints',
+                               'ec2:DeleteVpcPeeringConnection', ...])
+    result.actions                      # e.g. ['ec2:DeleteVpc*', ...]
+    result.saved                        # the bytes saved in the statement
+
+A budget allows patterns to cover a few actions which aren't listed, they
+are chosen greedily by the bytes they save per additional action.
+
+-------
+'''
+
+import bisect
+from collections import namedtuple
+from functools import lru_cache
 from logging import getLogger
 
+from scplint.aws_actions import catalog_cache, get_catalog, has_wildcard
+from scplint.size import json_size
+from scplint.wildcards import compile_pattern
+
 logger = getLogger()
+
+Compressed = namedtuple('Compressed',
+                        ['actions', 'patterns', 'over_grant', 'saved'])
+Compressed.__doc__ = ''' the compressed actions
+
+    actions (list): the sorted, compressed Action/NotAction list
+    patterns (dict): every new wildcard with the listed actions it replaces
+    over_grant (list): known actions covered by the new wildcards which
+        weren't covered before
+    saved (int): the bytes saved in the minimized statement
+'''
+
+
+@catalog_cache
+@lru_cache(maxsize=1024)
+def _service_keys(catalog, service: str) -> tuple:
+    ''' returns the offset and the lower case actions of a service, a
+    local copy keeps the binary searches off the mapped catalog
+    '''
+    start, end = catalog.service_range(service)
+    return start, tuple(catalog.keys[start:end])
+
+
+class _Unit:
+    ''' a listed action or a new wildcard which covers the slice `lo:hi` of
+    the actions of a service
+    '''
+    __slots__ = ('prefix', 'lo', 'hi', 'extra', 'items', 'is_pattern',
+                 'size')
+
+    def __init__(self, prefix: str, lo: int, hi: int, extra: int,
+                 items: tuple, is_pattern: bool = True):
+        self.prefix = prefix
+        self.lo = lo
+        self.hi = hi
+        self.extra = extra
+        self.items = items
+        self.is_pattern = is_pattern
+        # the bytes of the unit in the list, including the separator
+        if is_pattern:
+            self.size = len(prefix) + 4
+        else:
+            self.size = _item_size(items[0])
+
+    @classmethod
+    def explicit(cls, key: str, index: int, action: str):
+        return cls(key, index, index + 1, 0, (action, ), False)
+
+
+class _Service:
+    ''' the listed actions and the allowed slices of a single service
+
+    Args:
+        catalog (ActionCatalog): the known actions
+        service (str): the lower case service prefix, e.g. `ec2`
+    '''
+    def __init__(self, catalog, service: str):
+        self.catalog = catalog
+        self.service = service
+        self.start, self.keys = _service_keys(catalog, service)
+        self.allowed = []
+
+    def allow(self, covered: list, listed):
+        ''' set the positions covered by the listed actions
+
+        Args:
+            covered (list): the sorted catalog positions covered by the
+                listed wildcards of all services
+            listed (iterable): the positions of the listed actions of this
+                service
+        '''
+        lo = bisect.bisect_left(covered, self.start)
+        hi = bisect.bisect_left(covered, self.start + len(self.keys), lo)
+        allowed = {index - self.start for index in covered[lo:hi]}
+        allowed.update(listed)
+        self.allowed = sorted(allowed)
+
+    def index(self, key: str):
+        ''' returns the position of a lower case action or None '''
+        index = bisect.bisect_left(self.keys, key)
+
+        if index < len(self.keys) and self.keys[index] == key:
+            return index
+
+        return None
+
+    def range(self, prefix: str) -> tuple:
+        lo = bisect.bisect_left(self.keys, prefix)
+        # "\uffff" sorts behind every character used in action names
+        return lo, bisect.bisect_left(self.keys, f'{prefix}\uffff', lo)
+
+    def extra(self, lo: int, hi: int) -> int:
+        ''' returns the number of unlisted actions in the slice '''
+        allowed = (bisect.bisect_left(self.allowed, hi)
+                   - bisect.bisect_left(self.allowed, lo))
+        return hi - lo - allowed
+
+    def shortest_prefix(self, key: str, lo: int, hi: int) -> str:
+        ''' returns the shortest prefix of the key with the same slice '''
+        minimum = len(self.service) + 1
+        length = len(key)
+
+        while length > minimum and self.range(key[:length - 1]) == (lo, hi):
+            length -= 1
+
+        return key[:length]
+
+    def exact_prefix(self, key: str) -> str:
+        ''' returns the shortest prefix of the key whose slice only has
+        listed actions or None
+        '''
+        low, high = len(self.service) + 1, len(key)
+
+        if self.extra(*self.range(key)) > 0:
+            return None
+
+        # the slice of a shorter prefix contains the slice of a longer one
+        while low < high:
+            middle = (low + high) // 2
+
+            if self.extra(*self.range(key[:middle])) == 0:
+                high = middle
+            else:
+                low = middle + 1
+
+        return key[:low]
+
+    def pattern(self, prefix: str, lo: int) -> str:
+        ''' returns the wildcard of a prefix in the aws spelling '''
+        action = self.catalog.actions[self.start + lo]
+        return f'{action[:len(prefix)]}*'
+
+
+def _item_size(item: str) -> int:
+    return json_size(item) + 1
+
+
+def _units_size(units: list) -> int:
+    return sum(unit.size for unit in units)
+
+
+def _exact_units(service: _Service, targets: list,
+                 min_actions: int) -> list:
+    ''' cover the listed actions with the shortest exact prefixes, a
+    wildcard has to replace at least `min_actions` actions and save bytes
+    '''
+    groups = {}
+    units = []
+
+    for index, key, action in targets:
+        prefix = service.exact_prefix(key)
+
+        if prefix is None:
+            units.append(_Unit.explicit(key, index, action))
+            continue
+
+        lo, hi = service.range(prefix)
+        groups.setdefault((lo, hi, prefix), []).append((index, key, action))
+
+    for (lo, hi, prefix), group in sorted(groups.items()):
+        explicit = [_Unit.explicit(key, index, action)
+                    for index, key, action in group]
+        pattern = _Unit(prefix, lo, hi, 0,
+                        tuple(action for _, _, action in group))
+
+        if (len(group) >= min_actions
+                and _units_size([pattern]) < _units_size(explicit)):
+            units.append(pattern)
+        else:
+            units.extend(explicit)
+
+    return units
+
+
+def _expand(service: _Service, unit: _Unit, units: list, starts: list):
+    ''' returns the next larger wildcard of a unit with the units it
+    replaces, its additional unlisted actions and the bytes it saves. the
+    units are sorted by their slice, `starts` are the starts of the slices.
+    '''
+    minimum = len(service.service) + 1
+
+    for length in range(len(unit.prefix), minimum - 1, -1):
+        lo, hi = service.range(unit.prefix[:length])
+
+        if (lo, hi) != (unit.lo, unit.hi):
+            break
+    else:
+        return None
+
+    prefix = service.shortest_prefix(unit.prefix[:length], lo, hi)
+    # slices are nested or disjoint, the inner units are a single run
+    inner = units[bisect.bisect_left(starts, lo):
+                  bisect.bisect_left(starts, hi)]
+    cost = service.extra(lo, hi) - sum(other.extra for other in inner)
+    new = _Unit(prefix, lo, hi, service.extra(lo, hi),
+                tuple(item for other in inner for item in other.items))
+
+    return new, inner, cost, _units_size(inner) - new.size
+
+
+def _candidates(service: _Service, units: list, min_actions: int) -> list:
+    ''' returns the expansions of the units of a service which save bytes '''
+    candidates = []
+    units.sort(key=lambda unit: unit.lo)
+    starts = [unit.lo for unit in units]
+
+    for unit in units:
+        expanded = _expand(service, unit, units, starts)
+
+        if expanded is None:
+            continue
+
+        new, inner, cost, saved = expanded
+        if saved > 0 and len(new.items) >= min_actions:
+            candidates.append(((saved / max(cost, 1), saved, new.prefix),
+                               new, inner, cost))
+
+    return candidates
+
+
+def _spend_budget(services: dict, units: dict, budget: int,
+                  min_actions: int):
+    ''' replace units by larger wildcards with unlisted actions while the
+    budget lasts, the wildcard which saves the most bytes per unlisted
+    action first. only the candidates of the changed service are computed
+    again.
+    '''
+    candidates = {}
+
+    while budget > 0:
+        best = None
+
+        for name, service in services.items():
+            if name not in candidates:
+                candidates[name] = _candidates(service, units[name],
+                                               min_actions)
+
+            for score, new, inner, cost in candidates[name]:
+                if cost <= budget and (best is None or score > best[0]):
+                    best = (score, name, new, inner, cost)
+
+        if best is None:
+            return
+
+        _, name, new, inner, cost = best
+        units[name] = [unit for unit in units[name] if unit not in inner]
+        units[name].append(new)
+        del candidates[name]
+        budget -= cost
+
+
+def compress_actions(actions: list, catalog=None, budget: int = 0,
+                     min_actions: int = 2) -> Compressed:
+    ''' replace listed actions by the fewest wildcards which cover exactly
+    the same known actions
+
+    Wildcards and unknown actions are kept. Actions which are covered by a
+    listed wildcard are removed, listed prefix wildcards are removed if a
+    new wildcard covers them.
+
+    Args:
+        actions (list): the Action/NotAction list of a statement
+        catalog (ActionCatalog): the known actions, the shared catalog by
+            default
+        budget (int): the number of unlisted actions the new wildcards may
+            cover, only allowed for Action lists
+        min_actions (int): the minimum number of listed actions a new
+            wildcard replaces
+
+    Returns:
+        result (Compressed): the compressed list and the bytes saved
+    '''
+    catalog = catalog or get_catalog()
+    covered = set()
+    wildcards = []
+    kept = []
+    services = {}
+    targets = {}
+
+    for action in actions:
+        if has_wildcard(action):
+            pattern = compile_pattern(action)
+            covered.update(pattern.resolve(catalog))
+            wildcards.append(pattern)
+            continue
+
+        key = action.lower()
+        name = key.split(':', 1)[0]
+
+        if name not in services:
+            services[name] = _Service(catalog, name)
+
+        index = services[name].index(key)
+        if index is None:
+            kept.append(action)
+        else:
+            targets.setdefault(name, {}).setdefault(index, (key, action))
+
+    units = {}
+    allowed = set(covered)
+    ordered = sorted(covered)
+
+    # every service only looks at its own slice of the positions
+    for name, service in services.items():
+        listed = targets.get(name, {})
+        allowed.update(service.start + index for index in listed)
+        service.allow(ordered, listed)
+        service_targets = [
+            (index, key, action)
+            for index, (key, action) in sorted(listed.items())
+            if service.start + index not in covered]
+        units[name] = _exact_units(service, service_targets, min_actions)
+
+    _spend_budget(services, units, budget, min_actions)
+
+    patterns = {}
+    over_grant = []
+    prefixes = []
+    result = list(kept)
+
+    for name, service in services.items():
+        for unit in units[name]:
+            if not unit.is_pattern:
+                result.append(unit.items[0])
+                continue
+
+            pattern = service.pattern(unit.prefix, unit.lo)
+            patterns[pattern] = sorted(unit.items)
+            prefixes.append(unit.prefix)
+            over_grant.extend(
+                catalog.actions[service.start + index]
+                for index in range(unit.lo, unit.hi)
+                if service.start + index not in allowed)
+
+    prefixes = tuple(prefixes)
+    for pattern in wildcards:
+        if not (pattern.is_prefix and pattern.key.startswith(prefixes)):
+            result.append(pattern.pattern)
+
+    result = sorted(set(result) | set(patterns))
+    saved = json_size(list(actions)) - json_size(result)
+
+    return Compressed(result, patterns, sorted(over_grant), saved)
+
+
+def optimize_statement(statement: dict, catalog=None, budget: int = 0,
+                       min_actions: int = 2) -> tuple:
+    ''' compress the Action and NotAction list of a statement, see
+    `compress_actions`. a NotAction list is compressed without budget, an
+    unlisted action would be allowed otherwise.
+
+    Returns:
+        (statement, saved, over_grant) (tuple): a copy of the statement with
+            the compressed lists, the bytes saved and the known actions
+            which are allowed additionally
+    '''
+    optimized = dict(statement)
+    saved = 0
+    over_grant = []
+
+    for key, key_budget in (('Action', budget), ('NotAction', 0)):
+        actions = statement.get(key)
+
+        if not isinstance(actions, list) or len(actions) < 2:
+            continue
+
+        result = compress_actions(actions, catalog, key_budget, min_actions)
+        if result.saved > 0:
+            optimized[key] = result.actions
+            saved += result.saved
+            over_grant.extend(result.over_grant)
+
+    return optimized, saved, over_grant
+
+
+def optimize_policy(scp: dict, catalog=None, budget: int = 0,
+                    min_actions: int = 2) -> tuple:
+    ''' compress the Action and NotAction lists of all statements, see
+    `optimize_statement`. the budget applies to every statement.
+
+    Returns:
+        (scp, saved, over_grant) (tuple): a copy of the scp with the
+            compressed statements, the bytes saved and the known actions
+            which are allowed additionally
+    '''
+    statements = scp.get('Statement', [])
+    if isinstance(statements, dict):
+        statement, saved, over_grant = optimize_statement(
+            statements, catalog, budget, min_actions)
+        return {**scp, 'Statement': statement}, saved, over_grant
+
+    optimized = []
+    saved = 0
+    over_grant = []
+    for statement in statements:
+        statement, statement_saved, statement_over_grant = \
+            optimize_statement(statement, catalog, budget, min_actions)
+        optimized.append(statement)
+        saved += statement_saved
+        over_grant.extend(statement_over_grant)
+
+    return {**scp, 'Statement': optimized}, saved, sorted(set(over_grant))
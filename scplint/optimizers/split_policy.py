@@ -0,0 +1,167 @@
+'''
+Split an scp which is too large into several policies for the same target.
+AWS allows an action if every attached scp allows it and denies it if any
+scp denies it, so the Allow statements are copied into every policy and the
+Deny statements are distributed over them:
+
+.. highlight:: py
+.. code-block:: py
+
+    policies = split_policy(scp)                # at most 5 policies
+    [json_size(policy) for policy in policies]  # each at most 5120 bytes
+
+The Deny statements are packed first fit decreasing by their exact bytes in
+the minimized policy. A Deny statement which doesn't fit into an empty policy
+is split into statements with parts of its Action list, a NotAction list
+can't be split without denying more actions.
+
+-------
+'''
+
+from logging import getLogger
+
+from scplint.size import json_size
+
+logger = getLogger()
+
+# the maximum number of scps attached to a single root, ou or account
+MAX_POLICIES = 5
+SIZE_MAX = 5120
+
+
+def _sid(statement: dict, part: int, sids: set):
+    ''' returns the Sid of a part of a statement, a suffix which isn't the
+    Sid of another statement
+    '''
+    sid = statement.get('Sid')
+
+    if sid is None:
+        return None
+
+    suffix = f'Part{part}'
+    while f'{sid}{suffix}' in sids:
+        suffix += 'x'
+
+    return f'{sid}{suffix}'
+
+
+def _split_statement(statement: dict, name, capacity: int,
+                     sids: set) -> list:
+    ''' returns the statement split into statements with parts of its
+    Action list, each costs at most `capacity` bytes
+
+    Raises:
+        ValueError: if the statement can't be split to fit
+    '''
+    actions = statement.get('Action')
+
+    if not isinstance(actions, list) or len(actions) < 2:
+        raise ValueError(f'statement {name} exceeds the maximum size and '
+                         'has no Action list to split')
+
+    parts = []
+    part = None
+    size = 0
+
+    for action in actions:
+        action_size = json_size(action)
+
+        # an action adds its separator, except the first one of a part
+        if part is not None and size + action_size + 1 <= capacity:
+            part.append(action)
+            size += action_size + 1
+            continue
+
+        sid = _sid(statement, len(parts) + 1, sids)
+        new = {**statement, 'Action': [action]}
+        if sid is not None:
+            new['Sid'] = sid
+
+        size = json_size(new) + 1
+        if size > capacity:
+            raise ValueError(f'statement {name} exceeds the maximum size '
+                             f'even with the single action {action}')
+
+        part = new['Action']
+        parts.append(new)
+
+    return parts
+
+
+def split_policy(scp: dict, size_max: int = SIZE_MAX,
+                 max_policies: int = MAX_POLICIES) -> list:
+    ''' split an scp into the fewest policies of at most `size_max` bytes
+    (minimized) which allow and deny the same actions together
+
+    Args:
+        scp (dict): the parsed policy
+        size_max (int): the maximum bytes of a minimized policy
+        max_policies (int): the maximum number of policies
+
+    Returns:
+        policies (list): the scp itself if it fits, the split policies
+            otherwise
+
+    Raises:
+        ValueError: if the statements don't fit into `max_policies`
+            policies
+    '''
+    if json_size(scp) <= size_max:
+        return [scp]
+
+    statements = scp.get('Statement', [])
+    if isinstance(statements, dict):
+        statements = [statements]
+
+    shared = [statement for statement in statements
+              if statement.get('Effect') != 'Deny']
+    sids = {statement.get('Sid') for statement in statements}
+
+    # every statement costs its bytes and a separator, the first one in a
+    # policy doesn't need one
+    capacity = size_max - json_size({**scp, 'Statement': []}) + 1
+    capacity -= sum(json_size(statement) + 1 for statement in shared)
+
+    if capacity <= 0:
+        raise ValueError('the Allow statements alone exceed the maximum '
+                         'size, they are part of every policy')
+
+    items = []
+    for index, statement in enumerate(statements):
+        if statement.get('Effect') != 'Deny':
+            continue
+
+        cost = json_size(statement) + 1
+        if cost <= capacity:
+            items.append((cost, statement))
+            continue
+
+        name = statement.get('Sid', index)
+        logger.debug('split statement %s of %s bytes', name, cost - 1)
+        items.extend((json_size(part) + 1, part) for part in
+                     _split_statement(statement, name, capacity, sids))
+
+    bins = []
+    for position in sorted(range(len(items)),
+                           key=lambda position: (-items[position][0],
+                                                 position)):
+        cost = items[position][0]
+
+        for policy in bins:
+            if policy[0] + cost <= capacity:
+                policy[0] += cost
+                policy[1].append(position)
+                break
+        else:
+            bins.append([cost, [position]])
+
+    if len(bins) > max_policies:
+        raise ValueError(f'the scp needs {len(bins)} policies of at most '
+                         f'{size_max} bytes, only {max_policies} are allowed')
+
+    # the policies and their statements keep the order of the source
+    policies = sorted(sorted(positions) for _, positions in bins)
+
+    return [{**scp, 'Statement': shared + [items[position][1]
+                                           for position in positions]}
+            for positions in policies or [[]]]
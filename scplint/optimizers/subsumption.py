@@ -0,0 +1,88 @@
+'''
+Find Action/NotAction items which are covered by a wildcard of the same list.
+The literal prefixes of all prefix wildcards (e.g. `ec2:Delete*`) are kept in
+a set, so the covering wildcards of an item are found by looking up each
+prefix of the item instead of comparing it with every other item:
+
+.. highlight:: py
+.. code-block:: py
+
+    find_covered([('ec2:*', 0), ('ec2:DeleteVpc', 1), ('ec2:Delete*', 2)])
+    # {0: [1, 2]}
+
+The broadest wildcard which covers an item is named as its cover. Other
+wildcards (e.g. `ec2:*Vpc`) are matched with their regex against explicit
+actions only.
+
+-------
+'''
+
+from logging import getLogger
+
+from scplint.aws_actions import has_wildcard
+from scplint.wildcards import compile_pattern
+
+logger = getLogger()
+
+
+def _prefix_cover(prefixes: dict, prefix: str, length: int):
+    ''' returns the reference of the broadest prefix wildcard whose prefix
+    is one of the first `length` characters of the prefix, or None
+    '''
+    for end in range(min(length, len(prefix)) + 1):
+        ref = prefixes.get(prefix[:end])
+
+        if ref is not None:
+            return ref
+
+    return None
+
+
+def find_covered(items: list) -> dict:
+    ''' find the items which are covered by a wildcard of the list
+
+    Args:
+        items (list): `(action, reference)` of every item, the reference
+            identifies the item in the result, e.g. its position
+
+    Returns:
+        covered (dict): the references of the covered items for the
+            reference of every covering wildcard, in the order of the items
+    '''
+    prefixes = {}
+    patterns = []
+
+    for action, ref in items:
+        if not isinstance(action, str) or not has_wildcard(action):
+            continue
+
+        pattern = compile_pattern(action)
+        if pattern.is_prefix:
+            # duplicates of the same wildcard don't cover each other
+            prefixes.setdefault(pattern.prefix, ref)
+        else:
+            patterns.append((pattern, ref))
+
+    covered = {}
+
+    for action, ref in items:
+        if not isinstance(action, str):
+            continue
+
+        if has_wildcard(action):
+            pattern = compile_pattern(action)
+            # a prefix wildcard is covered by a shorter prefix only
+            length = len(pattern.prefix) - pattern.is_prefix
+            cover = _prefix_cover(prefixes, pattern.prefix, length)
+        else:
+            key = action.lower()
+            cover = _prefix_cover(prefixes, key, len(key))
+
+            if cover is None:
+                cover = next((pattern_ref for pattern, pattern_ref
+                              in patterns if pattern.match(key)), None)
+
+        if cover is not None and cover != ref:
+            covered.setdefault(cover, []).append(ref)
+
+    return covered
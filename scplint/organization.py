@@ -0,0 +1,265 @@
+'''
+The effective permissions of every root, ou and account of an organization.
+An action is allowed at a node if one of the scps attached to the node allows
+it, none denies it and it's allowed at the parent. The organization is read
+from a json or yaml file:
+
+.. highlight:: yaml
+.. code-block:: yaml
+
+    policies:
+      FullAWSAccess: {Version: '2012-10-17', Statement: [...]}
+      DenyLeaveOrg: policies/deny_leave_org.json    # relative to the file
+    nodes:
+      Root: {policies: [FullAWSAccess]}
+      Workloads: {parent: Root, policies: [FullAWSAccess, DenyLeaveOrg]}
+      '111111111111': {parent: Workloads, policies: [FullAWSAccess]}
+
+Like in AWS every node needs an attached scp which allows the actions, a
+node without policies allows nothing. Deny statements with conditions or
+resources don't remove actions. The permissions of a node are computed once
+and reused by all of its children:
+
+.. highlight:: py
+.. code-block:: py
+
+    organization = load_organization('org.yaml')
+    organization.allowed('111111111111')        # bitset of allowed actions
+    organization.report(baseline)               # findings of every node
+
+-------
+'''
+
+import json
+import os
+from logging import getLogger
+
+from scplint.aws_actions import get_catalog
+from scplint.loader import load_policy
+from scplint.permissions import Permissions, all_bits, popcount
+
+logger = getLogger()
+
+# the actions named per finding of a node, all are counted
+MAX_ACTIONS = 10
+
+
+class Organization:
+    ''' the scps and the tree of roots, ous and accounts of an organization
+
+    Args:
+        policies (dict): the parsed scp of every policy name
+        nodes (dict): the `parent` (None for a root) and the names of the
+            attached `policies` of every node
+        catalog (ActionCatalog): the known actions, the shared catalog by
+            default
+
+    Raises:
+        ValueError: if a parent or a policy is unknown or the tree has a
+            cycle
+    '''
+    def __init__(self, policies: dict, nodes: dict, catalog=None):
+        self.catalog = catalog or get_catalog()
+        self.nodes = nodes
+        self.permissions = {name: Permissions(scp, self.catalog)
+                            for name, scp in policies.items()}
+        self._levels = {}
+        self._allowed = {}
+
+        for name, node in nodes.items():
+            parent = node.get('parent')
+            if parent is not None and parent not in nodes:
+                raise ValueError(f'node {name} has the unknown parent '
+                                 f'{parent}')
+
+            for policy in node.get('policies', []):
+                if policy not in self.permissions:
+                    raise ValueError(f'node {name} has the unknown policy '
+                                     f'{policy}')
+
+        for name in nodes:
+            self.allowed(name)
+
+    def path(self, name: str) -> list:
+        ''' returns the names of the node and its ancestors, root first '''
+        path = []
+
+        while name is not None:
+            if name in path:
+                raise ValueError(f'node {name} is its own ancestor')
+
+            path.append(name)
+            name = self.nodes[name].get('parent')
+
+        return path[::-1]
+
+    def level(self, name: str) -> tuple:
+        ''' returns the bitsets of the actions the scps of a node allow and
+        deny, without its ancestors
+        '''
+        level = self._levels.get(name)
+
+        if level is None:
+            allowed = denied = 0
+            for policy in self.nodes[name].get('policies', []):
+                allowed |= self.permissions[policy].allowed
+                denied |= self.permissions[policy].denied
+
+            level = self._levels[name] = (allowed, denied)
+
+        return level
+
+    def allowed(self, name: str) -> int:
+        ''' returns the bitset of the actions allowed at a node, the allowed
+        actions of all ancestors are computed once
+        '''
+        allowed = self._allowed.get(name)
+        if allowed is not None:
+            return allowed
+
+        # compute the missing ancestors from the top, a deep tree doesn't
+        # recurse
+        missing = []
+        for ancestor in self.path(name)[::-1]:
+            if ancestor in self._allowed:
+                break
+            missing.append(ancestor)
+
+        for ancestor in missing[::-1]:
+            node_allowed, node_denied = self.level(ancestor)
+            parent = self.nodes[ancestor].get('parent')
+
+            if parent is not None:
+                node_allowed &= self._allowed[parent]
+
+            self._allowed[ancestor] = node_allowed & ~node_denied
+
+        return self._allowed[name]
+
+    def _names(self, bits: int) -> list:
+        ''' returns the first `MAX_ACTIONS` actions of a bitset '''
+        names = []
+
+        while bits and len(names) < MAX_ACTIONS:
+            low = bits & -bits
+            names.append(self.catalog.actions[low.bit_length() - 1])
+            bits ^= low
+
+        if bits:
+            names.append('...')
+
+        return names
+
+    def node_report(self, name: str, baseline=None) -> dict:
+        ''' returns the allowed actions of a node and its findings
+
+        * `unreachable`: actions which are allowed at the parent (all
+          actions for a root) but not at the node and its children
+        * `widened`/`narrowed`: actions which are allowed additionally/not
+          anymore compared to the same node of the baseline
+        '''
+        allowed = self.allowed(name)
+        parent = self.nodes[name].get('parent')
+
+        if parent is None:
+            parent_allowed = all_bits(self.catalog)
+        else:
+            parent_allowed = self.allowed(parent)
+
+        unreachable = parent_allowed & ~allowed
+        report = {'path': self.path(name), 'allowed': popcount(allowed),
+                  'unreachable': popcount(unreachable),
+                  'unreachable_actions': self._names(unreachable)}
+
+        if baseline is not None and name in baseline.nodes:
+            before = baseline.allowed(name)
+            widened = allowed & ~before
+            report['widened'] = popcount(widened)
+            report['widened_actions'] = self._names(widened)
+            report['narrowed'] = popcount(before & ~allowed)
+
+        return report
+
+    def report(self, baseline=None) -> dict:
+        ''' returns the report of every node and a summary
+
+        Args:
+            baseline (Organization): compare the allowed actions with this
+                organization, e.g. before a change
+        '''
+        nodes = {name: self.node_report(name, baseline)
+                 for name in sorted(self.nodes)}
+        summary = {
+            'nodes': len(nodes),
+            'policies': len(self.permissions),
+            'unreachable': sum(1 for node in nodes.values()
+                               if node.get('unreachable')),
+            'widened': sum(1 for node in nodes.values()
+                           if node.get('widened'))
+        }
+
+        return {'nodes': nodes, 'summary': summary}
+
+
+def _read(path: str):
+    ''' returns the parsed json or yaml file, a yaml error is a ValueError '''
+    with open(path, 'r') as file:
+        raw = file.read()
+
+    if path.endswith(('.yaml', '.yml')):
+        import yaml
+
+        try:
+            return yaml.safe_load(raw)
+        except yaml.YAMLError as error:
+            raise ValueError(f'{path} is not valid yaml: {error}') from error
+
+    return json.loads(raw)
+
+
+def load_organization(path: str, catalog=None) -> Organization:
+    ''' load an organization from a json or yaml file, a policy is the
+    parsed scp or the path of its json file, relative to the file
+
+    Raises:
+        OSError: if a file can't be read
+        ValueError: if a file isn't valid or the organization is invalid
+    '''
+    description = _read(path)
+
+    if not isinstance(description, dict) or 'nodes' not in description:
+        raise ValueError(f'{path} has no nodes')
+
+    for key in ('policies', 'nodes'):
+        if not isinstance(description.get(key) or {}, dict):
+            raise ValueError(f'{key} of {path} is not a mapping')
+
+    directory = os.path.dirname(path)
+    policies = {}
+
+    for name, policy in (description.get('policies') or {}).items():
+        if isinstance(policy, str):
+            with open(os.path.join(directory, policy), 'r') as file:
+                policy = load_policy(file.read()).scp
+
+        policies[name] = policy
+
+    # account ids are numbers in yaml
+    nodes = {}
+    for name, node in (description['nodes'] or {}).items():
+        node = node or {}
+        if not isinstance(node, dict):
+            raise ValueError(f'node {name} of {path} is not a mapping')
+
+        if not isinstance(node.get('policies') or [], list):
+            raise ValueError(f'the policies of node {name} of {path} are '
+                             'not a list')
+
+        node = dict(node)
+        if node.get('parent') is not None:
+            node['parent'] = str(node['parent'])
+        node['policies'] = [str(policy)
+                            for policy in node.get('policies') or []]
+        nodes[str(name)] = node
+
+    return Organization(policies, nodes, catalog)
@@ -0,0 +1,171 @@
+'''
+The known actions an scp covers, allows and denies as bitsets over the
+positions of the action catalog. A bitset is a python int, bit `i` is set if
+the action `catalog.actions[i]` is part of the set. A prefix wildcard covers
+a contiguous slice of the catalog, its bitset is `(1 << end) - (1 << start)`:
+
+.. highlight:: py
+.. code-block:: py
+
+    permissions = Permissions(scp)
+    permissions.allowed                         # the allowed actions
+    popcount(permissions.denied)                # the number of denied actions
+    permissions.actions(permissions.denied)     # the denied actions
+
+-------
+'''
+
+from functools import lru_cache
+from logging import getLogger
+
+from scplint.aws_actions import catalog_cache, get_catalog, has_wildcard
+from scplint.wildcards import compile_pattern
+
+logger = getLogger()
+
+CACHE_SIZE = 16384
+
+
+# int.bit_count is new in python 3.10
+HAS_BIT_COUNT = hasattr(int, 'bit_count')
+
+
+def popcount(bits: int) -> int:
+    ''' returns the number of actions of a bitset '''
+    if HAS_BIT_COUNT:
+        return bits.bit_count()
+
+    return bin(bits).count('1')
+
+
+def all_bits(catalog) -> int:
+    ''' returns the bitset of all actions of the catalog '''
+    return (1 << len(catalog)) - 1
+
+
+@catalog_cache
+@lru_cache(maxsize=CACHE_SIZE)
+def item_bits(item: str, catalog) -> int:
+    ''' returns the bitset of the actions covered by an Action/NotAction
+    item, unknown actions cover nothing
+    '''
+    if not isinstance(item, str):
+        return 0
+
+    if not has_wildcard(item):
+        index = catalog.index(item)
+        return 0 if index is None else 1 << index
+
+    pattern = compile_pattern(item)
+    bits = 0
+
+    if pattern.is_prefix:
+        for start, end in pattern.ranges(catalog):
+            bits |= (1 << end) - (1 << start)
+        return bits
+
+    for index in pattern.resolve(catalog):
+        bits |= 1 << index
+
+    return bits
+
+
+def bits_actions(bits: int, catalog) -> list:
+    ''' returns the actions of a bitset in the order of the catalog '''
+    # the binary digits from the lowest bit on
+    digits = bin(bits)[:1:-1]
+
+    return [catalog.actions[index]
+            for index, digit in enumerate(digits) if digit == '1']
+
+
+def items_bits(items: list, catalog) -> int:
+    ''' returns the union of the bitsets of Action/NotAction items '''
+    bits = 0
+
+    for item in items:
+        bits |= item_bits(item, catalog)
+
+    return bits
+
+
+def statement_bits(statement: dict, catalog) -> int:
+    ''' returns the bitset of the actions a statement applies to, the
+    complement of its NotActions if it has no Actions
+    '''
+    if 'NotAction' in statement and 'Action' not in statement:
+        notactions = statement['NotAction']
+        if not isinstance(notactions, list):
+            notactions = [notactions]
+        return all_bits(catalog) & ~items_bits(notactions, catalog)
+
+    actions = statement.get('Action', [])
+    if not isinstance(actions, list):
+        actions = [actions]
+
+    return items_bits(actions, catalog)
+
+
+def is_unconditional(statement: dict) -> bool:
+    ''' True if the statement applies to all resources without conditions '''
+    resources = statement.get('Resource', '*')
+
+    return (not statement.get('Condition') and 'NotResource' not in statement
+            and resources in ('*', ['*']))
+
+
+class Permissions:
+    ''' the actions an scp covers, allows and denies
+
+    A Deny statement with conditions or resources only denies some requests,
+    its actions are `limited` instead of `denied`. The `allowed` actions are
+    allowed by an Allow statement and not denied.
+
+    Args:
+        scp (dict): the parsed policy
+        catalog (ActionCatalog): the known actions, the shared catalog by
+            default
+    '''
+    __slots__ = ('catalog', 'covered', 'allowed', 'denied', 'limited')
+
+    def __init__(self, scp: dict, catalog=None):
+        self.catalog = catalog or get_catalog()
+        self.covered = 0
+        self.denied = 0
+        self.limited = 0
+        allowed = 0
+
+        statements = scp.get('Statement', []) if isinstance(scp, dict) else []
+        if isinstance(statements, dict):
+            statements = [statements]
+
+        for statement in statements:
+            if not isinstance(statement, dict):
+                continue
+
+            bits = statement_bits(statement, self.catalog)
+            self.covered |= bits
+
+            if statement.get('Effect') == 'Allow':
+                allowed |= bits
+            elif is_unconditional(statement):
+                self.denied |= bits
+            else:
+                self.limited |= bits
+
+        self.allowed = allowed & ~self.denied
+
+    def actions(self, bits: int) -> list:
+        ''' returns the actions of a bitset in the order of the catalog '''
+        return bits_actions(bits, self.catalog)
+
+    def counts(self) -> dict:
+        ''' returns the number of covered, allowed, denied and limited
+        actions
+        '''
+        return {
+            'covered': popcount(self.covered),
+            'allowed': popcount(self.allowed),
+            'denied': popcount(self.denied),
+            'limited': popcount(self.limited)
+        }
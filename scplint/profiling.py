@@ -0,0 +1,73 @@
+'''
+Timings and counters of a single check run. The report of a file gets a
+`Profile` if it's checked with `--profile`:
+
+.. highlight:: py
+.. code-block:: py
+
+    profile = Profile()
+    with profile.measure('check_actions'):
+        CheckActions(report)
+    profile.count('catalog_lookups', 42)
+    profile.to_dict()
+
+-------
+'''
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class Profile:
+    ''' the wall and cpu time of every checker and the call counts of hot
+    helpers, e.g. catalog lookups or formatted messages
+    '''
+    __slots__ = ('checkers', 'counters')
+
+    def __init__(self):
+        self.checkers = {}
+        self.counters = Counter()
+
+    @contextmanager
+    def measure(self, name: str):
+        ''' add the wall and cpu time of the block to the given checker '''
+        wall, cpu = time.perf_counter(), time.process_time()
+
+        try:
+            yield
+        finally:
+            timing = self.checkers.setdefault(name, {'wall': 0.0, 'cpu': 0.0})
+            timing['wall'] += time.perf_counter() - wall
+            timing['cpu'] += time.process_time() - cpu
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] += value
+
+    def to_dict(self) -> dict:
+        ''' returns the profile as part of a report, times are seconds '''
+        return {
+            'checkers': {name: {'wall': round(timing['wall'], 6),
+                                'cpu': round(timing['cpu'], 6)}
+                         for name, timing in self.checkers.items()},
+            'counters': dict(sorted(self.counters.items()))
+        }
+
+
+def add_profile(total: dict, profile: dict):
+    ''' add the profile of a single report to the profile of a summary
+
+    Args:
+        total (dict): the aggregated profile, it's updated in place
+        profile (dict): the profile of a report, see `Profile.to_dict`
+    '''
+    checkers = total.setdefault('checkers', {})
+    counters = total.setdefault('counters', {})
+
+    for name, timing in profile.get('checkers', {}).items():
+        summary = checkers.setdefault(name, {'wall': 0.0, 'cpu': 0.0})
+        summary['wall'] = round(summary['wall'] + timing['wall'], 6)
+        summary['cpu'] = round(summary['cpu'] + timing['cpu'], 6)
+
+    for name, value in profile.get('counters', {}).items():
+        counters[name] = counters.get(name, 0) + value
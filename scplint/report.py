@@ -1,25 +1,41 @@
-import copy
+from collections import Counter
 from logging import getLogger
 
+from scplint.findings import Finding
+from scplint.loader import Policy
+from scplint.profiling import Profile, add_profile
+
 logger = getLogger()
 
 
 def _format_msg(func):
-    def wrapper(report, msgs, code, details):
-        msgs_copy = copy.deepcopy(msgs)
-        msg = msgs_copy[code]
-        msg['code'] = code
-        msg['msg'] = msg['msg'].format(**details)
+    def wrapper(report, msgs, code, details, location=None):
+        if report.selection and not report.selection(code):
+            return
+
+        report.count('messages')
+
+        # a location is a path within the scp or a line and column, the
+        # path is kept if the source has no line and column for it
+        path = None
+        if isinstance(location, tuple):
+            path = location
+            location = report.location(path)
 
-        func(report, msg)
+        func(report, Finding(msgs, code, details, location or None, path))
 
     return wrapper
 
 
 class Report():
-    def __init__(self, scp, raw):
+    def __init__(self, scp, raw=None, profile: bool = False,
+                 selection=None, max_findings: int = None):
         logger.debug('initialize report')
-        self.raw = raw
+        if isinstance(raw, str):
+            raw = Policy(raw, scp.scp)
+
+        self.policy = raw
+        self.raw = raw.raw if raw else None
         self.scp = scp
         self.file = scp.file
         self.size = scp.size
@@ -35,11 +51,44 @@ class Report():
         self.actions_info = []
         self.actions_warning = []
         self.actions_error = []
+        self.permissions = None
 
         self.errors = []
         self.warnings = []
         self.infos = []
         self.recommendations = []
+        self.profile = Profile() if profile else None
+        self.selection = selection
+
+        # identical findings are counted, at most `max_findings` different
+        # findings are kept per code
+        self.max_findings = max_findings
+        self.totals = Counter()
+        self.suppressed = Counter()
+        self._findings = {}
+        self._codes = Counter()
+
+    @property
+    def duplicates(self) -> list:
+        ''' returns all duplicate keys of the policy source '''
+        if self.policy is None:
+            return []
+
+        return self.policy.duplicates
+
+    def location(self, path: tuple):
+        ''' returns the `line` and `column` of a value of the policy source,
+        e.g. `('Statement', 0, 'Action', 2)`, or None
+        '''
+        if self.policy is None:
+            return None
+
+        return self.policy.source.location(path)
+
+    def count(self, name: str, value: int = 1):
+        ''' count the calls of a hot helper if the report is profiled '''
+        if self.profile is not None:
+            self.profile.count(name, value)
 
     def get_report(self):
         logger.debug('get report')
@@ -60,13 +109,16 @@ class Report():
                 'error': len(self.actions_error)
             },
             'summary': {
-                'recommendations': len(self.recommendations),
-                'infos': len(self.infos),
-                'warnings': len(self.warnings),
-                'errors': len(self.errors)
+                'recommendations': self.totals['recommendations'],
+                'infos': self.totals['infos'],
+                'warnings': self.totals['warnings'],
+                'errors': self.totals['errors']
             }
         }
 
+        if self.permissions is not None:
+            report['actions'].update(self.permissions.counts())
+
         return report
 
     def get_report_detailed(self):
@@ -75,36 +127,98 @@ class Report():
         report = self.get_report()
 
         report['details'] = {}
-        if self.errors:
-            report['details']['errors'] = self.errors
+        for kind in ('errors', 'warnings', 'infos', 'recommendations'):
+            findings = getattr(self, kind)
 
-        if self.warnings:
-            report['details']['warnings'] = self.warnings
+            if findings:
+                report['details'][kind] = [finding.to_dict()
+                                           for finding in findings]
 
-        if self.infos:
-            report['details']['infos'] = self.infos
+        if self.suppressed:
+            report['details']['suppressed'] = dict(
+                sorted(self.suppressed.items()))
 
-        if self.recommendations:
-            report['details']['recommendations'] = self.recommendations
+        if self.profile is not None:
+            report['profile'] = self.profile.to_dict()
 
         return report
 
+    def _add(self, kind: str, finding: Finding) -> bool:
+        ''' add a finding to the findings of its kind, an identical finding
+        is counted instead
+
+        Returns:
+            added (bool): True if the finding is new and kept
+        '''
+        self.totals[kind] += 1
+        key = finding.key()
+        known = self._findings.get(key)
+
+        if known is not None:
+            known.count += 1
+            return False
+
+        if (self.max_findings is not None
+                and self._codes[finding.code] >= self.max_findings):
+            self.suppressed[finding.code] += 1
+            return False
+
+        self._codes[finding.code] += 1
+        self._findings[key] = finding
+        getattr(self, kind).append(finding)
+
+        return True
+
     @_format_msg
-    def add_error(self, msg):
-        logger.error(msg)
-        self.errors.append(msg)
+    def add_error(self, finding):
+        if self._add('errors', finding):
+            logger.error(finding)
 
     @_format_msg
-    def add_warning(self, msg):
-        logger.warning(msg)
-        self.warnings.append(msg)
+    def add_warning(self, finding):
+        if self._add('warnings', finding):
+            logger.warning(finding)
 
     @_format_msg
-    def add_info(self, msg):
-        logger.info(msg)
-        self.infos.append(msg)
+    def add_info(self, finding):
+        if self._add('infos', finding):
+            logger.info(finding)
 
     @_format_msg
-    def add_recommendation(self, msg):
-        logger.info(msg)
-        self.recommendations.append(msg)
+    def add_recommendation(self, finding):
+        if self._add('recommendations', finding):
+            logger.info(finding)
+
+
+def new_summary() -> dict:
+    return {
+        'recommendations': 0,
+        'infos': 0,
+        'warnings': 0,
+        'errors': 0
+    }
+
+
+def add_to_summary(summary: dict, result: dict):
+    ''' add the findings of a single file to a summary '''
+    summary['recommendations'] += result['summary']['recommendations']
+    summary['infos'] += result['summary']['infos']
+    summary['warnings'] += result['summary']['warnings']
+    summary['errors'] += result['summary']['errors']
+
+    if 'profile' in result:
+        add_profile(summary.setdefault('profile', {}), result['profile'])
+
+
+def create_summary(all_results: list) -> dict:
+    report = {
+        'details': all_results,
+        'files': [],
+        'summary': new_summary()
+    }
+
+    for result in all_results:
+        report['files'].append(result['file'])
+        add_to_summary(report['summary'], result)
+
+    return report
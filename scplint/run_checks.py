@@ -1,13 +1,129 @@
 from logging import getLogger
 
-from scplint.checkers import *
+from scplint.aws_actions import get_catalog
+from scplint.checkers import BUILTIN_CHECKERS, check_schema, get_checkers
+from scplint.loader import Policy, load_policy
+from scplint.report import Report
+from scplint.scp import SCP
 
 logger = getLogger()
 
 
 def run_checks(report):
     logger.debug('run checks')
-    check_schema.CheckSchema(report)
-    check_limits.CheckLimits(report)
-    check_actions.CheckActions(report)
-    check_recommendations.CheckRecommendations(report)
+
+    if report.selection:
+        checkers = report.selection.checkers()
+    else:
+        checkers = get_checkers()
+
+    for checker in checkers:
+        if report.profile is None:
+            checker.cls(report)
+            continue
+
+        with report.profile.measure(checker.name):
+            checker.cls(report)
+
+
+def init_worker():
+    ''' load the shared resources of the checks once per process, e.g. as
+    initializer of a process pool. the schema validator is compiled here,
+    even if the first policies pass the structural check.
+    '''
+    logger.debug('initialize worker')
+    get_catalog()
+    check_schema.get_validator()
+
+
+def lint_file(file: str, minimize: bool = False, detailed: bool = False,
+              cache=None, profile: bool = False, selection=None,
+              max_findings: int = None) -> dict:
+    ''' run all checks for a single scp file
+
+    Args:
+        file (str): the path of the scp
+        minimize (bool): True to check the size of the minimized scp
+        detailed (bool): True to return the detailed report
+        cache (ResultCache): returns the cached result of an unchanged scp
+        profile (bool): True to add the timings of every checker and the
+            call counts of hot helpers to the detailed report, it's never
+            cached
+        selection (Selection): the rule codes to check, all by default
+        max_findings (int): keep at most this many different findings per
+            code, all are counted in the summary
+
+    Returns:
+        results (dict): the (detailed) report of the scp
+    '''
+    logger.info('check file %s', file)
+
+    with open(file, 'r') as source:
+        raw = source.read()
+
+    return lint_source(raw, file, minimize, detailed, cache, profile,
+                       selection, max_findings)
+
+
+def lint_source(raw: str, file: str = 'my_scp', minimize: bool = False,
+                detailed: bool = False, cache=None,
+                profile: bool = False, selection=None,
+                max_findings: int = None) -> dict:
+    ''' run all checks for the json source of a single scp, see `lint_file`
+    '''
+    if profile:
+        cache = None
+
+    if cache is not None:
+        options = {'minimize': minimize, 'detailed': detailed}
+        if selection:
+            options.update(selection.options())
+
+        if max_findings is not None:
+            options['max_findings'] = max_findings
+
+        # results of installed plugins aren't shared with other setups
+        if get_checkers() != BUILTIN_CHECKERS:
+            options['checkers'] = [checker.name
+                                   for checker in get_checkers()]
+
+        key = cache.key(raw, options)
+        results = cache.get(key)
+
+        if results is not None:
+            logger.debug('use cached result for %s', file)
+            results['file'] = file
+            return results
+
+    results = lint_policy(load_policy(raw), file, minimize, detailed,
+                          profile, selection, max_findings)
+
+    if cache is not None:
+        cache.set(key, results)
+
+    return results
+
+
+def lint_policy(policy, file: str = 'my_scp', minimize: bool = False,
+                detailed: bool = False, profile: bool = False,
+                selection=None, max_findings: int = None) -> dict:
+    ''' run all checks for a single parsed scp, see `lint_file`
+
+    Args:
+        policy (dict|Policy): the parsed scp or a policy of `load_policy`,
+            only the latter reports the line and column of findings
+    '''
+    if isinstance(policy, Policy):
+        scp = SCP(scp=policy.scp, filename=file, minimize=minimize)
+        report = Report(scp, policy, profile, selection, max_findings)
+    else:
+        scp = SCP(scp=policy, filename=file, minimize=minimize)
+        report = Report(scp, profile=profile, selection=selection,
+                        max_findings=max_findings)
+
+    run_checks(report)
+
+    if not detailed:
+        return report.get_report()
+
+    return report.get_report_detailed()
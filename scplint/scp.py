@@ -1,8 +1,10 @@
 import json
 import os
+from functools import cached_property
 from logging import getLogger
 from pathlib import Path
 
+from scplint.size import PolicySize, minify
 from scplint.statement import Statement
 
 logger = getLogger()
@@ -31,8 +33,8 @@ class SCP:
         logger.debug('Get every Statement from the SCP')
         statements = []
 
-        for statement in self.scp.get('Statement', []):
-            statements.append(Statement(statement))
+        for index, statement in enumerate(self.scp.get('Statement', [])):
+            statements.append(Statement(statement, index))
 
         return statements
 
@@ -75,7 +77,7 @@ class SCP:
         '''
         logger.debug('Get the size in bytes of the SCP (minimized=%s)', min)
         if min:
-            scp_bytes = len(self.minimize().encode('utf-8'))
+            scp_bytes = self.sizes.total
         else:
             scp_bytes = len(json.dumps(self.scp, indent=4).encode('utf-8'))
 
@@ -93,17 +95,21 @@ class SCP:
             percent (float): the size of the scp as percentage value
         '''
         logger.debug('Get the size in percent of the SCP')
-        percent = round(100 / 5120 * size, precision)
+        percent = round(100 / self.size_max * size, precision)
 
         return percent
 
+    @cached_property
+    def sizes(self) -> PolicySize:
+        ''' the bytes of the minified scp and of every statement '''
+        return PolicySize(self.scp)
+
     def minimize(self) -> str:
         ''' convert the json scp into a minifed str (remove blanks, tabs and
-        linebreaks)
+        linebreaks outside of strings)
 
         Returns:
             scp_minified (str): a minified version of the json policy
         '''
         logger.debug('Format the json policy into a minized text')
-        scp_minified = json.dumps(self.scp).replace(" ", "")
-        return scp_minified
+        return minify(self.scp)
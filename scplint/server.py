@@ -0,0 +1,226 @@
+'''
+A local lint server which keeps the action catalog, the compiled schema and
+the caches warm between requests. Start it with ``scplint --serve 8765`` and
+send policies or paths:
+
+.. highlight:: bash
+.. code-block:: bash
+
+    $ curl -d '{"paths": ["/abs/path/scp.json"]}' http://127.0.0.1:8765/lint
+
+    $ scplint -i scp.json --server http://127.0.0.1:8765
+
+A request is a json object with the optional keys `paths` (files on the
+host of the server), `policies` (a list of `{"file": name, "policy": ...}`
+where the policy is the json source or the parsed object) and `options`
+(`minimize`, `detailed`, the code prefixes `select` and `ignore` and
+`max_findings`). The response body is the same report as the json output of
+scplint. Requests need the content type `application/json`, so websites
+can't send them from a browser without a preflight.
+
+The server reads any file its clients ask for. It only listens on a loopback
+address unless remote clients are allowed explicitly.
+
+-------
+'''
+
+import ipaddress
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import getLogger
+
+import scplint
+from scplint.log import return_http_response
+from scplint.report import create_summary
+from scplint.checkers import Selection
+from scplint.run_checks import init_worker, lint_file, lint_source
+
+logger = getLogger()
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+def handle_lint(request: dict, cache=None) -> dict:
+    ''' lint the policies and paths of a request
+
+    Args:
+        request (dict): the request, see the module description
+        cache (ResultCache): the result cache of the server
+
+    Returns:
+        response (dict): the http response, see `log.return_http_response`
+    '''
+    options = request.get('options', {})
+
+    if not isinstance(options, dict):
+        return return_http_response('400', 'invalid request: options must '
+                                    'be an object')
+
+    minimize = bool(options.get('minimize'))
+    detailed = bool(options.get('detailed'))
+    max_findings = options.get('max_findings')
+    results = []
+
+    try:
+        selection = Selection(options.get('select'), options.get('ignore'))
+
+        for path in request.get('paths', []):
+            results.append(lint_file(path, minimize, detailed, cache,
+                                     selection=selection or None,
+                                     max_findings=max_findings))
+
+        for item in request.get('policies', []):
+            policy = item['policy']
+
+            if not isinstance(policy, str):
+                policy = json.dumps(policy, indent=4)
+
+            results.append(lint_source(policy, item.get('file', 'my_scp'),
+                                       minimize, detailed, cache,
+                                       selection=selection or None,
+                                       max_findings=max_findings))
+
+    except OSError as error:
+        return return_http_response('404', f'{error}')
+
+    except (KeyError, TypeError, ValueError) as error:
+        return return_http_response('400', f'invalid request: {error}')
+
+    # a policy the checks can't handle mustn't drop the connection
+    except Exception:  # pylint: disable=W0703
+        logger.exception('unable to lint the request')
+        return return_http_response('500', 'unable to lint the request')
+
+    return return_http_response('200', create_summary(results))
+
+
+class LintRequestHandler(BaseHTTPRequestHandler):
+    ''' POST /lint lints policies, GET /health returns the version '''
+    server_version = f'scplint/{scplint.__version__}'
+
+    def _send(self, response: dict):
+        body = response['body'].encode()
+
+        self.send_response(int(response['statusCode']))
+        for header, value in response['headers'].items():
+            # the server reads local files, don't let websites call it
+            if header != 'Access-Control-Allow-Origin':
+                self.send_header(header, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):  # pylint: disable=C0103
+        if self.path != '/health':
+            self._send(return_http_response('404', f'{self.path} not found'))
+            return
+
+        self._send(return_http_response('200', {
+            'message': 'ok',
+            'version': scplint.__version__
+        }))
+
+    def do_POST(self):  # pylint: disable=C0103
+        if self.path != '/lint':
+            self._send(return_http_response('404', f'{self.path} not found'))
+            return
+
+        if self.headers.get_content_type() != 'application/json':
+            self._send(return_http_response(
+                '415', 'the content type must be application/json'))
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as error:
+            self._send(return_http_response('400',
+                                            f'invalid request: {error}'))
+            return
+
+        if not isinstance(request, dict):
+            self._send(return_http_response('400', 'invalid request'))
+            return
+
+        self._send(handle_lint(request, getattr(self.server, 'cache', None)))
+
+    def log_message(self, format, *args):  # pylint: disable=W0622
+        logger.info('%s %s', self.address_string(), format % args)
+
+
+def parse_address(address: str) -> tuple:
+    ''' parse `[host:]port` into `(host, port)`, the default host and port
+    are used for missing parts
+    '''
+    host, _, port = str(address).rpartition(':')
+    return host or DEFAULT_HOST, int(port or DEFAULT_PORT)
+
+
+def is_loopback(host: str) -> bool:
+    ''' True if the host is `localhost` or a loopback address '''
+    if host == 'localhost':
+        return True
+
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def serve(address: str = f'{DEFAULT_HOST}:{DEFAULT_PORT}', cache=None,
+          allow_remote: bool = False):
+    ''' run the lint server until it's interrupted
+
+    Args:
+        address (str): `[host:]port` to listen on, localhost by default
+        cache (ResultCache): an optional result cache
+        allow_remote (bool): True to listen on other than loopback addresses,
+            every client can read the files of this host
+
+    Raises:
+        ValueError: if the address isn't valid or not a loopback address and
+            remote clients aren't allowed
+    '''
+    host, port = parse_address(address)
+
+    if not (allow_remote or is_loopback(host)):
+        raise ValueError(f'{host} is not a loopback address, allow remote '
+                         'clients to listen on it')
+
+    init_worker()
+    server = ThreadingHTTPServer((host, port), LintRequestHandler)
+    server.cache = cache
+    logger.info('scplint server listens on %s:%s', *server.server_address)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def request_lint(url: str, request: dict, timeout: float = 60) -> dict:
+    ''' send a request to a running lint server
+
+    Args:
+        url (str): the url of the server, e.g. `http://127.0.0.1:8765`
+        request (dict): the request, see the module description
+        timeout (float): the timeout in seconds
+
+    Returns:
+        report (dict): the report of the server
+
+    Raises:
+        urllib.error.URLError: if the server isn't reachable or the request
+            fails
+    '''
+    from urllib.request import Request, urlopen
+
+    http_request = Request(f'{url.rstrip("/")}/lint',
+                           data=json.dumps(request).encode(),
+                           headers={'Content-Type': 'application/json'})
+
+    with urlopen(http_request, timeout=timeout) as response:
+        return json.loads(response.read())
@@ -0,0 +1,139 @@
+'''
+The size of a minified scp, the size AWS enforces for the policy document,
+with the bytes of every statement and action. The sizes of the statements
+are kept, so the size after a change of a single statement is computed
+without serializing the whole policy again:
+
+.. highlight:: py
+.. code-block:: py
+
+    sizes = PolicySize(scp)
+    sizes.total                                 # bytes of the minified scp
+    sizes.statements                            # bytes of every statement
+    sizes.action_sizes(0)                       # bytes of every action
+    sizes.delta(0, new_statement)               # size change of a statement
+
+-------
+'''
+
+import json
+from logging import getLogger
+
+logger = getLogger()
+
+SEPARATORS = (',', ':')
+
+
+def minify(value) -> str:
+    ''' returns the minified json of a value, blanks within strings are
+    kept and non-ascii characters aren't escaped
+    '''
+    return json.dumps(value, separators=SEPARATORS, ensure_ascii=False)
+
+
+def json_size(value) -> int:
+    ''' returns the utf-8 bytes of the minified json of a value '''
+    return len(minify(value).encode('utf-8'))
+
+
+class PolicySize:
+    ''' The bytes of a minified scp and of each of its statements.
+
+    Args:
+        scp (dict): the parsed policy
+    '''
+    __slots__ = ('scp', 'statements', 'total', '_single', '_base')
+
+    def __init__(self, scp: dict):
+        self.scp = scp
+        statements = []
+        if isinstance(scp, dict):
+            statements = scp.get('Statement', [])
+
+        # a single statement isn't wrapped in a list
+        self._single = isinstance(statements, dict)
+        if self._single:
+            statements = [statements]
+        elif not isinstance(statements, list):
+            statements = []
+
+        self.statements = [json_size(statement) for statement in statements]
+
+        if isinstance(scp, dict) and 'Statement' in scp and statements:
+            self._base = json_size({**scp, 'Statement': []})
+        else:
+            self._base = json_size(scp)
+
+        self.total = self._size(self.statements)
+
+    def _size(self, statements: list) -> int:
+        ''' returns the total size for the given statement sizes '''
+        if not statements:
+            return self._base
+
+        if self._single:
+            # the size of `{...}` replaces the size of `[]`
+            return self._base - 2 + statements[0]
+
+        return self._base + sum(statements) + len(statements) - 1
+
+    def largest(self, count: int = 1) -> list:
+        ''' returns the indexes of the largest statements, largest first '''
+        return sorted(range(len(self.statements)),
+                      key=lambda index: -self.statements[index])[:count]
+
+    def action_sizes(self, index: int, key: str = 'Action') -> list:
+        ''' returns the bytes each value of an Action/NotAction list adds to
+        the policy, including its separator. the bytes of a single action
+        are the bytes of the string.
+
+        Args:
+            index (int): the index of the statement
+            key (str): `Action` or `NotAction`
+
+        Returns:
+            sizes (list): `(action, bytes)` of every action
+        '''
+        statement = self._statement(index)
+        actions = []
+        if isinstance(statement, dict):
+            actions = statement.get(key, [])
+
+        if not isinstance(actions, list):
+            return [(actions, json_size(actions))]
+
+        separator = 1 if len(actions) > 1 else 0
+        return [(action, json_size(action) + separator)
+                for action in actions]
+
+    def _statement(self, index: int):
+        statements = self.scp['Statement']
+        return statements if self._single else statements[index]
+
+    def delta(self, index: int, statement) -> int:
+        ''' returns the size change of the policy if the statement at the
+        index is replaced, None removes the statement
+        '''
+        if statement is None:
+            statements = self.statements[:index] + self.statements[index + 1:]
+            return self._size(statements) - self.total
+
+        return json_size(statement) - self.statements[index]
+
+    def add_delta(self, statement) -> int:
+        ''' returns the size change of the policy if the statement is
+        appended
+        '''
+        statements = self.statements + [json_size(statement)]
+
+        # two statements are a list again
+        total = self._base + sum(statements) + len(statements) - 1
+        return total - self.total
+
+    def update(self, index: int, statement: dict) -> int:
+        ''' replace the size of the statement at the index and return the
+        new total size, the policy itself isn't changed
+        '''
+        self.statements[index] = json_size(statement)
+        self.total = self._size(self.statements)
+        return self.total
@@ -6,8 +6,9 @@ logger = getLogger()
 
 
 class Statement:
-    def __init__(self, statement: dict):
+    def __init__(self, statement: dict, index: int = None):
         self.statement = statement
+        self.index = index
         self.sid = statement.get('Sid')
         self.effect = statement.get('Effect')
         self.actions = self._get_items('Action')
@@ -28,6 +29,25 @@ class Statement:
         else:
             return [items]
 
+    def path(self, item: str = None, position: int = None) -> tuple:
+        ''' returns the path of the statement or one of its items within the
+        scp, e.g. `('Statement', 0, 'Action', 2)`
+
+        Args:
+            item (str): e.g. `Action`, `NotAction` or `Resource`
+            position (int): the position of a value within the item
+        '''
+        path = ('Statement', self.index)
+
+        if item is not None:
+            path += (item, )
+
+            if position is not None and isinstance(self.statement.get(item),
+                                                   list):
+                path += (position, )
+
+        return path
+
     def _sort_actions(self):
         self.actions.sort()
 
@@ -0,0 +1,228 @@
+'''
+"Did you mean" suggestions for unknown actions. Candidates are looked up in
+a character trigram index of the action names of a service and ranked by
+their edit distance:
+
+.. highlight:: py
+.. code-block:: py
+
+    suggester = get_suggester(catalog)
+    suggester.suggest('s3:GetObjct')  # ['s3:GetObject', ...]
+
+-------
+'''
+
+import bisect
+import heapq
+from collections import Counter, defaultdict
+from functools import lru_cache
+from logging import getLogger
+
+from scplint.aws_actions import catalog_cache
+
+logger = getLogger()
+
+CANDIDATES = 12
+
+
+def max_distance(word: str) -> int:
+    ''' returns the largest edit distance of a similar word, it may differ in
+    half of the characters of the word and one more
+    '''
+    return len(word) // 2 + 1
+
+
+def trigrams(word: str) -> set:
+    ''' returns the character trigrams of a padded word '''
+    word = f'  {word} '
+    return {word[index:index + 3] for index in range(len(word) - 2)}
+
+
+def edit_distance(word_1: str, word_2: str, bound: int = None) -> int:
+    ''' returns the levenshtein distance of two words
+
+    Args:
+        word_1 (str): the first word
+        word_2 (str): the second word
+        bound (int): stop early and return `bound + 1` as soon as the
+            distance is known to be above the bound
+    '''
+    # a common prefix and suffix doesn't change the distance
+    prefix = 0
+    while (prefix < len(word_1) and prefix < len(word_2)
+           and word_1[prefix] == word_2[prefix]):
+        prefix += 1
+
+    word_1 = word_1[prefix:]
+    word_2 = word_2[prefix:]
+
+    while word_1 and word_2 and word_1[-1] == word_2[-1]:
+        word_1 = word_1[:-1]
+        word_2 = word_2[:-1]
+
+    if len(word_1) < len(word_2):
+        word_1, word_2 = word_2, word_1
+
+    if bound is None:
+        bound = len(word_1)
+
+    if len(word_1) - len(word_2) > bound:
+        return bound + 1
+
+    # only the diagonal band of width `bound` can stay within the bound
+    outside = bound + 1
+    previous = [index if index <= bound else outside
+                for index in range(len(word_2) + 1)]
+
+    for index_1, char_1 in enumerate(word_1, 1):
+        start = max(1, index_1 - bound)
+        end = min(len(word_2), index_1 + bound)
+        current = [outside] * (len(word_2) + 1)
+        current[0] = index_1 if index_1 <= bound else outside
+        row_minimum = current[0]
+
+        for index_2 in range(start, end + 1):
+            distance = previous[index_2 - 1] + (char_1 != word_2[index_2 - 1])
+            if previous[index_2] < distance:
+                distance = previous[index_2] + 1
+            if current[index_2 - 1] < distance:
+                distance = current[index_2 - 1] + 1
+
+            current[index_2] = distance
+            if distance < row_minimum:
+                row_minimum = distance
+
+        if row_minimum > bound:
+            return outside
+
+        previous = current
+
+    return min(previous[-1], outside)
+
+
+class _TrigramIndex:
+    ''' An inverted index from trigrams to words '''
+    __slots__ = ('words', 'sizes', 'postings')
+
+    def __init__(self, words):
+        self.words = tuple(words)
+        self.sizes = []
+        self.postings = defaultdict(list)
+
+        for position, word in enumerate(self.words):
+            word_trigrams = trigrams(word)
+            self.sizes.append(len(word_trigrams))
+
+            for trigram in word_trigrams:
+                self.postings[trigram].append(position)
+
+    def closest(self, word: str, limit: int, strict: bool = False) -> list:
+        ''' returns up to `limit` words ordered by edit distance. only the
+        words with the highest trigram similarity are compared.
+
+        Args:
+            word (str): the word to look up
+            limit (int): the maximum number of words
+            strict (bool): True to skip the words which aren't similar (see
+                `max_distance`) instead of using them to fill up the limit
+        '''
+        word_trigrams = trigrams(word)
+        shared = Counter()
+
+        for trigram in word_trigrams:
+            shared.update(self.postings.get(trigram, ()))
+
+        if shared:
+            size = len(word_trigrams)
+            positions = heapq.nlargest(
+                CANDIDATES, shared,
+                key=lambda item: shared[item] / (size + self.sizes[item]))
+        else:
+            positions = range(len(self.words))
+
+        # words which differ in more than half of their characters are
+        # only used if there are no better candidates and not strict
+        ranked = []
+        others = []
+
+        for position in positions:
+            candidate = self.words[position]
+
+            if len(ranked) >= limit:
+                bound = ranked[limit - 1][0]
+            else:
+                bound = max_distance(word)
+
+            distance = edit_distance(word, candidate, bound)
+
+            if distance > bound:
+                others.append(candidate)
+            else:
+                bisect.insort(ranked, (distance, candidate))
+
+        closest = [candidate for _, candidate in ranked[:limit]]
+        if strict:
+            return closest
+
+        return closest + others[:limit - len(closest)]
+
+
+class ActionSuggester:
+    ''' Suggests known actions for unknown actions. The index of a service is
+    built on first use.
+
+    Args:
+        catalog (ActionCatalog): the indexed known aws actions
+    '''
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._services = None
+        self._actions = {}
+
+    def _service_index(self) -> _TrigramIndex:
+        if self._services is None:
+            self._services = _TrigramIndex(self.catalog.services)
+
+        return self._services
+
+    def _action_index(self, service: str) -> _TrigramIndex:
+        if service not in self._actions:
+            start, end = self.catalog.service_range(service)
+            names = [key.split(':', 1)[1]
+                     for key in self.catalog.keys[start:end]]
+            self._actions[service] = _TrigramIndex(names)
+
+        return self._actions[service]
+
+    def suggest(self, action: str, limit: int = 3) -> list:
+        ''' returns the closest known actions for an unknown action. if the
+        service is unknown as well, the closest service is used. actions and
+        services which aren't similar (see `max_distance`) aren't suggested.
+
+        Args:
+            action (str): the unknown action, e.g. `s3:GetObjct`
+            limit (int): the maximum number of suggestions
+
+        Returns:
+            suggestions (list): known actions in the catalog spelling
+        '''
+        if not len(self.catalog):
+            return []
+
+        service, _, name = action.lower().partition(':')
+
+        if service not in self.catalog.services:
+            services = self._service_index().closest(service, 1, strict=True)
+            if not services:
+                return []
+            service = services[0]
+
+        names = self._action_index(service).closest(name, limit, strict=True)
+        return [self.catalog.get(f'{service}:{name}') for name in names]
+
+
+@catalog_cache
+@lru_cache(maxsize=4)
+def get_suggester(catalog) -> ActionSuggester:
+    ''' returns the shared suggester of a catalog '''
+    return ActionSuggester(catalog)
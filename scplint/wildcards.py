@@ -0,0 +1,141 @@
+'''
+IAM wildcard matching for Action/NotAction items. A pattern is compiled once
+and cached, its coverage is resolved against the indexed action catalog:
+
+.. highlight:: py
+.. code-block:: py
+
+    pattern = compile_pattern('*:Delete*')
+    actions = pattern.actions(catalog)
+
+-------
+'''
+
+import re
+from functools import lru_cache
+from logging import getLogger
+
+logger = getLogger()
+
+CACHE_SIZE = 4096
+
+
+def _literal_prefix(pattern: str) -> str:
+    ''' returns everything in front of the first wildcard of a pattern '''
+    for index, char in enumerate(pattern):
+        if char in '*?':
+            return pattern[:index]
+
+    return pattern
+
+
+def _to_regex(pattern: str):
+    ''' translate an IAM glob (`*` and `?`) into a compiled regex '''
+    parts = []
+
+    for char in pattern:
+        if char == '*':
+            parts.append('.*')
+        elif char == '?':
+            parts.append('.')
+        else:
+            parts.append(re.escape(char))
+
+    return re.compile(''.join(parts), re.DOTALL)
+
+
+class ActionPattern:
+    ''' A compiled, case insensitive IAM action pattern, e.g. `ec2:Describe*`
+    or `*:Delete*`.
+
+    Args:
+        pattern (str): an Action/NotAction item of a statement
+    '''
+    __slots__ = ('pattern', 'key', 'prefix', 'service', 'regex', 'is_prefix')
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.key = pattern.lower()
+        self.prefix = _literal_prefix(self.key)
+        self.regex = _to_regex(self.key)
+        # patterns like `ec2:Describe*` cover a whole prefix range
+        self.is_prefix = self.key == f'{self.prefix}*'
+
+        if ':' in self.prefix:
+            self.service = self.prefix.split(':', 1)[0]
+        else:
+            self.service = None
+
+    def __repr__(self) -> str:
+        return f'ActionPattern({self.pattern!r})'
+
+    def match(self, action: str) -> bool:
+        ''' check if the pattern covers the given action '''
+        return self.regex.fullmatch(action.lower()) is not None
+
+    def ranges(self, catalog) -> list:
+        ''' returns every slice of the catalog which can contain a match '''
+        if self.service is not None or ':' not in self.key:
+            return [catalog.prefix_range(self.prefix)]
+
+        service_pattern, name = self.key.split(':', 1)
+        service_regex = _to_regex(service_pattern)
+        name_prefix = _literal_prefix(name)
+
+        return [
+            catalog.prefix_range(f'{service}:{name_prefix}')
+            for service in catalog.services
+            if service_regex.fullmatch(service)
+        ]
+
+    def resolve(self, catalog) -> tuple:
+        ''' returns the positions of all catalog actions covered by the
+        pattern
+        '''
+        return resolve(self, catalog)
+
+    def actions(self, catalog) -> tuple:
+        ''' returns all catalog actions covered by the pattern '''
+        return tuple(catalog.actions[index]
+                     for index in self.resolve(catalog))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_pattern(pattern: str) -> ActionPattern:
+    ''' compile an Action/NotAction pattern, the least recently used patterns
+    are evicted from the cache
+
+    Args:
+        pattern (str): an Action/NotAction item of a statement
+
+    Returns:
+        pattern (ActionPattern): the compiled pattern
+    '''
+    return ActionPattern(pattern)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def resolve(pattern: ActionPattern, catalog) -> tuple:
+    ''' resolve a compiled pattern against the per-service index of a
+    catalog
+
+    Args:
+        pattern (ActionPattern): the compiled pattern
+        catalog (ActionCatalog): the indexed known aws actions
+
+    Returns:
+        indexes (tuple): the sorted positions of all covered catalog actions
+    '''
+    logger.debug('resolve pattern %s', pattern.pattern)
+    indexes = []
+
+    for start, end in pattern.ranges(catalog):
+        if pattern.is_prefix:
+            indexes.extend(range(start, end))
+            continue
+
+        fullmatch = pattern.regex.fullmatch
+        indexes.extend(index for index in range(start, end)
+                       if fullmatch(catalog.keys[index]))
+
+    return tuple(indexes)
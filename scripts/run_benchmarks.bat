@@ -0,0 +1,3 @@
+@echo off
+
+python -m benchmarks.run %*
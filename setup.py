@@ -30,8 +30,8 @@ SETUP_OPTIONS = dict(
     long_description=open('README.md').read(),
     long_description_content_type='text/markdown',
     # url='link to github',
-    packages=find_packages(exclude=['tests']),
-    package_data={'scplint': ['data/*.txt', 'models/*.json']},
+    packages=find_packages(exclude=['tests', 'benchmarks']),
+    package_data={'scplint': ['data/*.txt', 'data/*.bin', 'models/*.json']},
     include_package_data=True,
     license=open('LICENSE.txt').read(),
     classifiers=[
@@ -35,3 +35,5 @@ def scp_valid_notaction():
             "Resource": "*"
         }]
     }
+
+    yield scp
@@ -0,0 +1,34 @@
+import json
+import sys
+
+import pytest
+
+from scplint.api import lint_policies
+
+
+def test_lint_policies(tmp_path, scp_valid_action):
+    path = tmp_path / 'scp.json'
+    path.write_text(json.dumps(scp_valid_action, indent=4))
+
+    reports = list(lint_policies([str(path), scp_valid_action,
+                                  ('named', scp_valid_action)]))
+
+    assert [report['file'] for report in reports] == [
+        str(path), 'policy_1', 'named']
+    assert all(report['summary']['errors'] == 0 for report in reports)
+
+
+def test_lint_policies_options(scp_valid_action):
+    report = next(lint_policies([scp_valid_action], {'detailed': True}))
+    assert 'details' in report
+
+    with pytest.raises(ValueError):
+        next(lint_policies([scp_valid_action], {'jobs': 2}))
+
+
+def test_import_cli(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['pytest', '--unknown'])
+
+    import scplint.cli
+
+    assert scplint.cli.build_parser().parse_args(['-i', 'x']).input == 'x'
@@ -0,0 +1,192 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from scplint import aws_actions
+from scplint.aws_actions import (EXPLICIT, UNKNOWN, WILDCARD, ActionCatalog,
+                                 AwsActions, CatalogError, MappedActionCatalog,
+                                 collect_actions, get_catalog, reset_catalog,
+                                 set_catalog, write_catalog_artifact)
+
+
+@pytest.fixture
+def catalog():
+    yield ActionCatalog([
+        'ec2:CreateVpc', 'ec2:DeleteVpc', 'ec2:DescribeVpcs', 's3:GetObject',
+        's3-outposts:GetObject'
+    ])
+
+
+def test_catalog_lookup(catalog):
+    assert 'ec2:createvpc' in catalog
+    assert catalog.get('EC2:CREATEVPC') == 'ec2:CreateVpc'
+    assert catalog.get('ec2:CreateSubnet') is None
+
+
+def test_catalog_classify(catalog):
+    assert catalog.classify('ec2:CreateVpc') == EXPLICIT
+    assert catalog.classify('ec2:Create*') == WILDCARD
+    assert catalog.classify('ec2:Create?pc') == WILDCARD
+    assert catalog.classify('ec2:CreateVcp') == UNKNOWN
+
+
+def test_catalog_ranges(catalog):
+    assert catalog.service_actions('s3') == ('s3:GetObject', )
+    assert catalog.wildcard_actions('ec2:De*') == ('ec2:DeleteVpc',
+                                                   'ec2:DescribeVpcs')
+    assert len(catalog.wildcard_actions('*')) == len(catalog)
+
+
+def test_catalog_immutable(catalog):
+    with pytest.raises(AttributeError):
+        catalog.keys = ()
+
+
+def test_catalog_from_data_file():
+    catalog = AwsActions().load_catalog()
+    assert 'ec2:CreateVpc' in catalog
+
+
+def test_catalog_singleton(catalog):
+    reset_catalog()
+    assert get_catalog() is get_catalog()
+
+    assert set_catalog(catalog) is catalog
+    assert get_catalog() is catalog
+
+    set_catalog(['s3:GetObject'])
+    assert len(get_catalog()) == 1
+
+    reset_catalog()
+    assert 'ec2:CreateVpc' in get_catalog()
+
+
+def test_catalog_artifact(catalog, tmp_path):
+    path = str(tmp_path / 'aws_actions.bin')
+    write_catalog_artifact(catalog, path, source='ab' * 20)
+    mapped = MappedActionCatalog(path)
+
+    assert mapped.version == catalog.version
+    assert mapped.source_digest == 'ab' * 20
+    assert list(mapped.actions) == list(catalog.actions)
+    assert mapped.services == catalog.services
+    assert mapped.get('EC2:DELETEVPC') == 'ec2:DeleteVpc'
+    assert 'ec2:CreateSubnet' not in mapped
+    assert mapped.wildcard_actions('ec2:De*') == ('ec2:DeleteVpc',
+                                                  'ec2:DescribeVpcs')
+
+
+def test_catalog_artifact_lookups(catalog, tmp_path):
+    path = str(tmp_path / 'aws_actions.bin')
+    write_catalog_artifact(catalog, path)
+    mapped = MappedActionCatalog(path)
+
+    assert list(mapped.keys) == list(catalog.keys)
+    for action in list(catalog.actions) + ['ec2:createvpcs', 'ec2:create',
+                                           'ec2:CreateVpc' * 10, 'ec3:x']:
+        assert mapped.index(action) == catalog.index(action)
+
+    for prefix in ('', 'ec', 'ec2', 'ec2:', 'ec2:de', 'ec2:deletevpc',
+                   'ec2:deletevpcs', 's3:', 'x'):
+        assert mapped.prefix_range(prefix) == catalog.prefix_range(prefix)
+
+
+def test_catalog_artifact_version(catalog, tmp_path):
+    path = tmp_path / 'aws_actions.bin'
+    write_catalog_artifact(catalog, str(path))
+    content = bytearray(path.read_bytes())
+    content[8] = 99
+    path.write_bytes(bytes(content))
+
+    with pytest.raises(CatalogError):
+        MappedActionCatalog(str(path))
+
+
+def test_catalog_artifact_invalid(catalog, tmp_path):
+    path = tmp_path / 'aws_actions.bin'
+    path.write_bytes(b'')
+
+    with pytest.raises(CatalogError):
+        MappedActionCatalog(str(path))
+
+    write_catalog_artifact(catalog, str(path))
+    path.write_bytes(path.read_bytes()[:-4])
+
+    with pytest.raises(CatalogError, match='truncated'):
+        MappedActionCatalog(str(path))
+
+
+def test_catalog_artifact_stale(tmp_path, monkeypatch):
+    source = tmp_path / 'aws_actions.txt'
+    source.write_text('ec2:CreateVpc\n')
+    monkeypatch.setattr(aws_actions, 'ACTIONS_FILE', str(source))
+    monkeypatch.setattr(aws_actions, 'CATALOG_FILE',
+                        str(tmp_path / 'aws_actions.bin'))
+    AwsActions().write_catalog()
+    assert isinstance(AwsActions().load_catalog(), MappedActionCatalog)
+
+    # an untouched text file isn't hashed
+    with monkeypatch.context() as patch:
+        patch.setattr(aws_actions, 'source_digest', None)
+        assert isinstance(AwsActions().load_catalog(), MappedActionCatalog)
+
+    # a touched but unchanged text file, e.g. of a fresh checkout
+    os.utime(source, ns=(1, 1))
+    assert isinstance(AwsActions().load_catalog(), MappedActionCatalog)
+
+    # an edit of the same size
+    source.write_text('ec2:DeleteVpc\n')
+    os.utime(source, ns=(1, 1))
+    catalog = AwsActions().load_catalog()
+    assert isinstance(catalog, ActionCatalog)
+    assert list(catalog.actions) == ['ec2:DeleteVpc']
+
+    (tmp_path / 'aws_actions.bin').write_bytes(b'')
+    assert isinstance(AwsActions().load_catalog(), ActionCatalog)
+
+
+def test_catalog_artifact_up_to_date():
+    catalog = AwsActions().load_catalog()
+
+    assert isinstance(catalog, MappedActionCatalog)
+    assert catalog.version == ActionCatalog(
+        AwsActions().get_aws_actions()).version
+
+
+def test_collect_actions(tmp_path):
+    model = {
+        'metadata': {'endpointPrefix': 'ec2'},
+        'operations': {'CreateVpc': {}, 'DeleteVpc': {}}
+    }
+    (tmp_path / 'ec2' / '2016-11-15').mkdir(parents=True)
+    (tmp_path / 'ec2' / '2016-11-15' / 'service-2.json').write_text(
+        json.dumps(model))
+
+    model = {
+        'metadata': {'endpointPrefix': 's3', 'signingName': 's3'},
+        'operations': {'GetObject': {}}
+    }
+    (tmp_path / 's3' / '2006-03-01').mkdir(parents=True)
+    with gzip.open(tmp_path / 's3' / '2006-03-01' / 'service-2.json.gz',
+                   'wt') as file:
+        json.dump(model, file)
+
+    (tmp_path / 'sqs' / '2012-11-05').mkdir(parents=True)
+    (tmp_path / 'sqs' / '2012-11-05' / 'service-2.json').write_text('{')
+
+    actions, manifest = collect_actions(str(tmp_path), {}, '1.0', workers=1)
+    assert actions == {'ec2:CreateVpc', 'ec2:DeleteVpc', 's3:GetObject'}
+    assert sorted(manifest['models']) == [
+        'ec2/2016-11-15/service-2.json', 's3/2006-03-01/service-2.json.gz'
+    ]
+
+    # unchanged models are taken from the manifest
+    manifest['models']['ec2/2016-11-15/service-2.json']['actions'] = ['x:y']
+    actions, _ = collect_actions(str(tmp_path), manifest, '1.0')
+    assert 'x:y' in actions
+
+    # a new botocore version parses every model again
+    actions, _ = collect_actions(str(tmp_path), manifest, '1.1')
+    assert 'x:y' not in actions
@@ -0,0 +1,50 @@
+import random
+
+from benchmarks.generate import generate_scp, generate_sources
+from benchmarks.run import STAGES, compare, load_catalog, run_shape
+from scplint.aws_actions import UNKNOWN, WILDCARD, get_catalog
+
+
+def test_generate_scp_is_seeded():
+    assert generate_sources(3, seed=1) == generate_sources(3, seed=1)
+    assert generate_sources(3, seed=1) != generate_sources(3, seed=2)
+
+
+def test_generate_scp_shape():
+    catalog = get_catalog()
+
+    scp = generate_scp(random.Random(0), statements=3, actions=5,
+                       wildcard_ratio=1, notaction_ratio=1,
+                       condition_density=1)
+    assert len(scp['Statement']) == 3
+    for statement in scp['Statement']:
+        assert 'Condition' in statement
+        assert len(statement['NotAction']) == 5
+        assert {catalog.classify(action)
+                for action in statement['NotAction']} == {WILDCARD}
+
+    scp = generate_scp(random.Random(0), statements=1, actions=5,
+                       wildcard_ratio=0, unknown_ratio=1, notaction_ratio=0)
+    assert {catalog.classify(action)
+            for action in scp['Statement'][0]['Action']} == {UNKNOWN}
+
+
+def test_run_shape_and_compare():
+    result = run_shape(generate_sources(2, seed=0), repeat=1)
+    assert set(result['stages']) == set(STAGES)
+    assert result['files'] == 2 and result['peak_memory'] > 0
+
+    slower = dict(result, stages={stage: seconds * 2 for stage, seconds
+                                  in result['stages'].items()},
+                  total=result['total'] * 2)
+    rows = compare({'shapes': {'small': result}},
+                   {'shapes': {'small': slower}})
+    assert rows and all(row[-1] for row in rows)
+
+
+def test_load_catalog():
+    mapped, seconds = load_catalog('mapped', repeat=1)
+    memory, _ = load_catalog('memory', repeat=1)
+
+    assert seconds > 0
+    assert mapped.version == memory.version
@@ -0,0 +1,50 @@
+import json
+import os
+
+from scplint.cache import ResultCache
+from scplint.run_checks import lint_file
+
+
+def test_cache_key(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = cache.key('{}', {'minimize': True})
+
+    assert key == cache.key('{}', {'minimize': True})
+    assert key != cache.key('{}', {'minimize': False})
+    assert key != cache.key('{ }', {'minimize': True})
+
+
+def test_cache_get_set(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = cache.key('{}', {})
+
+    assert cache.get(key) is None
+    cache.set(key, {'file': 'scp.json'})
+    assert cache.get(key) == {'file': 'scp.json'}
+
+
+def test_cache_evict(tmp_path):
+    cache = ResultCache(str(tmp_path), max_size=100)
+
+    for index in range(10):
+        key = cache.key(str(index), {})
+        cache.set(key, {'index': index})
+        os.utime(cache._path(key), (index, index))
+
+    cache.evict()
+    assert cache.get(cache.key('0', {})) is None
+    assert cache.get(cache.key('9', {})) == {'index': 9}
+
+
+def test_lint_file_cache(tmp_path, scp_valid_action):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    path = tmp_path / 'scp.json'
+    path.write_text(json.dumps(scp_valid_action))
+    copy = tmp_path / 'copy.json'
+    copy.write_text(json.dumps(scp_valid_action))
+
+    report = lint_file(str(path), detailed=True, cache=cache)
+    assert lint_file(str(path), detailed=True, cache=cache) == report
+
+    report['file'] = str(copy)
+    assert lint_file(str(copy), detailed=True, cache=cache) == report
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+import scplint.checkers
+from scplint.checkers import (BUILTIN_CHECKERS, Checker, Selection,
+                              get_checkers)
+from scplint.cli import read_config
+from scplint.run_checks import lint_source
+
+
+class CheckTags():
+    MSGS = {'W901': {'rule': 'Tag', 'msg': 'tag'}}
+
+    def __init__(self, report):
+        report.add_warning(self.MSGS, 'W901', {})
+
+
+class EntryPoint():
+    name = 'check_tags'
+
+    def load(self):
+        return CheckTags
+
+
+def test_builtin_checker_codes():
+    codes = {checker.name: checker.codes for checker in BUILTIN_CHECKERS}
+    assert codes['check_schema'] == ('E000', 'E001')
+    assert codes['check_actions'] == ('I201', 'W201')
+
+
+def test_selection():
+    selection = Selection(select='E0, E1,w1', ignore=['E001'])
+    assert selection.select == ('E0', 'E1', 'W1')
+    assert selection('E000') and selection('W101')
+    assert not selection('E001') and not selection('W201')
+    assert [checker.name for checker in selection.checkers()] == [
+        'check_schema', 'check_limits']
+
+    assert not Selection()
+    assert Selection().options() == {}
+
+
+def test_lint_selection(scp_valid_action):
+    scp_valid_action['Statement'][0]['Action'].append('ec2:Unknown')
+    raw = json.dumps(scp_valid_action)
+
+    assert lint_source(raw)['summary']['warnings'] == 1
+
+    result = lint_source(raw, selection=Selection(ignore='W2'),
+                         detailed=True, profile=True)
+    assert result['summary']['warnings'] == 0
+    assert 'check_actions' in result['profile']['checkers']
+
+    result = lint_source(raw, selection=Selection(select='E'),
+                         detailed=True, profile=True)
+    assert result['summary']['warnings'] == 0
+    assert set(result['profile']['checkers']) == {'check_schema',
+                                                  'check_limits'}
+
+
+def test_entry_points(monkeypatch, scp_valid_action):
+    monkeypatch.setattr(scplint.checkers, '_entry_points',
+                        lambda: [EntryPoint()])
+    get_checkers.cache_clear()
+
+    try:
+        assert get_checkers()[-1] == Checker('check_tags', CheckTags,
+                                             ('W901', ))
+        result = lint_source(json.dumps(scp_valid_action))
+        assert result['summary']['warnings'] == 1
+    finally:
+        get_checkers.cache_clear()
+
+
+def test_read_config(tmp_path):
+    path = tmp_path / 'setup.cfg'
+    path.write_text('[scplint]\nselect = E0,E1\n')
+    assert read_config(str(path)) == {'select': 'E0,E1'}
+
+    path.write_text('[flake8]\nmax-line-length=79\n')
+    assert read_config(str(path)) == {}
+
+
+def test_read_config_broken(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'setup.cfg').write_text('[scplint]\nselect = E\nselect = W\n')
+    (tmp_path / 'tox.ini').write_text('[scplint]\nignore = O3\n')
+
+    assert read_config() == {'ignore': 'O3'}
+
+    with pytest.raises(ValueError, match='setup.cfg'):
+        read_config('setup.cfg')
+
+    (tmp_path / 'setup.cfg').write_text('select = E\n')
+    assert read_config() == {'ignore': 'O3'}
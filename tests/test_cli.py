@@ -0,0 +1,105 @@
+import json
+import logging
+
+import pytest
+
+from scplint.cli import lint_files, main, stream_report
+from scplint.report import create_summary, new_summary
+
+
+@pytest.fixture
+def scp_files(tmp_path, scp_valid_action, scp_valid_notaction):
+    invalid = {'Version': '2012-10-17',
+               'Statement': [{'Effect': 'Maybe', 'Action': 'ec2:*',
+                              'Resource': '*'}]}
+    paths = []
+
+    for index, scp in enumerate([scp_valid_action, invalid,
+                                 scp_valid_notaction, scp_valid_action]):
+        path = tmp_path / f'scp_{index}.json'
+        path.write_text(json.dumps(scp))
+        paths.append(str(path))
+
+    yield paths
+
+
+@pytest.fixture
+def run_main(capsys):
+    ''' run the cli, returns the exit code, stdout and stderr '''
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+
+    def run(argv: list) -> tuple:
+        try:
+            main(argv)
+            code = 0
+        except SystemExit as error:
+            code = error.code
+
+        captured = capsys.readouterr()
+        return code, captured.out, captured.err
+
+    yield run
+
+    # main configures the root logger
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_lint_files_jobs(scp_files):
+    args = {'no_cache': True, 'detailed': True}
+    serial = list(lint_files(scp_files, dict(args, jobs=1)))
+    parallel = list(lint_files(scp_files, dict(args, jobs=2)))
+
+    assert [result['file'] for result in parallel] == scp_files
+    assert parallel == serial
+
+    report = create_summary(parallel)
+    assert report['summary'] == create_summary(serial)['summary']
+    assert report['summary']['errors'] > 0
+    assert serial[1]['summary']['errors'] > 0
+
+
+def test_main_jobs(scp_files, tmp_path, run_main):
+    pattern = str(tmp_path / '*.json')
+    serial = run_main(['-i', pattern, '-o', 'ndjson', '--no-cache'])
+    parallel = run_main(['-i', pattern, '-o', 'ndjson', '--no-cache',
+                         '-j', '2'])
+
+    assert serial[0] == parallel[0] == 1
+    assert serial[1] == parallel[1]
+
+
+def test_stream_report(capsys):
+    results = [{'file': f'scp_{index}.json',
+                'summary': dict(new_summary(), warnings=index)}
+               for index in range(3)]
+
+    summary = stream_report(iter(results))
+    lines = capsys.readouterr().out.splitlines()
+
+    assert [json.loads(line) for line in lines[:-1]] == results
+    assert json.loads(lines[-1]) == {'file_count': 3, 'summary': summary}
+    assert summary == dict(new_summary(), warnings=3)
+
+
+def test_main_ndjson(scp_files, tmp_path, run_main):
+    code, out, err = run_main(['-i', str(tmp_path / '*.json'), '-o',
+                               'ndjson', '--no-cache', '-v'])
+    records = [json.loads(line) for line in out.splitlines()]
+
+    # the verbose log goes to stderr
+    assert 'check file' in err
+    assert sorted(record['file'] for record in records[:-1]) == scp_files
+    assert records[-1]['file_count'] == len(scp_files)
+    assert records[-1]['summary'] == create_summary(records[:-1])['summary']
+    assert records[-1]['summary']['errors'] > 0
+    assert code == 1
+
+    code, out, _ = run_main(['-i', scp_files[0], '-o', 'ndjson',
+                             '--no-cache'])
+    records = [json.loads(line) for line in out.splitlines()]
+
+    assert len(records) == 2
+    assert records[-1]['summary']['errors'] == 0
+    assert code == 0
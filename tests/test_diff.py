@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from scplint.aws_actions import ActionCatalog
+from scplint.cli import diff_report
+from scplint.diff import (diff_paths, diff_policies, is_changed,
+                          match_statements)
+
+
+@pytest.fixture
+def catalog():
+    yield ActionCatalog([
+        'ec2:CreateVpc', 'ec2:DeleteVpc', 'ec2:DescribeVpcs',
+        's3:DeleteBucket', 's3:GetObject', 'sqs:DeleteQueue'
+    ])
+
+
+@pytest.fixture
+def scp():
+    yield {
+        'Version': '2012-10-17',
+        'Statement': [
+            {'Sid': 'Allow', 'Effect': 'Allow', 'Action': '*',
+             'Resource': '*'},
+            {'Effect': 'Deny', 'Action': ['ec2:DeleteVpc', 's3:DeleteBucket',
+                                          'sqs:DeleteQueue'],
+             'Resource': '*'}
+        ]
+    }
+
+
+def test_diff_equivalent(catalog, scp):
+    new = {**scp, 'Statement': [
+        {'Effect': 'Deny', 'Action': '*:Delete*', 'Resource': '*'},
+        {'Sid': 'Allow', 'Effect': 'Allow', 'Action': '*', 'Resource': '*'}
+    ]}
+    diff = diff_policies(scp, new, catalog, minimize=True)
+
+    assert diff['statements'] == []
+    assert diff['size']['delta'] < 0
+    assert not diff['denied']['added'] and not diff['denied']['removed']
+
+
+def test_diff_statements(catalog, scp):
+    new = {**scp, 'Statement': [
+        {'Sid': 'Allow', 'Effect': 'Allow', 'Action': '*', 'Resource': '*'},
+        {'Effect': 'Deny', 'NotAction': ['ec2:*', 's3:*'], 'Resource': '*'}
+    ]}
+    diff = diff_policies(scp, new, catalog)
+
+    assert diff['denied'] == {'added': [],
+                              'removed': ['ec2:DeleteVpc', 's3:DeleteBucket']}
+    assert diff['allowed']['added'] == ['ec2:DeleteVpc', 's3:DeleteBucket']
+    assert diff['statements'] == [{
+        'statement': 1, 'effect': 'Deny', 'status': 'changed', 'added': [],
+        'removed': ['ec2:DeleteVpc', 's3:DeleteBucket']}]
+    assert is_changed(diff)
+
+
+def test_diff_new_policy(catalog, scp):
+    diff = diff_policies({}, scp, catalog)
+
+    assert diff['size']['old'] == 0
+    assert [statement['status'] for statement in diff['statements']] == [
+        'added', 'added']
+
+
+@pytest.mark.parametrize('minimize', [False, True])
+def test_diff_single_statement(catalog, scp, minimize):
+    new = {**scp, 'Statement': scp['Statement'][1]}
+    diff = diff_policies(scp, new, catalog, minimize)
+
+    assert 0 < diff['size']['new'] < diff['size']['old']
+    assert diff['allowed']['removed'] == ['ec2:CreateVpc', 'ec2:DescribeVpcs',
+                                          's3:GetObject']
+    assert diff['denied'] == {'added': [], 'removed': []}
+
+
+def test_match_duplicate_sids():
+    old = [{'Sid': 'Deny', 'Action': 'a'}, {'Sid': 'Deny', 'Action': 'b'},
+           {'Sid': ['Invalid'], 'Action': 'c'}]
+    new = [{'Sid': 'Deny', 'Action': 'a'}, {'Sid': ['Invalid'], 'Action': 'c'}]
+
+    assert match_statements(old, new) == [
+        ('Deny', old[0], new[0]), ('Deny (2)', old[1], None),
+        ('["Invalid"]', old[2], new[1])]
+
+
+def test_diff_paths(tmp_path, scp):
+    for side in ('old', 'new'):
+        (tmp_path / side / 'ou').mkdir(parents=True)
+        (tmp_path / side / 'ou' / 'scp.json').write_text(json.dumps(scp))
+    (tmp_path / 'new' / 'added.json').write_text(json.dumps(scp))
+
+    old, new = str(tmp_path / 'old'), str(tmp_path / 'new')
+    assert diff_paths(old, new) == [
+        (None, str(tmp_path / 'new' / 'added.json')),
+        (str(tmp_path / 'old' / 'ou' / 'scp.json'),
+         str(tmp_path / 'new' / 'ou' / 'scp.json'))]
+
+
+def test_diff_report_errors(tmp_path, scp):
+    for side in ('old', 'new'):
+        (tmp_path / side).mkdir()
+        (tmp_path / side / 'broken.json').write_text('{')
+        (tmp_path / side / 'scp.json').write_text(json.dumps(scp))
+    (tmp_path / 'new' / 'added.json').write_text(json.dumps(scp))
+
+    report = diff_report({'diff': [str(tmp_path / 'old'),
+                                   str(tmp_path / 'new')],
+                          'output': 'json'})
+
+    assert report['summary']['files'] == 3
+    assert report['summary']['errors'] == 1
+    assert report['summary']['changed'] == 1
+    assert 'error' in report['details'][1]
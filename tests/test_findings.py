@@ -0,0 +1,52 @@
+from scplint.checkers.check_actions import CheckActions
+from scplint.checkers.check_recommendations import CheckRecommendations
+from scplint.findings import Finding
+from scplint.report import Report
+from scplint.scp import SCP
+
+MSGS = {'W999': {'rule': 'Test', 'msg': 'Action {action} is {state}.'}}
+
+
+def test_finding_render():
+    finding = Finding(MSGS, 'W999', {'action': 'ec2:Foo', 'state': 'bad'},
+                      {'line': 3, 'column': 7})
+
+    assert finding['msg'] == 'Action ec2:Foo is bad.'
+    assert finding.to_dict() == {'rule': 'Test', 'code': 'W999', 'line': 3,
+                                 'column': 7, 'msg': 'Action ec2:Foo is bad.'}
+    assert 'code' not in MSGS['W999']
+
+
+def test_findings_grouped():
+    statements = [{'Effect': 'Deny', 'Resource': '*',
+                   'Action': ['ec2:DeleteVpc', 'ec2:CreateVpc']}
+                  for _ in range(20)]
+    report = Report(SCP({'Version': '2012-10-17', 'Statement': statements}))
+    CheckRecommendations(report)
+
+    # without a source, findings of different statements keep their path
+    assert len(report.recommendations) == 20
+    assert report.recommendations[3].to_dict() == {
+        'rule': 'Action unsorted', 'msg': 'Actions are unsorted.',
+        'code': 'O301', 'path': ['Statement', 3, 'Action']}
+
+    details = {'action': 'ec2:Foo', 'state': 'bad'}
+    for _ in range(2):
+        report.add_warning(MSGS, 'W999', details, ('Statement', 0, 'Action'))
+
+    assert report.warnings[0]['count'] == 2
+    assert report.get_report()['summary']['recommendations'] == 20
+    assert report.get_report()['summary']['warnings'] == 2
+
+
+def test_findings_cap():
+    actions = [f'ec2:Unknown{index}' for index in range(10)]
+    scp = {'Version': '2012-10-17', 'Statement': [
+        {'Effect': 'Deny', 'Resource': '*', 'Action': actions}]}
+    report = Report(SCP(scp), max_findings=3)
+    CheckActions(report)
+    detailed = report.get_report_detailed()
+
+    assert len(detailed['details']['warnings']) == 3
+    assert detailed['details']['suppressed'] == {'W201': 7}
+    assert detailed['summary']['warnings'] == 10
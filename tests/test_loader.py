@@ -0,0 +1,53 @@
+import pytest
+
+from scplint.loader import load_policy, set_json_backend
+
+RAW = '''{
+    "Version": "2012-10-17",
+    "Statement": [{
+        "Effect": "Deny",
+        "Action": ["ec2:*", "s3:GetObject"],
+        "Resource": "*",
+        "Resource": "*"
+    }],
+    "Version": "2012-10-17"
+}'''
+
+
+def test_load_policy():
+    policy = load_policy('{"Version": "2012-10-17", "Statement": []}')
+
+    assert policy.scp == {'Version': '2012-10-17', 'Statement': []}
+    assert policy.duplicates == []
+
+
+def test_duplicates():
+    policy = load_policy(RAW)
+
+    assert [(item['key'], item['line'], item['column'])
+            for item in policy.duplicates] == [('Resource', 7, 9),
+                                               ('Version', 9, 5)]
+    assert policy.duplicates[0]['path'] == ('Statement', 0)
+
+
+def test_source_spans():
+    source = load_policy(RAW).source
+
+    assert source.span(('Statement', 0)) == (3, 19, 8, 6)
+    assert source.location(('Statement', 0, 'Action', 1)) == {
+        'line': 5,
+        'column': 29
+    }
+    assert source.location(('Statement', 1)) is None
+
+
+def test_orjson_backend():
+    pytest.importorskip('orjson')
+    set_json_backend('orjson')
+
+    try:
+        policy = load_policy(RAW)
+        assert len(policy.duplicates) == 2
+        assert load_policy('{"a": ["b:"]}').duplicates == []
+    finally:
+        set_json_backend('json')
@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from scplint.aws_actions import ActionCatalog, get_catalog
+from scplint.checkers.check_recommendations import CheckRecommendations
+from scplint.optimizers.optimize_actions import (compress_actions,
+                                                 optimize_policy,
+                                                 optimize_statement)
+from scplint.report import Report
+from scplint.scp import SCP
+from scplint.size import json_size
+from scplint.wildcards import compile_pattern
+
+
+@pytest.fixture
+def catalog():
+    yield ActionCatalog([
+        'ec2:DeleteSubnet', 'ec2:DeleteVpc', 'ec2:DeleteVpcEndpoints',
+        'ec2:DeleteVpcPeeringConnection', 'ec2:DeleteVpnGateway',
+        'ec2:DescribeVpcs', 's3:GetObject', 's3:GetObjectAcl',
+        's3:GetObjectTagging'
+    ])
+
+
+def covered(actions: list, catalog) -> set:
+    indexes = set()
+
+    for action in actions:
+        if '*' in action:
+            indexes.update(compile_pattern(action).resolve(catalog))
+        elif catalog.index(action) is not None:
+            indexes.add(catalog.index(action))
+
+    return indexes
+
+
+def test_compress_exact(catalog):
+    actions = ['ec2:DeleteVpc', 'ec2:DeleteVpcEndpoints',
+               'ec2:DeleteVpcPeeringConnection', 's3:GetObject',
+               'foo:Bar']
+    result = compress_actions(actions, catalog)
+
+    assert result.actions == ['ec2:DeleteVpc*', 'foo:Bar', 's3:GetObject']
+    assert result.patterns == {'ec2:DeleteVpc*': [
+        'ec2:DeleteVpc', 'ec2:DeleteVpcEndpoints',
+        'ec2:DeleteVpcPeeringConnection']}
+    assert result.over_grant == []
+    assert result.saved > 0
+
+
+def test_compress_keeps_wildcards(catalog):
+    actions = ['s3:GetObject*', 's3:GetObjectAcl', 'ec2:DeleteVpc']
+    result = compress_actions(actions, catalog)
+
+    assert result.actions == ['ec2:DeleteVpc', 's3:GetObject*']
+    assert result.patterns == {}
+
+
+def test_compress_budget(catalog):
+    actions = ['ec2:DeleteSubnet', 'ec2:DeleteVpc', 'ec2:DeleteVpcEndpoints',
+               'ec2:DeleteVpcPeeringConnection']
+
+    assert compress_actions(actions, catalog).actions == [
+        'ec2:DeleteSubnet', 'ec2:DeleteVpc*']
+
+    result = compress_actions(actions, catalog, budget=1)
+    assert result.actions == ['ec2:Del*']
+    assert result.over_grant == ['ec2:DeleteVpnGateway']
+
+
+def test_compress_catalog_equivalence():
+    catalog = get_catalog()
+    rng = random.Random(0)
+    start, end = catalog.service_range('ec2')
+    pool = list(catalog.actions[start:end])
+
+    for _ in range(10):
+        actions = rng.sample(pool, rng.randint(2, len(pool)))
+        result = compress_actions(actions, catalog)
+        assert covered(result.actions, catalog) == covered(actions, catalog)
+
+        result = compress_actions(actions, catalog, budget=5)
+        extra = covered(result.actions, catalog) - covered(actions, catalog)
+        assert covered(actions, catalog) <= covered(result.actions, catalog)
+        assert sorted(catalog.actions[index] for index in extra) == \
+            result.over_grant
+        assert len(extra) <= 5
+
+
+def test_optimize_notaction_without_budget(catalog):
+    statement = {'Effect': 'Deny', 'NotAction': [
+        'ec2:DeleteSubnet', 'ec2:DeleteVpc', 'ec2:DeleteVpcEndpoints',
+        'ec2:DeleteVpcPeeringConnection']}
+    optimized, saved, over_grant = optimize_statement(statement, catalog,
+                                                      budget=1)
+
+    assert optimized['NotAction'] == ['ec2:DeleteSubnet', 'ec2:DeleteVpc*']
+    assert saved > 0
+    assert over_grant == []
+
+
+def test_optimize_policy(catalog):
+    scp = {'Statement': {'Effect': 'Deny', 'Resource': '*',
+                         'Action': ['s3:GetObject', 's3:GetObjectAcl',
+                                    's3:GetObjectTagging']}}
+    policy, saved, _ = optimize_policy(scp, catalog)
+
+    # the catalog has no other s3 action
+    assert policy['Statement']['Action'] == ['s3:*']
+    assert saved == json_size(scp) - json_size(policy)
+
+
+def test_recommend_wildcard():
+    scp = {'Version': '2012-10-17', 'Statement': [{
+        'Effect': 'Deny', 'Resource': '*',
+        'Action': ['ec2:DeleteVpcEndpointConnectionNotifications',
+                   'ec2:DeleteVpcEndpointServiceConfigurations',
+                   'ec2:DeleteVpcEndpoints']}]}
+    report = Report(SCP(scp))
+    CheckRecommendations(report)
+
+    codes = [msg['code'] for msg in report.recommendations]
+    assert codes == ['O303']
+    assert 'ec2:DeleteVpcE*' in report.recommendations[0]['msg']
+    assert report.recommendations[0].details == {
+        'count': 3, 'pattern': 'ec2:DeleteVpcE*'}
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from scplint.aws_actions import ActionCatalog
+from scplint.organization import Organization, load_organization
+
+
+@pytest.fixture
+def catalog():
+    yield ActionCatalog([
+        'ec2:CreateVpc', 'ec2:DeleteVpc', 'ec2:DescribeVpcs',
+        's3:DeleteBucket', 's3:GetObject', 'sqs:DeleteQueue'
+    ])
+
+
+@pytest.fixture
+def policies():
+    yield {
+        'FullAWSAccess': {'Statement': [
+            {'Effect': 'Allow', 'Action': '*', 'Resource': '*'}]},
+        'DenyDelete': {'Statement': [
+            {'Effect': 'Deny', 'Action': '*:Delete*', 'Resource': '*'}]},
+        'Ec2Only': {'Statement': [
+            {'Effect': 'Allow', 'Action': 'ec2:*', 'Resource': '*'}]}
+    }
+
+
+@pytest.fixture
+def nodes():
+    yield {
+        'Root': {'policies': ['FullAWSAccess']},
+        'Workloads': {'parent': 'Root',
+                      'policies': ['FullAWSAccess', 'DenyDelete']},
+        '111111111111': {'parent': 'Workloads', 'policies': ['Ec2Only']}
+    }
+
+
+def test_effective_permissions(catalog, policies, nodes):
+    organization = Organization(policies, nodes, catalog)
+    report = organization.report()['nodes']
+
+    assert report['Root']['allowed'] == 6
+    assert report['Workloads']['unreachable_actions'] == [
+        'ec2:DeleteVpc', 's3:DeleteBucket', 'sqs:DeleteQueue']
+    assert report['111111111111']['path'] == ['Root', 'Workloads',
+                                              '111111111111']
+    assert report['111111111111']['allowed'] == 2
+
+
+def test_widened(catalog, policies, nodes):
+    baseline = Organization(policies, nodes, catalog)
+    nodes['Workloads']['policies'] = ['FullAWSAccess']
+    report = Organization(policies, nodes, catalog).report(baseline)
+
+    assert report['nodes']['111111111111']['widened_actions'] == [
+        'ec2:DeleteVpc']
+    assert report['nodes']['Workloads']['widened'] == 3
+    assert report['summary']['widened'] == 2
+
+
+def test_invalid(catalog, policies, nodes):
+    nodes['Root']['parent'] = '111111111111'
+    with pytest.raises(ValueError, match='own ancestor'):
+        Organization(policies, nodes, catalog)
+
+    nodes['Root'] = {'policies': ['Unknown']}
+    with pytest.raises(ValueError, match='unknown policy'):
+        Organization(policies, nodes, catalog)
+
+
+def test_load_organization(tmp_path, catalog, policies, nodes):
+    (tmp_path / 'deny_delete.json').write_text(
+        json.dumps(policies['DenyDelete']))
+    policies['DenyDelete'] = 'deny_delete.json'
+    path = tmp_path / 'org.json'
+    path.write_text(json.dumps({'policies': policies, 'nodes': nodes}))
+
+    organization = load_organization(str(path), catalog)
+    assert organization.report()['nodes']['Workloads']['allowed'] == 3
+
+
+@pytest.mark.parametrize('content', [
+    'nodes: [Root',
+    'nodes: {Root: [FullAWSAccess]}',
+    'nodes: {Root: {policies: FullAWSAccess}}',
+    'nodes: [Root]'
+])
+def test_load_organization_invalid(tmp_path, catalog, content):
+    path = tmp_path / 'org.yaml'
+    path.write_text(content)
+
+    with pytest.raises(ValueError):
+        load_organization(str(path), catalog)
@@ -0,0 +1,63 @@
+import pytest
+
+from scplint.aws_actions import ActionCatalog, reset_catalog
+from scplint.diff import _coverage, coverage
+from scplint.optimizers.optimize_actions import _service_keys, compress_actions
+from scplint.permissions import Permissions, item_bits, popcount
+from scplint.suggestions import get_suggester
+from scplint.wildcards import compile_pattern, resolve
+
+
+@pytest.fixture
+def catalog():
+    yield ActionCatalog([
+        'ec2:CreateVpc', 'ec2:DeleteVpc', 'ec2:DescribeVpcs',
+        's3:DeleteBucket', 's3:GetObject', 'sqs:DeleteQueue'
+    ])
+
+
+def test_item_bits(catalog):
+    assert popcount(item_bits('ec2:*', catalog)) == 3
+    assert popcount(item_bits('*:Delete*', catalog)) == 3
+    assert item_bits('ec2:DeleteVpc', catalog) == 1 << catalog.index(
+        'ec2:DeleteVpc')
+    assert item_bits('ec2:Unknown', catalog) == 0
+
+
+def test_catalog_caches_cleared(catalog):
+    caches = (item_bits, resolve, get_suggester, _service_keys, _coverage)
+    item_bits('ec2:*', catalog)
+    resolve(compile_pattern('*:Delete*'), catalog)
+    get_suggester(catalog).suggest('ec2:DeleteVp')
+    compress_actions(['ec2:CreateVpc', 'ec2:DeleteVpc'], catalog)
+    coverage({'Action': 'ec2:*'}, catalog)
+    assert all(cache.cache_info().currsize for cache in caches)
+
+    reset_catalog()
+    assert not any(cache.cache_info().currsize for cache in caches)
+
+
+def test_permissions_notaction(catalog):
+    scp = {'Statement': [
+        {'Effect': 'Allow', 'Action': '*', 'Resource': '*'},
+        {'Effect': 'Deny', 'NotAction': ['ec2:*', 's3:GetObject'],
+         'Resource': '*'}
+    ]}
+    permissions = Permissions(scp, catalog)
+
+    assert permissions.actions(permissions.allowed) == [
+        'ec2:CreateVpc', 'ec2:DeleteVpc', 'ec2:DescribeVpcs', 's3:GetObject']
+    assert permissions.actions(permissions.denied) == ['s3:DeleteBucket',
+                                                       'sqs:DeleteQueue']
+
+
+def test_permissions_counts(catalog):
+    scp = {'Statement': [
+        {'Effect': 'Allow', 'Action': ['ec2:*', 's3:*'], 'Resource': '*'},
+        {'Effect': 'Deny', 'Action': 'ec2:Delete*', 'Resource': '*'},
+        {'Effect': 'Deny', 'Action': 's3:Delete*', 'Resource': '*',
+         'Condition': {'Bool': {'aws:MultiFactorAuthPresent': 'false'}}}
+    ]}
+
+    assert Permissions(scp, catalog).counts() == {
+        'covered': 5, 'allowed': 4, 'denied': 1, 'limited': 1}
@@ -0,0 +1,38 @@
+import json
+
+from scplint.profiling import Profile, add_profile
+from scplint.report import create_summary
+from scplint.run_checks import lint_source
+
+
+def test_profile():
+    profile = Profile()
+
+    with profile.measure('check'):
+        profile.count('lookups', 2)
+    profile.count('lookups')
+
+    result = profile.to_dict()
+    assert set(result['checkers']['check']) == {'wall', 'cpu'}
+    assert result['counters'] == {'lookups': 3}
+
+    total = {}
+    add_profile(total, result)
+    add_profile(total, result)
+    assert total['counters'] == {'lookups': 6}
+
+
+def test_lint_source_profile(scp_valid_action):
+    raw = json.dumps(scp_valid_action, indent=4)
+
+    result = lint_source(raw, detailed=True, profile=True)
+    assert set(result['profile']['checkers']) == {
+        'check_schema', 'check_limits', 'check_actions',
+        'check_recommendations'}
+    assert result['profile']['counters']['catalog_lookups'] == 4
+
+    assert 'profile' not in lint_source(raw)
+    assert 'profile' not in lint_source(raw, profile=True)
+
+    summary = create_summary([result, result])['summary']
+    assert summary['profile']['counters']['catalog_lookups'] == 8
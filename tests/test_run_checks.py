@@ -0,0 +1,31 @@
+import json
+
+from scplint.checkers import check_schema
+from scplint.run_checks import init_worker, lint_file, lint_policy
+
+
+def test_lint_file(tmp_path, scp_valid_action):
+    path = tmp_path / 'scp.json'
+    path.write_text(json.dumps(scp_valid_action, indent=4))
+    init_worker()
+
+    report = lint_file(str(path))
+    assert report['file'] == str(path)
+    assert 'details' not in report
+
+    report = lint_file(str(path), minimize=True, detailed=True)
+    assert report['size'] < len(path.read_text())
+    assert report['summary']['errors'] == 0
+
+
+def test_lint_policy(scp_valid_action):
+    report = lint_policy(scp_valid_action, 'named', detailed=True)
+    assert report['file'] == 'named'
+    assert report['summary']['errors'] == 0
+
+
+def test_init_worker():
+    check_schema.get_validator.cache_clear()
+    init_worker()
+
+    assert check_schema.get_validator.cache_info().currsize == 1
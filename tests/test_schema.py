@@ -83,3 +83,39 @@ def test_schemas():
             except ValidationError as error:
                 print(error)
                 pytest.fail(error)
+
+
+@pytest.mark.parametrize('statement', [
+    {'Effect': 'Deny', 'Action': 'ec2:*', 'Resource': '*'},
+    {'Sid': 'Deny', 'Effect': 'Deny', 'NotAction': ['ec2:*'],
+     'Resource': ['*']},
+    {'Effect': 'Deny', 'Action': 'ec2:*', 'Resource': '*',
+     'Condition': {'ForAnyValue:StringNotLikeIfExists': {'a': 'b'},
+                   'Null': {'a': 'true'}}},
+    {'Effect': 'Deny', 'Action': 'ec2:*', 'Resource': '*',
+     'Condition': {'StringLikeX': {'a': 'b'}}},
+    {'Effect': 'Deny', 'Action': 'ec2:*', 'Resource': '*',
+     'Condition': {'Bool': 'true'}},
+    {'Effect': 'Deny', 'Action': 'ec2:*', 'NotAction': 'ec2:*',
+     'Resource': '*'},
+    {'Effect': 'Deny', 'Resource': '*'},
+    {'Effect': 'Deny', 'Action': 'ec2:*'},
+    {'Effect': 'Block', 'Action': 'ec2:*', 'Resource': '*'},
+    {'Effect': 'Deny', 'Action': 1, 'Resource': '*'},
+    {'Effect': 'Deny', 'Action': 'ec2:*', 'Resource': '*', 'Principal': '*'},
+    {'Sid': 1, 'Effect': 'Deny', 'Action': 'ec2:*', 'Resource': '*'},
+])
+def test_fast_schema_check(statement):
+    from scplint.checkers.check_schema import get_validator, is_valid_scp
+
+    scp = {'Version': '2012-10-17', 'Statement': [statement]}
+    assert is_valid_scp(scp) == get_validator().is_valid(scp)
+
+
+def test_fast_schema_check_policy():
+    from scplint.checkers.check_schema import get_validator, is_valid_scp
+
+    for scp in [{}, {'Version': '2012-10-17', 'Statement': []},
+                {'Version': '2012-10-16', 'Statement': [{}]},
+                {'Version': '2012-10-17', 'Statement': {}, 'Id': 'x'}]:
+        assert is_valid_scp(scp) == get_validator().is_valid(scp)
@@ -0,0 +1,106 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from scplint.cli import lint_remote
+from scplint.server import (LintRequestHandler, handle_lint, is_loopback,
+                            parse_address, request_lint, serve)
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), LintRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield 'http://{}:{}'.format(*server.server_address)
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_parse_address():
+    assert parse_address('9000') == ('127.0.0.1', 9000)
+    assert parse_address('0.0.0.0:9000') == ('0.0.0.0', 9000)
+
+
+def test_handle_lint(scp_valid_action):
+    response = handle_lint({
+        'policies': [{'file': 'scp.json', 'policy': scp_valid_action}],
+        'options': {'detailed': True}
+    })
+    report = json.loads(response['body'])
+
+    assert response['statusCode'] == '200'
+    assert report['files'] == ['scp.json']
+    assert 'details' in report['details'][0]
+
+
+def test_handle_lint_errors():
+    assert handle_lint({'policies': [{}]})['statusCode'] == '400'
+    assert handle_lint({'paths': ['/does/not/exist.json']
+                        })['statusCode'] == '404'
+    assert handle_lint({'options': []})['statusCode'] == '400'
+
+
+@pytest.mark.parametrize('statement', ['x', [1]])
+def test_handle_lint_internal_error(statement, caplog):
+    policy = {'Version': '2012-10-17', 'Statement': statement}
+    response = handle_lint({'policies': [{'policy': policy}]})
+
+    assert response['statusCode'] == '500'
+    assert 'unable to lint the request' in caplog.text
+
+
+def test_request_lint(tmp_path, scp_valid_action, server_url):
+    path = tmp_path / 'scp.json'
+    path.write_text(json.dumps(scp_valid_action))
+
+    report = request_lint(server_url, {'paths': [str(path)]})
+    assert report['files'] == [str(path)]
+
+
+def test_content_type(server_url):
+    request = Request(f'{server_url}/lint', data=b'{}',
+                      headers={'Content-Type': 'text/plain'})
+
+    with pytest.raises(HTTPError) as error:
+        urlopen(request)
+    assert error.value.code == 415
+
+
+@pytest.mark.parametrize('body, code', [
+    ({'options': []}, 400),
+    ({'policies': [{'policy': {'Statement': 'x'}}]}, 500)
+])
+def test_invalid_request(server_url, body, code):
+    request = Request(f'{server_url}/lint', data=json.dumps(body).encode(),
+                      headers={'Content-Type': 'application/json'})
+
+    with pytest.raises(HTTPError) as error:
+        urlopen(request, timeout=10)
+    assert error.value.code == code
+    assert 'message' in json.loads(error.value.read())
+
+
+def test_serve_loopback_only():
+    assert is_loopback('localhost') and is_loopback('127.0.0.2')
+    assert not is_loopback('0.0.0.0') and not is_loopback('example.com')
+
+    with pytest.raises(ValueError, match='loopback'):
+        serve('0.0.0.0:0')
+
+
+def test_lint_remote_errors(server_url, caplog):
+    args = {'server': server_url}
+
+    with pytest.raises(SystemExit):
+        lint_remote(['/does/not/exist.json'], args)
+    assert 'exist.json' in caplog.text
+
+    with pytest.raises(SystemExit):
+        lint_remote([], {'server': 'http://127.0.0.1:1'})
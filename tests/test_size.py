@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from scplint.checkers.check_limits import CheckLimits
+from scplint.report import Report
+from scplint.scp import SCP
+from scplint.size import PolicySize, json_size
+
+
+@pytest.fixture
+def scp():
+    yield {
+        'Version': '2012-10-17',
+        'Statement': [{
+            'Sid': 'Deny the config recorder',
+            'Effect': 'Deny',
+            'Action': ['config:DeleteConfigRule', 'config:StopRecorder*'],
+            'Resource': '*'
+        }, {
+            'Effect': 'Deny',
+            'NotAction': 'iam:*',
+            'Resource': '*',
+            'Condition': {'StringNotEquals': {'aws:PrincipalTag/team': 'a b'}}
+        }]
+    }
+
+
+def test_minimize_keeps_blanks_in_strings(scp):
+    minimized = SCP(scp).minimize()
+
+    assert '"Sid":"Deny the config recorder"' in minimized
+    assert json.loads(minimized) == scp
+    assert SCP(scp, minimize=True).size == len(minimized)
+
+
+def test_minimize_non_ascii(scp):
+    scp['Statement'][0]['Sid'] = 'Müller'
+    scp['Statement'][1]['Condition']['StringNotEquals'][
+        'aws:PrincipalTag/team'] = 'Zürich'
+    minimized = SCP(scp).minimize()
+
+    assert '"Sid":"Müller"' in minimized
+    assert json_size(scp) == len(minimized.encode('utf-8'))
+    assert SCP(scp, minimize=True).size == len(minimized) + 2
+
+
+def test_policy_size(scp):
+    sizes = PolicySize(scp)
+
+    assert sizes.total == json_size(scp)
+    assert sizes.statements == [json_size(statement)
+                                for statement in scp['Statement']]
+    assert sizes.largest(2) == [0, 1]
+
+    single = dict(scp, Statement=scp['Statement'][0])
+    assert PolicySize(single).total == json_size(single)
+    assert PolicySize({'Version': '2012-10-17'}).total == json_size(
+        {'Version': '2012-10-17'})
+
+
+def test_action_sizes(scp):
+    sizes = PolicySize(scp)
+    actions = sizes.action_sizes(0)
+
+    assert actions[0] == ('config:DeleteConfigRule',
+                          len('"config:DeleteConfigRule",'))
+    assert sizes.action_sizes(1, 'NotAction') == [('iam:*', 7)]
+
+    scp['Statement'][0]['Action'].pop(0)
+    assert json_size(scp) == sizes.total - actions[0][1]
+
+
+def test_size_delta(scp):
+    sizes = PolicySize(scp)
+    statement = dict(scp['Statement'][0], Sid='Short')
+    changed = dict(scp, Statement=[statement, scp['Statement'][1]])
+
+    assert sizes.total + sizes.delta(0, statement) == json_size(changed)
+    assert (sizes.total + sizes.delta(1, None)
+            == json_size(dict(scp, Statement=scp['Statement'][:1])))
+    assert (sizes.total + sizes.add_delta(statement)
+            == json_size(dict(scp, Statement=scp['Statement'] + [statement])))
+
+    assert sizes.update(0, statement) == json_size(changed)
+
+
+def test_largest_statement(scp):
+    report = Report(SCP(scp, size_max=100, minimize=True))
+    CheckLimits(report)
+
+    assert [error['code'] for error in report.errors] == ['E101']
+    assert report.infos[0]['code'] == 'I101'
+    assert ('Statement Deny the config recorder is the largest'
+            in report.infos[0]['msg'])
@@ -0,0 +1,67 @@
+import pytest
+
+from scplint.optimizers.split_policy import split_policy
+from scplint.size import json_size
+
+
+def deny(sid: str, count: int) -> dict:
+    return {'Sid': sid, 'Effect': 'Deny', 'Resource': '*',
+            'Action': [f'ec2:{sid}Action{index:03}' for index in range(count)]}
+
+
+@pytest.fixture
+def scp():
+    yield {
+        'Version': '2012-10-17',
+        'Statement': [
+            {'Sid': 'Allow', 'Effect': 'Allow', 'Action': '*',
+             'Resource': '*'},
+            deny('First', 40), deny('Second', 60), deny('Third', 30),
+            deny('Fourth', 20)
+        ]
+    }
+
+
+def denied(policies: list) -> list:
+    return sorted(action for policy in policies
+                  for statement in policy['Statement']
+                  if statement['Effect'] == 'Deny'
+                  for action in statement['Action'])
+
+
+def test_split_fits(scp):
+    assert split_policy(scp, size_max=json_size(scp)) == [scp]
+
+
+def test_split_statements(scp):
+    policies = split_policy(scp, size_max=3000)
+
+    assert len(policies) == 2
+    assert all(json_size(policy) <= 3000 for policy in policies)
+    assert denied(policies) == denied([scp])
+
+    # the Allow statements are part of every policy
+    assert all(policy['Statement'][0]['Sid'] == 'Allow'
+               for policy in policies)
+    assert split_policy(scp, size_max=3000) == policies
+
+
+def test_split_actions(scp):
+    policies = split_policy(scp, size_max=1200, max_policies=10)
+
+    assert all(json_size(policy) <= 1200 for policy in policies)
+    assert denied(policies) == denied([scp])
+
+    sids = [statement['Sid'] for policy in policies
+            for statement in policy['Statement']]
+    assert 'SecondPart1' in sids and 'SecondPart2' in sids
+
+
+def test_split_limits(scp):
+    with pytest.raises(ValueError, match='only 1 are allowed'):
+        split_policy(scp, size_max=3000, max_policies=1)
+
+    scp['Statement'][1] = {'Effect': 'Deny', 'NotAction': ['s3:GetObject'],
+                           'Resource': '*', 'Sid': 'x' * 3000}
+    with pytest.raises(ValueError, match='no Action list'):
+        split_policy(scp, size_max=3000)
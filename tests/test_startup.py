@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import scplint
+
+# generous budgets for the imports of a single run in microseconds, they
+# only fail if a heavy dependency is imported on the start up path again
+IMPORT_BUDGET = {
+    'version': 200000,
+    'lint': 250000
+}
+LAZY_MODULES = ('botocore', 'jsonschema', 'yaml')
+
+RUN_CLI = 'import sys; from scplint.cli import main; sys.exit(main())'
+
+
+def import_times(*args) -> dict:
+    ''' returns the cumulative import time of every module imported by a
+    run of the cli
+    '''
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [os.path.dirname(os.path.dirname(scplint.__file__))]
+        + env.get('PYTHONPATH', '').split(os.pathsep))
+
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', RUN_CLI, *args],
+        capture_output=True, text=True, env=env, check=False)
+    assert process.returncode == 0, process.stderr
+
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, module = line.split('|')
+        times[module.rstrip()] = int(cumulative)
+
+    return times
+
+
+def top_level_time(times: dict) -> int:
+    return sum(time for module, time in times.items()
+               if not module.startswith('  '))
+
+
+def imported(times: dict) -> set:
+    return {module.strip().split('.')[0] for module in times}
+
+
+@pytest.mark.parametrize('name', ['version', 'lint'])
+def test_startup_import_time(name, tmp_path, scp_valid_action):
+    path = tmp_path / 'scp.json'
+    path.write_text(json.dumps(scp_valid_action, indent=4))
+    args = {
+        'version': ['--version'],
+        'lint': ['-i', str(path), '--no-cache']
+    }[name]
+
+    times = import_times(*args)
+
+    assert not imported(times) & set(LAZY_MODULES)
+    assert top_level_time(times) < IMPORT_BUDGET[name]
@@ -0,0 +1,55 @@
+from scplint.checkers.check_recommendations import CheckRecommendations
+from scplint.optimizers.subsumption import find_covered
+from scplint.report import Report
+from scplint.scp import SCP
+
+
+def test_find_covered():
+    items = ['ec2:Delete*', 'ec2:DeleteVpc', 'ec2:*', 's3:GetObject',
+             'ec2:*Vpc', 's3:*Object', 'ec2:*']
+    covered = find_covered([(action, index)
+                            for index, action in enumerate(items)])
+
+    # the broadest wildcard covers, a duplicate doesn't cover itself
+    assert covered == {2: [0, 1, 4], 5: [3]}
+
+
+def test_find_covered_no_substring():
+    items = [('ec2:Get*', 0), ('ec2:ForgetPassword', 1),
+             ('s3:GetObject', 2), ('*', 3)]
+
+    assert find_covered(items[:3]) == {}
+    assert find_covered(items) == {3: [0, 1, 2]}
+
+
+def recommendations(statements: list) -> list:
+    scp = {'Version': '2012-10-17', 'Statement': statements}
+    report = Report(SCP(scp), selection=lambda code: code == 'O304')
+    CheckRecommendations(report)
+    return [msg['msg'] for msg in report.recommendations]
+
+
+def test_recommend_grouped():
+    actions = ['ec2:*'] + [f'ec2:Action{index:03}' for index in range(300)]
+
+    assert recommendations([{'Effect': 'Deny', 'Resource': '*',
+                             'Action': actions}]) == [
+        'ec2:* already covers 300 item(s): ec2:Action000, ec2:Action001, '
+        'ec2:Action002, ec2:Action003, ec2:Action004, and 295 more.']
+
+
+def test_recommend_across_statements():
+    statements = [
+        {'Sid': 'A', 'Effect': 'Deny', 'Resource': '*',
+         'Action': ['s3:Get*', 'ec2:DeleteVpc']},
+        {'Sid': 'B', 'Effect': 'Deny', 'Resource': '*',
+         'Action': ['s3:GetObject']},
+        {'Sid': 'C', 'Effect': 'Deny', 'Resource': '*',
+         'Action': ['s3:GetBucketPolicy'],
+         'Condition': {'Bool': {'aws:SecureTransport': 'false'}}},
+        {'Sid': 'D', 'Effect': 'Deny', 'Resource': '*',
+         'NotAction': ['s3:GetObjectAcl']}
+    ]
+
+    assert recommendations(statements) == [
+        's3:Get* already covers 1 item(s): s3:GetObject (statement B).']
@@ -0,0 +1,53 @@
+import json
+
+from scplint.aws_actions import ActionCatalog
+from scplint.checkers.check_actions import CheckActions
+from scplint.report import Report
+from scplint.scp import SCP
+from scplint.suggestions import edit_distance, get_suggester
+
+
+def test_edit_distance():
+    assert edit_distance('GetObject', 'GetObject') == 0
+    assert edit_distance('GetObjct', 'GetObject') == 1
+    assert edit_distance('kitten', 'sitting') == 3
+    assert edit_distance('kitten', 'sitting', bound=1) == 2
+
+
+def test_suggest():
+    catalog = ActionCatalog([
+        's3:GetObject', 's3:GetObjectAcl', 's3:PutObject', 'ec2:CreateVpc'
+    ])
+    suggester = get_suggester(catalog)
+
+    assert suggester.suggest('s3:GetObjct', limit=1) == ['s3:GetObject']
+    assert suggester.suggest('s4:PutObject', limit=1) == ['s3:PutObject']
+    assert suggester.suggest('s3:GetObjectAc', limit=2) == [
+        's3:GetObjectAcl', 's3:GetObject']
+
+
+def test_suggest_nothing_similar():
+    catalog = ActionCatalog(['a4b:ApproveSkill', 's3:GetObject'])
+    suggester = get_suggester(catalog)
+
+    assert suggester.suggest('zzzzqqq:Xyzzyplugh') == []
+    assert suggester.suggest('s3:Xyzzyplugh') == []
+    assert suggester.suggest('s3:Get') == []
+
+
+def test_single_warning_per_unknown_action():
+    policy = {
+        'Version': '2012-10-17',
+        'Statement': [{
+            'Effect': 'Deny',
+            'Action': ['s3:GetObjec', 's3:Get'],
+            'Resource': '*'
+        }]
+    }
+    report = Report(SCP(policy), json.dumps(policy))
+    CheckActions(report)
+
+    assert report.actions_warning == ['s3:GetObjec', 's3:Get']
+    assert len(report.warnings) == 2
+    assert 's3:GetObject' in report.warnings[0]['msg']
+    assert report.warnings[1]['msg'] == 'Action s3:Get is unknown.'
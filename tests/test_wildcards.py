@@ -0,0 +1,39 @@
+import pytest
+
+from scplint.aws_actions import ActionCatalog
+from scplint.wildcards import compile_pattern
+
+
+@pytest.fixture
+def catalog():
+    yield ActionCatalog([
+        'ec2:CreateVpc', 'ec2:DeleteVpc', 'ec2:DescribeVpcs',
+        's3:DeleteBucket', 's3:GetObject', 'sqs:DeleteQueue'
+    ])
+
+
+def test_pattern_match():
+    pattern = compile_pattern('ec2:De*Vpc?')
+    assert pattern.match('EC2:DescribeVpcs')
+    assert not pattern.match('ec2:DeleteVpc')
+    assert compile_pattern('ec2:De*Vpc?') is pattern
+
+
+def test_pattern_prefix(catalog):
+    assert compile_pattern('ec2:De*').actions(catalog) == ('ec2:DeleteVpc',
+                                                           'ec2:DescribeVpcs')
+
+
+def test_pattern_mid_string(catalog):
+    assert compile_pattern('ec2:*Vpc').actions(catalog) == ('ec2:CreateVpc',
+                                                            'ec2:DeleteVpc')
+    assert compile_pattern('ec2:?reateVpc').actions(catalog) == (
+        'ec2:CreateVpc', )
+
+
+def test_pattern_service_wildcard(catalog):
+    assert compile_pattern('*:delete*').actions(catalog) == (
+        'ec2:DeleteVpc', 's3:DeleteBucket', 'sqs:DeleteQueue')
+    assert compile_pattern('s3*:Delete*').actions(catalog) == (
+        's3:DeleteBucket', )
+    assert len(compile_pattern('*').resolve(catalog)) == len(catalog)